@@ -0,0 +1,185 @@
+"""
+Benchmark del tiempo de importación de los módulos de Relleneitor
+
+Ejecuta `python -X importtime -c "import <módulo>"` en un proceso nuevo por
+cada módulo, toma el mejor tiempo acumulado de varias repeticiones y lo
+compara contra una línea base para detectar módulos que vuelvan a cargar
+dependencias pesadas (Faker, el driver de MariaDB) al importarse.
+
+Uso:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --baseline benchmarks/import_baseline.json
+    python -m benchmarks.import_time --save-baseline benchmarks/import_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+MODULES = [
+    "src.schema",
+    "src.generator",
+    "src.writers",
+    "src.database",
+    "src.utils",
+]
+
+# Aumento relativo del tiempo de importación a partir del cual se considera una regresión
+DEFAULT_THRESHOLD = 0.5
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, int]]:
+    """
+    Interpreta la salida de -X importtime
+
+    Args:
+        output: Texto escrito por el intérprete en stderr
+
+    Devuelve:
+        {módulo: {"self_us", "cumulative_us"}} para cada módulo importado
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # encabezado
+        modules[name.strip()] = {
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        }
+    return modules
+
+
+def measure_import(module: str, repeat: int = 5, top: int = 5) -> Dict[str, object]:
+    """
+    Mide el tiempo de importación de un módulo en procesos nuevos
+
+    Args:
+        module: Nombre del módulo a importar
+        repeat: Número de procesos (se toma el más rápido)
+        top: Número de dependencias más costosas a incluir
+
+    Devuelve:
+        Diccionario con cumulative_us, los módulos importados y las dependencias más costosas
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = parse_importtime(result.stderr)
+        if best is None or modules[module]["cumulative_us"] < best[module]["cumulative_us"]:
+            best = modules
+
+    slowest = sorted(best.items(), key=lambda item: item[1]["self_us"], reverse=True)
+    return {
+        "cumulative_us": best[module]["cumulative_us"],
+        "modules_imported": len(best),
+        "slowest": [{"module": name, **times} for name, times in slowest[:top]],
+        "imports_faker": "faker" in best,
+        "imports_mariadb": "mariadb" in best,
+    }
+
+
+def compare_results(
+    results: Dict[str, Dict[str, object]],
+    baseline: Dict[str, Dict[str, object]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Compara los tiempos de importación contra una línea base
+
+    Args:
+        results: Resultados actuales
+        baseline: Resultados de la línea base
+        threshold: Aumento relativo tolerado (0.5 = 50 %)
+
+    Devuelve:
+        Lista de mensajes, uno por módulo con regresión
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("cumulative_us"):
+            continue
+        ratio = current["cumulative_us"] / previous["cumulative_us"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {current['cumulative_us'] / 1000:.1f} ms frente a "
+                f"{previous['cumulative_us'] / 1000:.1f} ms en la línea base ({ratio:.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación de Relleneitor")
+    parser.add_argument("--modules", nargs="+", default=MODULES, help="Módulos a medir")
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos por módulo")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Línea base JSON contra la que comparar")
+    parser.add_argument("--save-baseline", help="Guardar los resultados como nueva línea base")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Aumento relativo del tiempo considerado regresión",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in args.modules:
+        results[module] = measure_import(module, args.repeat)
+        print(
+            f"{module:20s} {results[module]['cumulative_us'] / 1000:>8.1f} ms "
+            f"{results[module]['modules_imported']:>5d} módulos",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESIÓN {message}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+"""
+Suite de benchmarks de rendimiento para Relleneitor
+
+Mide filas/s y bytes/s de la generación, la codificación SQL y la carga en
+SQLite para:
+
+- cada provider de Faker usado en los esquemas
+- cada tipo inferido a partir de su descriptor (src.sql_types)
+- distintos patrones de llaves foráneas
+- los esquemas incluidos (hospital, sistema_ventas, articulos_pedidos y los
+  esquemas de testing) a varias escalas
+
+Los resultados se escriben en JSON y se comparan contra una línea base para
+detectar regresiones.
+
+Uso:
+    python -m benchmarks.run_benchmarks --output resultados.json
+    python -m benchmarks.run_benchmarks --quick --baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from faker import Faker
+from src.schema import Table, Column, ForeignKey, registry
+from src.generator import generate_row_batches_in_order
+from src.dialects import get_dialect
+from src.sqlite_database import SQLiteManager
+from src.profiling import profile
+from src.scaling import ScaleSpec
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+# Porcentaje de caída de filas/s a partir del cual se considera una regresión
+DEFAULT_THRESHOLD = 0.25
+
+PROVIDERS = [
+    "name",
+    "first_name",
+    "email",
+    "relleneitor_email",
+    "address",
+    "phone_number",
+    "company",
+    "url",
+    "word",
+    "sentence",
+    "paragraph",
+    "text",
+    "date",
+    "date_time_this_month",
+    "boolean",
+    "random_int",
+    "random_int(min=1,max=100)",
+]
+
+INFERRED_TYPES = [
+    "INTEGER",
+    "DECIMAL",
+    "DECIMAL(10,2)",
+    "TEXT",
+    "VARCHAR(50)",
+    "BOOLEAN",
+    "DATE",
+    "DATETIME",
+    "TIME",
+    "EMAIL",
+    "NAME",
+    "URL",
+    "IP",
+    "PHONE",
+    "ADDRESS",
+    "BLOB",
+]
+
+
+def _reset_state(seed: int = 0) -> None:
+    """Deja el registro vacío y fija las semillas para que las mediciones sean comparables"""
+    registry.tables = {}
+    Faker.seed(seed)
+    random.seed(seed)
+
+
+def _autoincrement_pk(name: str = "id") -> Column:
+    return Column(name, "INTEGER", is_primary_key=True, primary_key_autoincrement=True)
+
+
+def measure(
+    build: Callable[[], Dict[Table, int]],
+    load: bool = False,
+    repeat: int = 3,
+) -> Dict[str, float]:
+    """
+    Mide una generación completa y devuelve la mejor de varias repeticiones
+
+    Args:
+        build: Función que construye un esquema nuevo {tabla: filas}
+        load: Si además se mide la carga en una base SQLite en memoria
+        repeat: Número de repeticiones
+
+    Devuelve:
+        Diccionario con filas, bytes, segundos por etapa y tasas
+    """
+    dialect = get_dialect("mariadb")
+    best = None
+
+    for _ in range(repeat):
+        _reset_state()
+        tables_and_rows = build()
+        timings = {"generate": 0.0, "encode": 0.0, "load": 0.0}
+        rows = 0
+        size = 0
+
+        db = SQLiteManager(journal_mode=None, synchronous="OFF") if load else None
+        if db is not None:
+            db.create_tables(list(tables_and_rows.keys()), with_constraints=False)
+
+        batches = generate_row_batches_in_order(tables_and_rows)
+        while True:
+            start = time.perf_counter()
+            try:
+                table, batch = next(batches)
+            except StopIteration:
+                break
+            timings["generate"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for statement in dialect.insert_statements(table, batch):
+                size += len(statement.encode("utf-8"))
+            timings["encode"] += time.perf_counter() - start
+
+            if db is not None:
+                start = time.perf_counter()
+                db.insert_rows(table, batch)
+                timings["load"] += time.perf_counter() - start
+
+            rows += len(batch)
+
+        if db is not None:
+            db.close()
+
+        total = sum(timings.values())
+        if best is None or total < best["seconds"]:
+            best = {
+                "rows": rows,
+                "bytes": size,
+                "seconds": total,
+                "generate_seconds": timings["generate"],
+                "encode_seconds": timings["encode"],
+                "load_seconds": timings["load"],
+            }
+
+    seconds = best["seconds"] or 1e-9
+    best["rows_per_sec"] = best["rows"] / seconds
+    best["bytes_per_sec"] = best["bytes"] / seconds
+    return best
+
+
+def _single_column_table(name: str, column: Column) -> Table:
+    return Table(name=name, columns=[_autoincrement_pk(), column])
+
+
+def provider_benchmarks(rows: int) -> Dict[str, Callable[[], Dict[Table, int]]]:
+    """Un benchmark por provider de Faker"""
+    return {
+        f"provider/{provider}": (
+            lambda provider=provider: {
+                _single_column_table("t", Column("valor", "TEXT", faker_provider=provider)): rows
+            }
+        )
+        for provider in PROVIDERS
+    }
+
+
+def type_benchmarks(rows: int) -> Dict[str, Callable[[], Dict[Table, int]]]:
+    """Un benchmark por tipo inferido"""
+    return {
+        f"type/{column_type}": (
+            lambda column_type=column_type: {
+                _single_column_table("t", Column("valor", column_type)): rows
+            }
+        )
+        for column_type in INFERRED_TYPES
+    }
+
+
+def _fk_schema(parent_rows: int, child_rows: int, num_fks: int) -> Dict[Table, int]:
+    parent = Table(name="padres", columns=[_autoincrement_pk()])
+    child = Table(
+        name="hijos",
+        columns=[_autoincrement_pk()]
+        + [
+            Column(f"padre_{i}", "INTEGER", foreign_key=ForeignKey(f"padre_{i}", "padres", "id"))
+            for i in range(num_fks)
+        ],
+    )
+    return {parent: parent_rows, child: child_rows}
+
+
+def _fk_chain(rows: int, depth: int) -> Dict[Table, int]:
+    tables = {}
+    previous = None
+    for level in range(depth):
+        columns = [_autoincrement_pk()]
+        if previous is not None:
+            columns.append(
+                Column("padre_id", "INTEGER", foreign_key=ForeignKey("padre_id", previous, "id"))
+            )
+        table = Table(name=f"nivel_{level}", columns=columns)
+        tables[table] = rows
+        previous = table.name
+    return tables
+
+
+def fk_benchmarks(rows: int) -> Dict[str, Callable[[], Dict[Table, int]]]:
+    """Patrones de llaves foráneas: padre pequeño, padre grande, varias FK y cadenas"""
+    return {
+        "fk/small_parent": lambda: _fk_schema(10, rows, 1),
+        "fk/large_parent": lambda: _fk_schema(rows, rows, 1),
+        "fk/four_fks": lambda: _fk_schema(100, rows, 4),
+        "fk/chain_depth_5": lambda: _fk_chain(max(rows // 5, 1), 5),
+    }
+
+
+def _scaled(tables: List[Table], base_rows: List[int], scale: int) -> Dict[Table, int]:
+    return ScaleSpec(dict(zip(tables, base_rows))).rows(scale)
+
+
+def schema_builders() -> Dict[str, Callable[[int], Dict[Table, int]]]:
+    """
+    Esquemas incluidos en el repositorio con sus filas base
+
+    Los módulos de ejemplo se importan aquí para que un fallo al importar uno
+    (por ejemplo por el driver de la base de datos) no impida medir el resto.
+    """
+    builders = {}
+
+    def hospital(scale):
+        from examples.hospital_mariadb import create_hospital_schema
+
+        return _scaled(create_hospital_schema(), [10, 50, 200, 500], scale)
+
+    def sistema_ventas(scale):
+        from examples.sistema_ventas_schema import create_ventas_schema
+
+        return _scaled(create_ventas_schema(), [20, 15, 10, 100, 50, 40, 200], scale)
+
+    def articulos_pedidos(scale):
+        from examples.articulos_pedidos import create_ventas_schema
+
+        return _scaled(create_ventas_schema(), [50, 20, 100, 300], scale)
+
+    def testing(scale):
+        from src.test_utils import generate_testing_schemas
+
+        return {
+            table: rows * scale for table, rows in generate_testing_schemas().values()
+        }
+
+    builders["hospital"] = hospital
+    builders["sistema_ventas"] = sistema_ventas
+    builders["articulos_pedidos"] = articulos_pedidos
+    builders["testing"] = testing
+    return builders
+
+
+def run_benchmarks(
+    rows: int = 2000,
+    scales: Tuple[int, ...] = (1, 10),
+    repeat: int = 3,
+    only: Optional[str] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Ejecuta toda la suite
+
+    Args:
+        rows: Filas por benchmark de provider, tipo y llaves foráneas
+        scales: Multiplicadores de filas para los esquemas completos
+        repeat: Repeticiones por benchmark (se toma la mejor)
+        only: Prefijo para ejecutar solo algunos benchmarks (p. ej. "provider/")
+
+    Devuelve:
+        Diccionario con el nombre del benchmark como clave y sus métricas como valor
+    """
+    benchmarks: Dict[str, Tuple[Callable[[], Dict[Table, int]], bool]] = {}
+    for name, build in provider_benchmarks(rows).items():
+        benchmarks[name] = (build, False)
+    for name, build in type_benchmarks(rows).items():
+        benchmarks[name] = (build, False)
+    for name, build in fk_benchmarks(rows).items():
+        benchmarks[name] = (build, False)
+    for schema_name, builder in schema_builders().items():
+        for scale in scales:
+            benchmarks[f"schema/{schema_name}/x{scale}"] = (
+                lambda builder=builder, scale=scale: builder(scale),
+                True,
+            )
+
+    results = {}
+    for name, (build, load) in benchmarks.items():
+        if only and not name.startswith(only):
+            continue
+        try:
+            results[name] = measure(build, load=load, repeat=repeat)
+        except ImportError as e:
+            print(f"Omitido {name}: {e}", file=sys.stderr)
+            continue
+        print(
+            f"{name:45s} {results[name]['rows_per_sec']:>12,.0f} filas/s "
+            f"{results[name]['bytes_per_sec'] / 1e6:>8.2f} MB/s",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare_results(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """
+    Compara los resultados contra una línea base
+
+    Args:
+        results: Resultados actuales
+        baseline: Resultados de la línea base
+        threshold: Caída relativa de filas/s tolerada (0.25 = 25 %)
+
+    Devuelve:
+        Lista de mensajes, uno por benchmark con regresión
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("rows_per_sec"):
+            continue
+        ratio = current["rows_per_sec"] / previous["rows_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{name}: {current['rows_per_sec']:,.0f} filas/s frente a "
+                f"{previous['rows_per_sec']:,.0f} en la línea base ({ratio:.0%})"
+            )
+    return regressions
+
+
+def _report(results: Dict[str, Dict[str, float]], args: argparse.Namespace) -> dict:
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "scales": list(args.scales),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento de Relleneitor")
+    parser.add_argument("--rows", type=int, default=2000, help="Filas por microbenchmark")
+    parser.add_argument(
+        "--scales",
+        type=lambda value: tuple(int(scale) for scale in value.split(",")),
+        default=(1, 10),
+        help="Escalas de los esquemas completos, separadas por comas",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por benchmark")
+    parser.add_argument("--quick", action="store_true", help="Pocas filas y una repetición")
+    parser.add_argument("--only", help="Ejecutar solo los benchmarks con este prefijo")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Línea base JSON contra la que comparar")
+    parser.add_argument("--save-baseline", help="Guardar los resultados como nueva línea base")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        help="Perfilar por columna y provider; imprime el reporte o lo guarda en el JSON indicado",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Caída relativa de filas/s considerada regresión",
+    )
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.rows, args.scales, args.repeat = 200, (1,), 1
+
+    if args.profile:
+        with profile() as profiler:
+            results = run_benchmarks(args.rows, args.scales, args.repeat, args.only)
+        if args.profile == "-":
+            print(profiler.report(), file=sys.stderr)
+        else:
+            profiler.export_json(args.profile)
+    else:
+        results = run_benchmarks(args.rows, args.scales, args.repeat, args.only)
+    report = _report(results, args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESIÓN {message}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 Ejemplo de generación de datos para un sistema de ventas con múltiples tablas relacionadas
 """
 
+import logging
 from src.schema import Table, Column, ForeignKey
 from src.generator import generate_insert_queries_in_order
 from src.utils import MariaDBManager, export_sql_to_file
@@ -138,4 +139,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -2,6 +2,7 @@
 Ejemplo de generación de datos para un hospital y subida a MariaDB
 """
 
+import logging
 from src.schema import Table, Column, ForeignKey
 from src.generator import generate_insert_queries_in_order
 from src.database import MariaDBManager
@@ -129,4 +130,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -2,49 +2,39 @@
 Ejemplo de generación de datos para un sistema de ventas con múltiples tablas relacionadas
 """
 
+import logging
 from src.schema import Table, Column, ForeignKey
 from src.generator import generate_insert_queries_in_order
 from src.utils import MariaDBManager
+from src.providers import batch_provider
 from typing import List, Tuple
 import random
 
 
-def _categoria_provider() -> str:
-    """Genera una categoría aleatoria con su descripción."""
-    categorias: List[Tuple[str, str]] = [
-        ("Electrónica", "Productos electrónicos y dispositivos tecnológicos"),
-        ("Ropa", "Prendas de vestir para todas las edades y estilos"),
-        ("Alimentos", "Productos alimenticios y comestibles"),
-        ("Hogar", "Artículos para el hogar y decoración"),
-        ("Deportes", "Equipamiento y accesorios deportivos"),
-        ("Juguetes", "Juguetes y juegos para todas las edades"),
-        ("Libros", "Libros y material de lectura"),
-        ("Música", "Instrumentos musicales y accesorios"),
-        ("Cine", "Películas y material audiovisual"),
-        ("Jardinería", "Herramientas y productos para jardinería")
-    ]
-    
-    categoria, descripcion = random.choice(categorias)
-    return f"'{categoria}'"
-
-
-def _descripcion_categoria_provider() -> str:
-    """Genera la descripción correspondiente a la categoría seleccionada."""
-    categorias: List[Tuple[str, str]] = [
-        ("Electrónica", "Productos electrónicos y dispositivos tecnológicos"),
-        ("Ropa", "Prendas de vestir para todas las edades y estilos"),
-        ("Alimentos", "Productos alimenticios y comestibles"),
-        ("Hogar", "Artículos para el hogar y decoración"),
-        ("Deportes", "Equipamiento y accesorios deportivos"),
-        ("Juguetes", "Juguetes y juegos para todas las edades"),
-        ("Libros", "Libros y material de lectura"),
-        ("Música", "Instrumentos musicales y accesorios"),
-        ("Cine", "Películas y material audiovisual"),
-        ("Jardinería", "Herramientas y productos para jardinería")
-    ]
-    
-    categoria, descripcion = random.choice(categorias)
-    return f"'{descripcion}'"
+_CATEGORIAS: List[Tuple[str, str]] = [
+    ("Electrónica", "Productos electrónicos y dispositivos tecnológicos"),
+    ("Ropa", "Prendas de vestir para todas las edades y estilos"),
+    ("Alimentos", "Productos alimenticios y comestibles"),
+    ("Hogar", "Artículos para el hogar y decoración"),
+    ("Deportes", "Equipamiento y accesorios deportivos"),
+    ("Juguetes", "Juguetes y juegos para todas las edades"),
+    ("Libros", "Libros y material de lectura"),
+    ("Música", "Instrumentos musicales y accesorios"),
+    ("Cine", "Películas y material audiovisual"),
+    ("Jardinería", "Herramientas y productos para jardinería")
+]
+
+
+@batch_provider
+def _categoria_provider(n: int, rng: random.Random) -> List[str]:
+    """Genera n categorías aleatorias de una vez."""
+    return [categoria for categoria, _ in rng.choices(_CATEGORIAS, k=n)]
+
+
+@batch_provider
+def _descripcion_categoria_provider(n: int, rng: random.Random) -> List[str]:
+    """Genera n descripciones de categoría aleatorias de una vez."""
+    return [descripcion for _, descripcion in rng.choices(_CATEGORIAS, k=n)]
 
 
 def create_ventas_schema():
@@ -94,7 +84,7 @@ def create_ventas_schema():
         name="productos",
         columns=[
             Column("id_producto", "INTEGER", is_primary_key=True, primary_key_autoincrement=True),
-            Column("nombre", "TEXT", faker_provider="product_name"),
+            Column("nombre", "TEXT", faker_provider="catch_phrase"),
             Column("precio_actual", "DECIMAL(10,2)", faker_provider="random_int"),
             Column("stock", "INTEGER", faker_provider="random_int"),
             Column(
@@ -201,4 +191,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
@@ -0,0 +1,225 @@
+"""
+Apertura de archivos de salida con compresión transparente
+
+El formato se elige por la extensión del archivo (.gz, .bz2, .xz, .zst) o de
+forma explícita. Por defecto la compresión corre en un hilo aparte: zlib, bz2
+y lzma liberan el GIL mientras comprimen, así que la compresión se solapa con
+la generación de datos en lugar de sumarse a su tiempo.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from typing import BinaryIO, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd es opcional
+    zstandard = None
+
+# Tamaño del buffer de escritura de los archivos de salida
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+
+# Niveles por defecto: priorizan velocidad sobre la máxima compresión
+DEFAULT_LEVELS = {
+    "gzip": 6,
+    "bz2": 9,
+    "xz": 6,
+    "zstd": 3,
+}
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Detecta el formato de compresión según la extensión del archivo
+
+    Args:
+        path: Ruta del archivo
+
+    Devuelve:
+        "gzip", "bz2", "xz", "zstd" o None si no está comprimido
+    """
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def compression_extension(compression: Optional[str]) -> str:
+    """Devuelve la extensión de archivo asociada a un formato de compresión"""
+    if compression is None:
+        return ""
+    for extension, name in COMPRESSION_EXTENSIONS.items():
+        if name == compression:
+            return extension
+    raise ValueError(
+        f"Compresión desconocida: '{compression}'. "
+        f"Opciones: {', '.join(COMPRESSION_EXTENSIONS.values())}"
+    )
+
+
+def _open_compressed_stream(
+    path: str, compression: str, level: Optional[int]
+) -> BinaryIO:
+    """Abre el flujo binario que comprime hacia el archivo"""
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+
+    if compression == "gzip":
+        return gzip.GzipFile(path, "wb", compresslevel=level)
+    elif compression == "bz2":
+        return bz2.BZ2File(path, "wb", compresslevel=level)
+    elif compression == "xz":
+        return lzma.LZMAFile(path, "wb", preset=level)
+    elif compression == "zstd":
+        if zstandard is None:
+            raise ValueError(
+                "La compresión zstd requiere el paquete 'zstandard' (pip install zstandard)"
+            )
+        compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.stream_writer(open(path, "wb"), closefd=True)
+    raise ValueError(
+        f"Compresión desconocida: '{compression}'. "
+        f"Opciones: {', '.join(COMPRESSION_EXTENSIONS.values())}"
+    )
+
+
+class ThreadedWriter(io.RawIOBase):
+    """
+    Flujo binario que delega las escrituras a un hilo en segundo plano
+
+    Los bloques se encolan y el hilo los escribe en el flujo destino (por
+    ejemplo un compresor). La cola está acotada para que la memoria no crezca
+    si la compresión es más lenta que la generación.
+    """
+
+    def __init__(self, stream: BinaryIO, max_pending: int = 16):
+        """
+        Args:
+            stream: Flujo binario destino; se cierra al cerrar el ThreadedWriter
+            max_pending: Número máximo de bloques pendientes en la cola
+        """
+        super().__init__()
+        self._stream = stream
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="relleneitor-compresion", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Escribe los bloques encolados hasta recibir None"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            if self._error is None:
+                try:
+                    self._stream.write(chunk)
+                except BaseException as e:
+                    # Se sigue vaciando la cola para no bloquear al productor
+                    self._error = e
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._check_error()
+        # Se copia porque BufferedWriter reutiliza su buffer interno
+        chunk = bytes(data)
+        self._queue.put(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            super().close()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            self._stream.close()
+        self._check_error()
+
+
+def open_binary_output(
+    path: str,
+    compression: Optional[str] = "infer",
+    level: Optional[int] = None,
+    threaded: bool = True,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> BinaryIO:
+    """
+    Abre un archivo binario para escritura, comprimido si corresponde
+
+    Args:
+        path: Ruta del archivo de salida
+        compression: "infer" para elegir según la extensión, None para no
+            comprimir, o "gzip", "bz2", "xz", "zstd"
+        level: Nivel de compresión (por defecto el de DEFAULT_LEVELS)
+        threaded: Si la compresión se hace en un hilo aparte
+        buffer_size: Tamaño del buffer de escritura
+
+    Devuelve:
+        Archivo binario listo para escribir bytes o memoryviews
+    """
+    if compression == "infer":
+        compression = detect_compression(path)
+
+    if compression is None:
+        return open(path, "wb", buffering=buffer_size)
+
+    stream = _open_compressed_stream(path, compression, level)
+    if threaded:
+        return io.BufferedWriter(ThreadedWriter(stream), buffer_size=buffer_size)
+    return io.BufferedWriter(stream, buffer_size=buffer_size)
+
+
+def open_output(
+    path: str,
+    compression: Optional[str] = "infer",
+    level: Optional[int] = None,
+    threaded: bool = True,
+    newline: Optional[str] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> io.TextIOBase:
+    """
+    Abre un archivo de texto para escritura, comprimido si corresponde
+
+    Args:
+        path: Ruta del archivo de salida
+        compression: "infer" para elegir según la extensión, None para no
+            comprimir, o "gzip", "bz2", "xz", "zstd"
+        level: Nivel de compresión (por defecto el de DEFAULT_LEVELS)
+        threaded: Si la compresión se hace en un hilo aparte
+        newline: Igual que el parámetro newline de open()
+        buffer_size: Tamaño del buffer de escritura
+
+    Devuelve:
+        Archivo de texto UTF-8 listo para escribir
+    """
+    if compression == "infer":
+        compression = detect_compression(path)
+
+    if compression is None:
+        return open(
+            path, "w", encoding="utf-8", newline=newline, buffering=buffer_size
+        )
+
+    stream = open_binary_output(path, compression, level, threaded, buffer_size)
+    return io.TextIOWrapper(stream, encoding="utf-8", newline=newline)
@@ -0,0 +1,167 @@
+"""
+Contexto de generación
+
+Un GenerationContext reúne el estado de una generación: el registro de tablas
+con sus pools de llaves, el generador aleatorio y las instancias de Faker con
+sus providers compilados. Dos contextos no comparten nada, así que dos
+generaciones en el mismo proceso (tests en paralelo, un servicio que atiende
+varias peticiones en hilos distintos) no se mezclan.
+
+El contexto por defecto envuelve el estado global de siempre: el registro
+src.schema.registry, el módulo random y las instancias de Faker compartidas
+(que controla Faker.seed()), de modo que el código que no usa contextos
+funciona igual que antes.
+
+Uso:
+    contexto = GenerationContext(seed=42)
+    queries = generate_insert_queries_in_order(tablas, context=contexto)
+
+    # O para todo lo que se ejecute dentro del bloque, en este hilo:
+    with use_context(contexto):
+        queries = generate_insert_queries_in_order(tablas)
+"""
+
+import contextlib
+import contextvars
+import random
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from src import providers
+from src.providers import DEFAULT_LOCALE
+from src.schema import TableRegistry, registry as default_registry
+
+
+class GenerationContext:
+    """
+    Estado aislado de una generación
+
+    Un contexto no debe compartirse entre hilos: el registro de tablas y los
+    pools de llaves se modifican sin cerrojos. Cada hilo usa su propio
+    contexto, que use_context activa solo en ese hilo.
+
+    Args:
+        registry: Registro de tablas (por defecto uno nuevo y vacío)
+        seed: Semilla del generador aleatorio y de las instancias de Faker. Con
+            la misma semilla, el mismo esquema produce los mismos datos
+    """
+
+    def __init__(self, registry: Optional[TableRegistry] = None, seed: Optional[Any] = None):
+        self.registry = registry if registry is not None else TableRegistry()
+        # Las tablas que se registren validan sus providers con este contexto
+        if self.registry.context is None:
+            self.registry.context = self
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Semilla base de las instancias de Faker; cada locale deriva la suya
+        self._faker_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self._fakers: Dict[Tuple[str, Optional[Any]], Any] = {}
+        self._compiled: Dict[Tuple[str, str], Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_faker(self, locale: Optional[str] = None, seed: Optional[Any] = None):
+        """
+        Devuelve la instancia de Faker del contexto para un locale, creándola la primera vez
+
+        Args:
+            locale: Locale de Faker (por defecto es_MX)
+            seed: Semilla de un flujo aleatorio propio, distinto del del contexto
+
+        Devuelve:
+            Instancia de Faker compartida dentro del contexto
+        """
+        key = (locale or DEFAULT_LOCALE, seed)
+        faker = self._fakers.get(key)
+        if faker is None:
+            with self._lock:
+                faker = self._fakers.get(key)
+                if faker is None:
+                    instance_seed = seed
+                    if instance_seed is None and self._faker_seed is not None:
+                        instance_seed = f"{self._faker_seed}:{key[0]}"
+                    faker = providers.create_faker(key[0], instance_seed)
+                    self._fakers[key] = faker
+        return faker
+
+    def compile_provider(self, expression: str, locale: Optional[str] = None) -> Callable[[], Any]:
+        """
+        Compila una expresión de provider con las instancias de Faker del contexto
+
+        Args:
+            expression: Expresión del faker_provider
+            locale: Locale de Faker (por defecto es_MX)
+
+        Devuelve:
+            Callable que devuelve un valor nuevo en cada llamada
+        """
+        key = (expression, locale or DEFAULT_LOCALE)
+        provider = self._compiled.get(key)
+        if provider is None:
+            name, args, kwargs = providers.parse_provider_expression(expression)
+            provider = providers.build_provider(
+                self.get_faker(locale), expression, name, args, kwargs
+            )
+            self._compiled[key] = provider
+        return provider
+
+    def preload_provider(
+        self,
+        expression: str,
+        locale: Optional[str],
+        name: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> Callable[[], Any]:
+        """Compila una expresión ya analizada y validada, sin volver a comprobarla."""
+        key = (expression, locale or DEFAULT_LOCALE)
+        provider = self._compiled.get(key)
+        if provider is None:
+            provider = providers.build_provider(
+                self.get_faker(locale), expression, name, args, kwargs, validate=False
+            )
+            self._compiled[key] = provider
+        return provider
+
+    def __repr__(self) -> str:
+        return f"GenerationContext(seed={self.seed!r}, tablas={sorted(self.registry.tables)})"
+
+
+def _create_default_context() -> GenerationContext:
+    """Contexto sobre el estado global: registro global, módulo random y Faker compartido."""
+    context = GenerationContext(registry=default_registry)
+    # Las funciones del módulo random, que controla random.seed()
+    context.rng = random
+    context._faker_seed = None
+    context._fakers = providers._fakers
+    context._compiled = providers._compiled
+    return context
+
+
+default_context = _create_default_context()
+
+# Contexto activo en el hilo o tarea actual; None es el contexto por defecto
+_active_context: contextvars.ContextVar = contextvars.ContextVar(
+    "relleneitor_context", default=None
+)
+
+
+def current_context() -> GenerationContext:
+    """Devuelve el contexto activo en el hilo o tarea actual (por defecto el global)."""
+    return _active_context.get() or default_context
+
+
+@contextlib.contextmanager
+def use_context(context: GenerationContext) -> Iterator[GenerationContext]:
+    """
+    Activa un contexto dentro del bloque, solo para el hilo o tarea actual
+
+    Args:
+        context: Contexto a activar
+
+    Devuelve:
+        El mismo contexto
+    """
+    token = _active_context.set(context)
+    try:
+        yield context
+    finally:
+        _active_context.reset(token)
@@ -2,16 +2,33 @@
 Módulo para manejar operaciones de base de datos MariaDB
 """
 
-import mariadb
-from typing import Dict
+from typing import Dict, Iterable, Optional, Sequence
 import logging
 from contextlib import contextmanager
+from src.dialects import split_sql_statements
+from src.schema import Table
+from src.profiling import stage
+from src.metrics import ProgressTracker
 
-# Configuración del logger
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _import_driver():
+    """
+    Importa el driver de MariaDB al abrir la primera conexión
+
+    Así importar src.database (y src.utils) no carga la extensión en C ni
+    exige tenerla instalada si no se usa MariaDB.
+    """
+    try:
+        import mariadb
+    except ImportError as e:
+        raise ImportError(
+            "Para exportar a MariaDB se requiere el paquete 'mariadb' (pip install mariadb)"
+        ) from e
+    return mariadb
+
+
 class MariaDBManager:
     def __init__(
         self,
@@ -38,11 +55,9 @@ class MariaDBManager:
         self.port = port
         self.connection = None
 
-    @contextmanager
-    def get_connection(self):
-        """
-        Context manager para obtener una conexión a la base de datos
-        """
+    def _connect(self):
+        """Abre una conexión nueva con los datos del gestor"""
+        mariadb = _import_driver()
         try:
             conn = mariadb.connect(
                 host=self.host,
@@ -51,30 +66,72 @@ class MariaDBManager:
                 database=self.database,
                 port=self.port,
             )
-            logger.info(f"Conexión exitosa a la base de datos {self.database}")
-            yield conn
         except mariadb.Error as e:
             logger.error(f"Error al conectar a la base de datos: {e}")
             raise
+        logger.info(f"Conexión exitosa a la base de datos {self.database}")
+        return conn
+
+    def open(self) -> bool:
+        """
+        Abre una conexión que se reutiliza en todas las operaciones hasta close()
+
+        Los escritores por lotes la abren al empezar, así que cada lote no
+        vuelve a conectar con el servidor.
+
+        Devuelve:
+            True si la conexión se abrió ahora y quien la pidió debe cerrarla con
+            close(); False si ya había una abierta
+        """
+        if self.connection is not None:
+            return False
+        self.connection = self._connect()
+        return True
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Context manager para obtener una conexión a la base de datos
+
+        Si hay una conexión abierta con open() se reutiliza; si no, se abre una
+        para el bloque y se cierra al salir.
+        """
+        if self.connection is not None:
+            yield self.connection
+            return
+
+        conn = self._connect()
+        try:
+            yield conn
         finally:
-            if "conn" in locals():
-                conn.close()
-                logger.info("Conexión cerrada")
+            conn.close()
+            logger.info("Conexión cerrada")
 
-    def execute_queries(self, queries: Dict[str, str]) -> None:
+    def execute_queries(
+        self, queries: Dict[str, str], tracker: Optional[ProgressTracker] = None
+    ) -> None:
         """
         Ejecuta un conjunto de queries en la base de datos
 
         Args:
-            queries: Diccionario con nombres de tablas como claves y consultas como valores
+            queries: Diccionario con nombres de tablas como claves y consultas como valores.
+                Cada consulta puede contener varias sentencias, que se ejecutan por separado
+            tracker: ProgressTracker que recibe el avance por tabla (opcional)
         """
+        mariadb = _import_driver()
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
             try:
                 for table_name, query in queries.items():
                     logger.info(f"Ejecutando queries para la tabla {table_name}")
-                    cursor.execute(query)
+                    if tracker is not None:
+                        tracker.start_table(table_name)
+                    with stage(table_name, "load"):
+                        for statement in split_sql_statements(query, backslash_escapes=True):
+                            cursor.execute(statement)
+                    if tracker is not None:
+                        tracker.end_table(table_name, len(query.encode("utf-8")))
                 conn.commit()
                 logger.info("Todas las queries se ejecutaron exitosamente")
             except mariadb.Error as e:
@@ -84,10 +141,64 @@ class MariaDBManager:
             finally:
                 cursor.close()
 
+    def insert_rows(
+        self, table: Table, rows: Iterable[Sequence], batch_size: int = 1000
+    ) -> int:
+        """
+        Inserta filas de valores de Python usando executemany por lotes
+
+        Args:
+            table: Esquema de la tabla destino
+            rows: Filas con los valores en el orden de table.columns
+            batch_size: Filas por executemany (por defecto: 1000)
+
+        Devuelve:
+            Número de filas insertadas
+        """
+        column_names = [column.name for column in table.columns]
+        placeholders = ", ".join("?" for _ in column_names)
+        query = (
+            f"INSERT INTO {table.name} ({', '.join(column_names)}) "
+            f"VALUES ({placeholders})"
+        )
+
+        mariadb = _import_driver()
+        inserted = 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        cursor.executemany(query, batch)
+                        inserted += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(query, batch)
+                    inserted += len(batch)
+                conn.commit()
+            except mariadb.Error as e:
+                logger.error(f"Error al insertar filas en {table.name}: {e}")
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        return inserted
+
+    def close(self) -> None:
+        """Cierra la conexión abierta con open(), si la hay"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            logger.info("Conexión cerrada")
+
     def __enter__(self):
         """Método para usar con el contexto 'with'"""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Método para usar con el contexto 'with'"""
-        pass  # La conexión se cierra automáticamente en el context manager
+        self.close()
@@ -0,0 +1,256 @@
+"""
+Codificadores de literales SQL por dialecto
+
+El generador produce filas con valores de Python (int, float, str, bool,
+bytes, date, datetime, None). Los dialectos convierten esos lotes de filas en
+literales SQL en bloque, de modo que una misma generación puede exportarse a
+varios motores sin volver a generar los datos.
+"""
+
+import re
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence, Union
+from src.providers import SQLLiteral
+from src.schema import Table
+from src.temporal import format_datetime, format_time
+
+
+class SQLDialect:
+    """Dialecto base: literales de SQL estándar"""
+
+    name = "standard"
+    true_literal = "TRUE"
+    false_literal = "FALSE"
+    # Tamaño máximo en bytes de una sentencia INSERT antes de dividirla
+    max_statement_bytes = 16 * 1024 * 1024
+
+    def __init__(self):
+        self._encoders: Dict[type, Callable[[Any], str]] = {
+            int: str,
+            float: repr,
+            Decimal: str,
+            bool: self.encode_bool,
+            str: self.encode_string,
+            bytes: self.encode_bytes,
+            datetime: self.encode_datetime,
+            date: self.encode_date,
+            time: self.encode_time,
+            type(None): self.encode_null,
+            SQLLiteral: str,
+        }
+
+    def encode_null(self, value: None) -> str:
+        return "NULL"
+
+    def encode_bool(self, value: bool) -> str:
+        return self.true_literal if value else self.false_literal
+
+    def encode_string(self, value: str) -> str:
+        return "'" + value.replace("'", "''") + "'"
+
+    def encode_bytes(self, value: bytes) -> str:
+        return "X'" + value.hex() + "'"
+
+    def encode_datetime(self, value: datetime) -> str:
+        return "'" + format_datetime(value) + "'"
+
+    def encode_date(self, value: date) -> str:
+        return "'" + value.isoformat() + "'"
+
+    def encode_time(self, value: time) -> str:
+        return "'" + format_time(value) + "'"
+
+    def encode_value(self, value: Any) -> str:
+        """
+        Convierte un valor de Python en un literal SQL de este dialecto
+
+        Args:
+            value: Valor generado
+
+        Devuelve:
+            El literal SQL correspondiente
+        """
+        encoder = self._encoders.get(type(value))
+        if encoder is not None:
+            return encoder(value)
+
+        # Subclases de los tipos conocidos (p. ej. bytearray, enteros propios)
+        if isinstance(value, bool):
+            return self.encode_bool(value)
+        elif isinstance(value, (int, float, Decimal)):
+            return str(value)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            return self.encode_bytes(bytes(value))
+        elif isinstance(value, datetime):
+            return self.encode_datetime(value)
+        elif isinstance(value, date):
+            return self.encode_date(value)
+        elif isinstance(value, time):
+            return self.encode_time(value)
+        return self.encode_string(str(value))
+
+    def encode_rows(self, rows: Sequence[Sequence[Any]]) -> List[str]:
+        """
+        Codifica un lote de filas columna por columna
+
+        Args:
+            rows: Filas con los valores en el orden de las columnas
+
+        Devuelve:
+            Lista con una tupla SQL "(v1, v2, ...)" por fila
+        """
+        if not rows:
+            return []
+        encode = self.encode_value
+        encoded_columns = [list(map(encode, values)) for values in zip(*rows)]
+        return ["(" + ", ".join(row) + ")" for row in zip(*encoded_columns)]
+
+    def insert_statements(
+        self, table: Table, rows: Sequence[Sequence[Any]]
+    ) -> List[str]:
+        """
+        Construye las sentencias INSERT de varias filas para un lote
+
+        Si el lote no cabe en max_statement_bytes se divide en varias sentencias.
+
+        Args:
+            table: Esquema de la tabla
+            rows: Filas con los valores en el orden de table.columns
+
+        Devuelve:
+            Lista de sentencias INSERT terminadas en ";"
+        """
+        return self.join_encoded_rows(table, self.encode_rows(rows))
+
+    def join_encoded_rows(self, table: Table, encoded_rows: Sequence[str]) -> List[str]:
+        """
+        Construye las sentencias INSERT a partir de filas ya codificadas por encode_rows
+
+        Args:
+            table: Esquema de la tabla
+            encoded_rows: Tuplas SQL "(v1, v2, ...)"
+
+        Devuelve:
+            Lista de sentencias INSERT terminadas en ";"
+        """
+        column_names = ", ".join(column.name for column in table.columns)
+        header = f"INSERT INTO {table.name} ({column_names}) VALUES \n"
+        header_size = len(header.encode("utf-8"))
+
+        statements = []
+        current: List[str] = []
+        current_size = header_size
+        for row in encoded_rows:
+            row_size = (len(row) if row.isascii() else len(row.encode("utf-8"))) + 2
+            if current and current_size + row_size > self.max_statement_bytes:
+                statements.append(header + ",\n".join(current) + ";")
+                current = []
+                current_size = header_size
+            current.append(row)
+            current_size += row_size
+
+        if current:
+            statements.append(header + ",\n".join(current) + ";")
+        return statements
+
+
+class MariaDBDialect(SQLDialect):
+    """MariaDB / MySQL: la barra invertida es carácter de escape dentro de las cadenas"""
+
+    name = "mariadb"
+    true_literal = "true"
+    false_literal = "false"
+    # Valor por defecto de max_allowed_packet en MariaDB
+    max_statement_bytes = 16 * 1024 * 1024
+
+    def encode_string(self, value: str) -> str:
+        return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+class PostgreSQLDialect(SQLDialect):
+    """PostgreSQL: cadenas estándar y bytea en formato hex"""
+
+    name = "postgresql"
+    max_statement_bytes = 64 * 1024 * 1024
+
+    def encode_bytes(self, value: bytes) -> str:
+        return "'\\x" + value.hex() + "'::bytea"
+
+
+class SQLiteDialect(SQLDialect):
+    """SQLite: booleanos como enteros"""
+
+    name = "sqlite"
+    true_literal = "1"
+    false_literal = "0"
+    # Límite por defecto de SQLITE_MAX_SQL_LENGTH
+    max_statement_bytes = 1_000_000_000
+
+
+# Una cadena entre comillas (con '' como comilla escapada) o un ";" fuera de ellas
+_STATEMENT_TOKEN = re.compile(r"'[^']*(?:''[^']*)*'|;")
+# Igual, aceptando además escapes con barra invertida (MariaDB / MySQL)
+_STATEMENT_TOKEN_BACKSLASH = re.compile(r"'[^'\\]*(?:(?:''|\\.)[^'\\]*)*'|;", re.DOTALL)
+
+
+def split_sql_statements(script: str, backslash_escapes: bool = False) -> List[str]:
+    """
+    Divide un script SQL en sentencias, sin cortar dentro de las cadenas
+
+    generate_insert_query devuelve varias sentencias separadas por saltos de
+    línea cuando una tabla supera max_statement_bytes, y los drivers ejecutan
+    una sola sentencia por llamada a cursor.execute.
+
+    Args:
+        script: Una o varias sentencias terminadas en ";"
+        backslash_escapes: Tratar la barra invertida como escape dentro de las cadenas
+
+    Devuelve:
+        Lista de sentencias, cada una con su ";" final
+    """
+    if script.count(";") <= 1:
+        return [script] if script.strip() else []
+
+    pattern = _STATEMENT_TOKEN_BACKSLASH if backslash_escapes else _STATEMENT_TOKEN
+    statements = []
+    start = 0
+    for match in pattern.finditer(script):
+        if match.group() == ";":
+            statement = script[start:match.end()].strip()
+            if statement != ";":
+                statements.append(statement)
+            start = match.end()
+    rest = script[start:].strip()
+    if rest:
+        statements.append(rest)
+    return statements
+
+
+DIALECTS: Dict[str, SQLDialect] = {
+    "mariadb": MariaDBDialect(),
+    "mysql": MariaDBDialect(),
+    "postgresql": PostgreSQLDialect(),
+    "postgres": PostgreSQLDialect(),
+    "sqlite": SQLiteDialect(),
+}
+
+
+def get_dialect(dialect: Union[str, SQLDialect]) -> SQLDialect:
+    """
+    Obtiene un dialecto por nombre
+
+    Args:
+        dialect: Nombre del dialecto (mariadb, mysql, postgresql, sqlite) o una instancia
+
+    Devuelve:
+        La instancia de SQLDialect correspondiente
+    """
+    if isinstance(dialect, SQLDialect):
+        return dialect
+    try:
+        return DIALECTS[dialect.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Dialecto desconocido: '{dialect}'. Opciones: {', '.join(DIALECTS)}"
+        ) from None
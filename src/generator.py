@@ -1,35 +1,147 @@
-from faker import Faker
-from typing import List, Dict
-from src.schema import Table, ForeignKey, registry
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+from src.schema import Table, Column, ForeignKey, TableRegistry
+from src.context import GenerationContext, current_context
+from src.dialects import SQLDialect, get_dialect
+from src.profiling import Profiler, get_active_profiler, stage
+from src.metrics import ProgressArg, ProgressTracker, create_tracker
+from src.sql_types import parse_sql_type
+from src.providers import as_batch_provider, call_batch_provider, get_faker
 import random
-from datetime import datetime
+import time
 
-# faker = Faker()
-faker = Faker("es_MX")
+if TYPE_CHECKING:
+    from src.plans import GenerationPlan
 
 
-def generate_insert_query(table: Table, num_rows: int) -> str:
+def __getattr__(name: str):
+    # Compatibilidad con el antiguo atributo de módulo 'faker'
+    if name == "faker":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def generate_insert_query(
+    table: Table,
+    num_rows: int,
+    dialect: Union[str, SQLDialect] = "mariadb",
+    tracker: Optional[ProgressTracker] = None,
+    append: bool = False,
+    context: Optional[GenerationContext] = None,
+) -> str:
     """
     Generar una consulta INSERT para una tabla dada
 
     Args:
         table: El esquema de la tabla
         num_rows: Número de filas a generar
+        dialect: Dialecto SQL de los literales (mariadb, postgresql, sqlite)
+        tracker: ProgressTracker que recibe el avance por lote (opcional)
+        append: Generar filas nuevas a continuación de las ya generadas o registradas
+        context: Contexto de generación (por defecto el activo, ver src.context)
+
+    Devuelve:
+        Cadena que contiene una única sentencia SQL INSERT con varias filas. Si
+        las filas superan el tamaño máximo de sentencia del dialecto se
+        devuelven varias sentencias separadas por saltos de línea.
+    """
+    sql_dialect = get_dialect(dialect)
+
+    rows = []
+    for batch in generate_row_batches(table, num_rows, append=append, context=context):
+        rows.extend(batch)
+        if tracker is not None:
+            tracker.update(table.name, len(batch))
+
+    with stage(table.name, "encode", len(rows)):
+        query = "\n".join(sql_dialect.insert_statements(table, rows))
+
+    if tracker is not None:
+        tracker.end_table(table.name, len(query.encode("utf-8")))
+    return query
+
+
+def generate_row_batches(
+    table: Table,
+    num_rows: int,
+    batch_size: int = 1000,
+    append: bool = False,
+    context: Optional[GenerationContext] = None,
+) -> Iterator[List[tuple]]:
+    """
+    Genera las filas de una tabla como valores de Python agrupados en lotes
+
+    A diferencia de generate_insert_query, no construye la sentencia SQL: cada
+    fila es una tupla con los valores en el orden de table.columns, lista para
+    pasarse a un executemany, a un escritor de archivos o a un dialecto SQL.
+
+    Args:
+        table: El esquema de la tabla
+        num_rows: Número de filas a generar
+        batch_size: Número máximo de filas por lote
+        append: Continuar los autoincrementos desde la marca de agua de la
+            tabla en el registro del contexto (las filas ya generadas o
+            registradas con record_existing_rows) en lugar de empezar desde
+            start_autoincrement
+        context: Contexto de generación (por defecto el activo al empezar a
+            iterar, ver src.context)
 
     Devuelve:
-        Cadena que contiene una única sentencia SQL INSERT con varias filas
+        Iterador de listas de tuplas, una lista por lote
     """
-    # Registrar la tabla en el registro global si aún no está registrada
+    context = context or current_context()
+    registry = context.registry
+
+    # Registrar la tabla en el registro del contexto si aún no está registrada
     if table.name not in registry.tables:
         registry.register(table)
 
-    columns = table.columns
-    column_names = [column.name for column in columns]
+    _check_foreign_keys(table, registry)
 
-    value_rows = []
+    state = registry.state(table)
+    offset = state.row_count if append else 0
+    for start in range(0, num_rows, batch_size):
+        size = min(batch_size, num_rows - start)
+        batch = _generate_batch(table, offset + start, size, context)
+        state.row_count = max(state.row_count, offset + start + size)
+        # Mover a disco los pools de llaves si se superó el presupuesto de memoria
+        registry.enforce_memory_budget()
+        yield batch
 
-    # Antes de generar filas, verificar todas las llaves foráneas que no tengan datos
-    for column in columns:
+
+def generate_row_batches_in_order(
+    tables_and_rows: Dict[Table, int],
+    batch_size: int = 1000,
+    plan: Optional["GenerationPlan"] = None,
+    append: bool = False,
+    context: Optional[GenerationContext] = None,
+) -> Iterator[Tuple[Table, List[tuple]]]:
+    """
+    Genera lotes de filas para múltiples tablas respetando las dependencias de llaves foráneas
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        batch_size: Número máximo de filas por lote
+        plan: Plan compilado del esquema (ver src.plans); evita reordenar y revalidar
+        append: Generar solo las filas nuevas sobre las ya generadas o registradas
+            (ver generate_row_batches)
+        context: Contexto de generación (por defecto el activo, ver src.context)
+
+    Devuelve:
+        Iterador de tuplas (tabla, lote de filas)
+    """
+    context = context or current_context()
+    ordered_tables = _ordered_tables(tables_and_rows, plan, context)
+
+    for table in ordered_tables:
+        for batch in generate_row_batches(
+            table, tables_and_rows[table], batch_size, append, context
+        ):
+            yield table, batch
+
+
+def _check_foreign_keys(table: Table, registry: TableRegistry):
+    """Verifica que todas las llaves foráneas de la tabla tengan datos disponibles"""
+    for column in table.columns:
         if column.foreign_key and not registry.get_foreign_key_values(
             column.foreign_key
         ):
@@ -38,101 +150,229 @@ def generate_insert_query(table: Table, num_rows: int) -> str:
                 f"ya que '{column.name}' hace referencia a '{column.foreign_key.references_column}'"
             )
 
-    for _ in range(num_rows):
-        values = []
-
-        for column in columns:
-            value = None
-
-            # Si es una llave foránea, usar un valor de la tabla referenciada
-            if column.foreign_key:
-                value = _generate_foreign_key_value(column.foreign_key)
-            elif column.primary_key_autoincrement:
-                if len(value_rows) == 0:
-                    id_incremental = column.start_autoincrement
-                id_incremental = column.start_autoincrement + len(value_rows)
-                value = f"{id_incremental}"
-            else:
-                if column.faker_provider:
-                    value = _get_value_from_provider(column.faker_provider)
-                elif column.custom_provider:
-                    value = column.custom_provider()
-                else:
-                    value = _infer_value_from_type(column.type)
-
-            # Asegurarse de que el valor no sea None
-            if value is None:
-                value = "NULL"
-
-            table.store_generated_value(column.name, value)
-            values.append(value)
-
-        # Formatear como una tupla para SQL
-        row_values = f"({', '.join(values)})"
-        value_rows.append(row_values)
-
-    # Crear una sentencia INSERT con múltiples conjuntos de valores
-    query = f"INSERT INTO {table.name} ({', '.join(column_names)}) VALUES \n"
-    query += ",\n".join(value_rows) + ";"
 
-    return query
+def _generate_batch(
+    table: Table, start: int, num_rows: int, context: Optional[GenerationContext] = None
+) -> List[tuple]:
+    """
+    Genera un lote de filas columna por columna y almacena los valores en la tabla
 
+    Args:
+        table: El esquema de la tabla
+        start: Posición de la primera fila del lote dentro de la tabla
+        num_rows: Número de filas del lote
+        context: Contexto de generación (por defecto el activo, ver src.context)
 
-def _generate_foreign_key_value(foreign_key: ForeignKey) -> str:
+    Devuelve:
+        Lista de tuplas con un valor de Python por columna
+    """
+    context = context or current_context()
+    profiler = get_active_profiler()
+    if profiler is not None:
+        return _generate_batch_profiled(table, start, num_rows, profiler, context)
+
+    columns_values = []
+    registry = context.registry
+
+    for column in table.columns:
+        values = _generate_column_values(column, start, num_rows, context)
+        registry.store_generated_values(table, column.name, values)
+        columns_values.append(values)
+
+    return list(zip(*columns_values))
+
+
+def _generate_batch_profiled(
+    table: Table, start: int, num_rows: int, profiler: Profiler, context: GenerationContext
+) -> List[tuple]:
+    """Igual que _generate_batch, registrando el tiempo de cada columna y etapa"""
+    columns_values = []
+    generate_seconds = 0.0
+    store_seconds = 0.0
+
+    for column in table.columns:
+        begin = time.perf_counter()
+        values = _generate_column_values(column, start, num_rows, context)
+        generated = time.perf_counter()
+        context.registry.store_generated_values(table, column.name, values)
+        stored = time.perf_counter()
+
+        profiler.record_column(
+            table.name, column.name, _provider_label(column), generated - begin, num_rows
+        )
+        generate_seconds += generated - begin
+        store_seconds += stored - generated
+        columns_values.append(values)
+
+    profiler.record_stage(table.name, "generate", generate_seconds, num_rows)
+    profiler.record_stage(table.name, "store", store_seconds, num_rows)
+    return list(zip(*columns_values))
+
+
+def _provider_label(column: Column) -> str:
+    """Nombre con el que se agrupa el origen de los valores de una columna al perfilar"""
+    if column.foreign_key:
+        fk = column.foreign_key
+        return f"fk:{fk.references_table}.{fk.references_column}"
+    elif column.primary_key_autoincrement:
+        return "autoincrement"
+    elif column.faker_provider:
+        locale = f"@{column.locale}" if column.locale else ""
+        return f"faker:{column.faker_provider}{locale}"
+    elif column.custom_provider:
+        return f"custom:{getattr(column.custom_provider, '__name__', 'callable')}"
+    return f"type:{column.type.upper()}"
+
+
+def _generate_column_values(
+    column: Column, start: int, num_rows: int, context: Optional[GenerationContext] = None
+) -> List[Any]:
+    """
+    Genera los valores de una columna para un lote de filas
+
+    Args:
+        column: Definición de la columna
+        start: Posición de la primera fila del lote
+        num_rows: Número de filas del lote
+        context: Contexto de generación (por defecto el activo, ver src.context)
+
+    Devuelve:
+        Lista de valores de Python (None representa NULL)
+    """
+    context = context or current_context()
+    # Si es una llave foránea, usar valores de la tabla referenciada
+    if column.foreign_key:
+        return _generate_foreign_key_values(column.foreign_key, num_rows, context)
+    elif column.primary_key_autoincrement:
+        first_id = column.start_autoincrement + start
+        # Un range contiguo se guarda en el KeyPool sin materializar los valores
+        return range(first_id, first_id + num_rows)
+    elif column.faker_provider:
+        provider = context.compile_provider(column.faker_provider, column.locale)
+        batch = getattr(provider, "batch", None)
+        if batch is not None:
+            values = batch(num_rows)
+        else:
+            values = [provider() for _ in range(num_rows)]
+        # Los textos de Faker no deben exceder la longitud de VARCHAR(n)
+        return column.sql_type.truncate(values)
+    elif column.custom_provider:
+        # Los providers escalares se adaptan al protocolo de lotes (n, rng)
+        provider = as_batch_provider(column.custom_provider)
+        return call_batch_provider(provider, num_rows, context.rng)
+    else:
+        faker = context.get_faker(column.locale)
+        return column.sql_type.values(num_rows, faker, context.rng)
+
+
+def _generate_foreign_key_value(
+    foreign_key: ForeignKey, context: Optional[GenerationContext] = None
+) -> Any:
     """
     Genera un valor válido para una llave foránea
 
     Args:
         foreign_key: Definición de la llave foránea
+        context: Contexto de generación (por defecto el activo, ver src.context)
 
     Devuelve:
         Un valor válido que existe en la tabla referenciada
     """
-    values = registry.get_foreign_key_values(foreign_key)
+    return _generate_foreign_key_values(foreign_key, 1, context)[0]
+
+
+def _generate_foreign_key_values(
+    foreign_key: ForeignKey, num_rows: int, context: Optional[GenerationContext] = None
+) -> List[Any]:
+    """
+    Genera un lote de valores válidos para una llave foránea
+
+    Args:
+        foreign_key: Definición de la llave foránea
+        num_rows: Número de valores a generar
+        context: Contexto de generación (por defecto el activo, ver src.context)
+
+    Devuelve:
+        Lista de valores existentes en la tabla referenciada
+    """
+    context = context or current_context()
+    values = context.registry.get_foreign_key_values(foreign_key)
 
     if not values:
         raise ValueError(
             f"No se encontraron valores para la llave foránea en la tabla '{foreign_key.references_table}'"
         )
 
-    # Seleccionar un valor aleatorio de la tabla referenciada
-    value = random.choice(values)
-
-    # Asegurarse de que los valores de las llaves foráneas no tengan comillas adicionales
-    if isinstance(value, str) and value.isdigit():
-        return value
-    return str(value)
+    # Seleccionar valores aleatorios de la tabla referenciada (en memoria o en disco)
+    return values.choices(num_rows, context.rng)
 
 
 def generate_insert_queries_in_order(
     tables_and_rows: Dict[Table, int],
+    dialect: Union[str, SQLDialect] = "mariadb",
+    progress: ProgressArg = None,
+    plan: Optional["GenerationPlan"] = None,
+    append: bool = False,
+    context: Optional[GenerationContext] = None,
 ) -> Dict[str, str]:
     """
     Genera consultas INSERT para múltiples tablas, respetando el orden de las dependencias de llaves foráneas
 
     Args:
         tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        dialect: Dialecto SQL de los literales (mariadb, postgresql, sqlite)
+        progress: Callback o lista de callbacks de progreso (ver src.metrics)
+        plan: Plan compilado del esquema (ver src.plans); evita reordenar y revalidar
+        append: Generar solo las filas nuevas sobre las ya generadas o registradas
+            (ver generate_row_batches)
+        context: Contexto de generación (por defecto el activo, ver src.context)
 
     Devuelve:
-        Diccionario con nombres de tablas como claves y consultas INSERT como valores
+        Diccionario con nombres de tablas como claves y consultas INSERT como valores.
+        Toda la salida se construye en memoria; para generar hasta un tamaño
+        (target_bytes) o conjuntos grandes se usa src.utils.export_to_writer
     """
+    context = context or current_context()
     # Ordenar las tablas basado en sus dependencias
-    ordered_tables = _order_tables_by_dependencies(list(tables_and_rows.keys()))
+    ordered_tables = _ordered_tables(tables_and_rows, plan, context)
+    tracker = create_tracker(
+        progress, {table.name: tables_and_rows[table] for table in ordered_tables}
+    )
 
     # Generar consultas en el orden correcto
     queries = {}
     for table in ordered_tables:
         num_rows = tables_and_rows[table]
-        queries[table.name] = generate_insert_query(table, num_rows)
+        queries[table.name] = generate_insert_query(
+            table, num_rows, dialect, tracker, append, context
+        )
 
+    if tracker is not None:
+        tracker.finish()
     return queries
 
 
-def _order_tables_by_dependencies(tables: List[Table]) -> List[Table]:
+def _ordered_tables(
+    tables_and_rows: Dict[Table, int],
+    plan: Optional["GenerationPlan"],
+    context: GenerationContext,
+) -> List[Table]:
+    """Registra las tablas y las devuelve en orden de dependencias, según el plan si lo hay"""
+    if plan is not None:
+        return plan.ordered_tables(tables_and_rows, context)
+    return _order_tables_by_dependencies(list(tables_and_rows.keys()), context.registry)
+
+
+def _order_tables_by_dependencies(
+    tables: List[Table], registry: Optional[TableRegistry] = None
+) -> List[Table]:
     """
     Ordena las tablas basándose en sus dependencias de llaves foráneas
     Las tablas sin dependencias van primero
     """
+    if registry is None:
+        registry = current_context().registry
+
     # Registrar todas las tablas primero
     for table in tables:
         registry.register(table)
@@ -168,101 +408,22 @@ def _order_tables_by_dependencies(tables: List[Table]) -> List[Table]:
     return result
 
 
-def _relleneitor_email_provider():
-    email = faker.email()
-    if "@" in email:
-        local_part, _ = email.split("@", 1)
-        new_domain = faker.domain_name()
-        email = f"{local_part}@{new_domain}"
-    return f"'{email}'"
-
-
-def _get_value_from_provider(provider: str) -> str:
-    """Obtener un valor de un provider faker específico"""
-    # Dividir el provider para manejar parámetros como "random_int(min=1,max=100)"
-    if "(" in provider:
-        provider_name, params_str = provider.split("(", 1)
-        params_str = params_str.rstrip(")")
-        if provider_name == "random_int":
-            params = dict(param.split("=") for param in params_str.split(","))
-            min_val = int(params.get("min", 1))
-            max_val = int(params.get("max", 1000))
-            return str(faker.random_int(min=min_val, max=max_val))
-    else:
-        if provider == "relleneitor_email":
-            return _relleneitor_email_provider()
-
-        # Usar getattr para llamar al método del provider dinámicamente
-        try:
-            provider_method = getattr(faker, provider)
-            return _format_value(provider_method())
-        except AttributeError:
-            return f"'unknown_provider:{provider}'"
-
-
-def _infer_value_from_type(column_type: str) -> str:
-    """Infer an appropriate Faker provider based on column type"""
-    column_type = column_type.upper()
-
-    if column_type in ("INTEGER", "INT", "SMALLINT", "BIGINT", "TINYINT"):
-        return str(faker.random_int(min=0, max=1000))
-
-    elif column_type in ("DECIMAL", "NUMERIC", "FLOAT", "REAL", "DOUBLE"):
-        return str(round(random.uniform(0.0, 1000.0), 2))
-
-    elif column_type in ("TEXT", "VARCHAR", "CHAR", "CLOB"):
-        max_chars = 100  # Default
-        if "(" in column_type:  # Como cuando es VARCHAR(50)
-            try:
-                size = int(column_type.split("(")[1].split(")")[0])
-                max_chars = size
-            except (IndexError, ValueError):
-                pass
-        return f"'{faker.text(max_nb_chars=max_chars)}'"
-
-    elif column_type in ("BOOLEAN", "BOOL"):
-        return str(faker.boolean()).lower()
-
-    elif column_type == "DATE":
-        return f"'{faker.date()}'"
-    elif column_type in ("DATETIME", "TIMESTAMP"):
-        return f"'{faker.date_time().strftime('%Y-%m-%d %H:%M:%S')}'"
-    elif column_type == "TIME":
-        return f"'{faker.time()}'"
-
-    elif column_type == "EMAIL" or "EMAIL" in column_type:
-        return f"'{faker.email()}'"
-    elif column_type == "NAME" or "NAME" in column_type:
-        return f"'{faker.name()}'"
-    elif column_type == "URL" or "URL" in column_type:
-        return f"'{faker.url()}'"
-    elif column_type == "IP" or "IPADDRESS" in column_type:
-        return f"'{faker.ipv4()}'"
-    elif "PHONE" in column_type:
-        return f"'{faker.phone_number()}'"
-    elif "ADDRESS" in column_type:
-        return f"'{faker.address().replace('\n', ', ')}'"
-
-    elif column_type in ("BLOB", "BINARY", "VARBINARY"):
-        return f"X'{faker.hexify('?' * 10)}'"
+def _infer_value_from_type(
+    column_type: str, faker=None, rng: Optional[random.Random] = None
+) -> Any:
+    """
+    Genera un valor a partir del tipo SQL de una columna
 
-    else:
-        return f"'Tipo desconocido:{column_type}'"
-
-
-def _format_value(value) -> str:
-    """Formatear un valor para incluir en SQL"""
-    if value is None:
-        return "NULL"
-    elif isinstance(value, (int, float)):
-        return str(value)
-    elif isinstance(value, bool):
-        return str(value).lower()
-    elif isinstance(value, datetime):
-        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
-    else:
-        # Escapar comillas simples para SQL
-        # Asegurarse de que los valores de las llaves foráneas no tengan comillas adicionales
-        if isinstance(value, str) and value.isdigit():
-            return value
-        return f"'{str(value).replace("'", "''")}'"
+    Args:
+        column_type: Tipo SQL ("INTEGER", "VARCHAR(50)", "DECIMAL(10,2)", ...)
+        faker: Instancia de Faker (por defecto la del locale por omisión)
+        rng: Generador aleatorio (por defecto el del contexto activo)
+
+    Devuelve:
+        Un valor que respeta la longitud y la precisión del tipo (ver src.sql_types)
+    """
+    if faker is None:
+        faker = get_faker()
+    if rng is None:
+        rng = current_context().rng
+    return parse_sql_type(column_type).values(1, faker, rng)[0]
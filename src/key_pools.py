@@ -0,0 +1,573 @@
+"""
+Almacenamiento de los valores generados que usan las llaves foráneas
+
+Cada columna generada guarda sus valores en un KeyPool. Mientras cabe en el
+presupuesto de memoria del registro, el pool es una lista en RAM; cuando se
+supera el presupuesto, los pools más grandes se mueven a disco y se siguen
+pudiendo muestrear y ampliar desde ahí:
+
+- Enteros, reales y textos van a un archivo mapeado en memoria (MappedKeys),
+  que se muestrea directamente y se puede compartir entre procesos.
+- El resto de tipos van a un archivo SQLite temporal.
+
+sqlite3, pickle, mmap y tempfile solo se importan cuando un pool pasa a disco.
+"""
+
+import os
+import random
+import re
+import sys
+import weakref
+from collections.abc import Sequence
+from array import array
+from itertools import accumulate
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+# Tipos que SQLite guarda sin conversión; el resto se serializa con pickle
+_NATIVE_TYPES = (int, float, str, bytes, type(None))
+
+# Valores que se miden con sys.getsizeof para estimar el tamaño de un lote
+_SIZE_SAMPLE = 16
+
+# Tamaño de un puntero de la lista que contiene los valores
+_POINTER_SIZE = 8
+
+# Máximo de parámetros por consulta en versiones antiguas de SQLite
+_MAX_SQL_PARAMS = 999
+
+# Valores que se leen de una vez al recorrer un archivo mapeado
+_ITER_CHUNK = 65536
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+# Formato del archivo mapeado según el tipo de los valores
+_MAPPED_TYPECODES = {int: "q", float: "d", str: "s"}
+
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(size: Union[int, str]) -> int:
+    """
+    Convierte un tamaño como "512MB" o "2G" a bytes
+
+    Args:
+        size: Número de bytes o cadena con sufijo K, M, G o T (opcionalmente seguido de B o iB)
+
+    Devuelve:
+        Tamaño en bytes
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*", size.upper())
+    if not match:
+        raise ValueError(f"Tamaño inválido: '{size}'. Ejemplos: 1048576, '512MB', '2G'")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def estimate_size(values: List[Any]) -> int:
+    """Estima los bytes que ocupan los valores en una lista de Python."""
+    if not values:
+        return 0
+    step = max(len(values) // _SIZE_SAMPLE, 1)
+    sample = values[::step][:_SIZE_SAMPLE]
+    average = sum(sys.getsizeof(value) for value in sample) / len(sample)
+    return int(len(values) * (average + _POINTER_SIZE))
+
+
+def _remove_files(*paths: str) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def mapped_typecode(values: Iterable[Any]) -> Optional[str]:
+    """
+    Devuelve el formato de archivo mapeado que admite los valores
+
+    Args:
+        values: Valores de una columna
+
+    Devuelve:
+        "q" (enteros de 64 bits), "d" (reales), "s" (textos) o None si los
+        valores son de otro tipo o de tipos mezclados
+    """
+    if isinstance(values, range):
+        # Un autoincremento: basta con comprobar los extremos
+        if not values:
+            return None
+        low, high = min(values[0], values[-1]), max(values[0], values[-1])
+        return "q" if _INT64_MIN <= low and high <= _INT64_MAX else None
+
+    values = values if isinstance(values, list) else list(values)
+    if not values:
+        return None
+    first = type(values[0])
+    typecode = _MAPPED_TYPECODES.get(first)
+    if typecode is None:
+        return None
+    # Por bloques, para dejar de recorrer en cuanto aparece otro tipo
+    for start in range(0, len(values), _ITER_CHUNK):
+        if set(map(type, values[start:start + _ITER_CHUNK])) != {first}:
+            return None
+    if typecode == "q" and not (_INT64_MIN <= min(values) and max(values) <= _INT64_MAX):
+        return None
+    return typecode
+
+
+def _encode_strings(values: List[str]) -> tuple:
+    """Codifica textos como un bloque UTF-8 y la longitud en bytes de cada uno."""
+    data = "".join(values).encode("utf-8")
+    if len(data) == sum(map(len, values)):
+        # Solo ASCII: la longitud en bytes es la de cada cadena
+        return data, map(len, values)
+    return data, [len(value.encode("utf-8")) for value in values]
+
+
+def _map_file(path: str) -> memoryview:
+    """Mapea un archivo completo en memoria, en modo solo lectura."""
+    import mmap
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class StringArray(Sequence):
+    """Secuencia de cadenas leída de un buffer de desplazamientos y texto UTF-8."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice fuera del archivo")
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+
+class MappedKeys(Sequence):
+    """
+    Columna de llaves en un archivo mapeado en memoria
+
+    Los enteros ("q") y reales ("d") se guardan como un array binario en
+    'path'; los textos ("s") como texto UTF-8 en 'path' y sus desplazamientos
+    int64 en 'path.idx'. Las lecturas van directamente a las páginas del
+    archivo, que el sistema operativo carga y descarta según se usan, así que
+    la columna puede ser mucho mayor que la memoria disponible.
+
+    Una instancia creada con create() puede ampliarse con append(). Al enviarla
+    a otro proceso (pickle) solo viaja la ruta: el receptor abre el mismo
+    archivo en modo solo lectura y comparte sus páginas a través de la caché
+    del sistema, sin copiar las llaves. Un lector ve las llaves que había al
+    abrir el archivo.
+    """
+
+    def __init__(self, path: str, typecode: str = "q", writable: bool = False):
+        if typecode not in ("q", "d", "s"):
+            raise ValueError(f"Formato de llaves desconocido: '{typecode}'")
+        self.path = path
+        self.typecode = typecode
+        self.writable = writable
+        self._data_file = open(path, "ab") if writable else None
+        self._index_file = open(self.index_path, "ab") if writable and typecode == "s" else None
+        self._keys: Optional[Sequence] = None
+        self._keys = self._map()
+        self._length = len(self._keys)
+        self._text_bytes = self._keys._offsets[-1] if typecode == "s" and self._length else 0
+
+    @classmethod
+    def create(cls, path: str, values: Iterable[Any] = (), typecode: Optional[str] = None) -> "MappedKeys":
+        """
+        Crea (o vacía) un archivo de llaves y escribe los valores
+
+        Args:
+            path: Archivo de las llaves
+            values: Valores iniciales
+            typecode: Formato ("q", "d" o "s"); por defecto se deduce de los valores
+
+        Devuelve:
+            Columna ampliable con append()
+        """
+        values = values if isinstance(values, (list, range)) else list(values)
+        typecode = typecode or mapped_typecode(values)
+        if typecode is None:
+            raise TypeError("Solo se pueden mapear columnas de enteros, reales o textos")
+        open(path, "wb").close()
+        if typecode == "s":
+            with open(f"{path}.idx", "wb") as f:
+                f.write(array("q", [0]).tobytes())
+        keys = cls(path, typecode, writable=True)
+        keys.append(values)
+        return keys
+
+    @property
+    def index_path(self) -> str:
+        """Archivo de desplazamientos de una columna de textos."""
+        return f"{self.path}.idx"
+
+    @property
+    def nbytes(self) -> int:
+        """Tamaño de los archivos en disco."""
+        self._flush()
+        paths = [self.path, self.index_path] if self.typecode == "s" else [self.path]
+        return sum(os.path.getsize(path) for path in paths)
+
+    def append(self, values: Iterable[Any]) -> None:
+        """Añade valores al final del archivo."""
+        if not self.writable:
+            raise ValueError(f"'{self.path}' está abierto en modo solo lectura")
+        values = values if isinstance(values, (list, range)) else list(values)
+        if not values:
+            return
+        if self.typecode == "s":
+            data, lengths = _encode_strings(values)
+            offsets = array("q", accumulate(lengths, initial=self._text_bytes))
+            self._data_file.write(data)
+            self._index_file.write(offsets[1:].tobytes())
+            self._text_bytes = offsets[-1]
+        else:
+            self._data_file.write(array(self.typecode, values).tobytes())
+        self._length += len(values)
+        self._keys = None
+
+    def reader(self) -> "MappedKeys":
+        """Abre el mismo archivo en modo solo lectura."""
+        self._flush()
+        return MappedKeys(self.path, self.typecode)
+
+    def close(self) -> None:
+        """Cierra los archivos abiertos para escritura."""
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._data_file = self._index_file = None
+        self.writable = False
+
+    def _flush(self) -> None:
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.flush()
+
+    def _map(self) -> Sequence:
+        self._flush()
+        if self.typecode == "s":
+            return StringArray(_map_file(self.index_path).cast("q"), _map_file(self.path))
+        return _map_file(self.path).cast(self.typecode)
+
+    def _view(self) -> Sequence:
+        """Vista de las llaves, que se vuelve a mapear si el archivo creció."""
+        if self._keys is None:
+            self._keys = self._map()
+        return self._keys
+
+    def take(self, indices: List[int]) -> List[Any]:
+        """
+        Lee las llaves de los índices indicados
+
+        Recorre los índices ordenados, de modo que las lecturas avanzan por el
+        archivo en lugar de saltar al azar, y devuelve los valores en el orden
+        pedido.
+        """
+        keys = self._view()
+        result = [None] * len(indices)
+        for position in sorted(range(len(indices)), key=indices.__getitem__):
+            result[position] = keys[indices[position]]
+        return result
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._view()[index])
+        return self._view()[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        keys = self._view()
+        for start in range(0, self._length, _ITER_CHUNK):
+            yield from keys[start:start + _ITER_CHUNK]
+
+    def __reduce__(self):
+        self._flush()
+        return (MappedKeys, (self.path, self.typecode))
+
+    def __repr__(self) -> str:
+        return f"MappedKeys({self.path!r}, {self.typecode!r}, {self._length} valores)"
+
+
+class KeyPool(Sequence):
+    """
+    Valores generados de una columna, en memoria o en disco
+
+    Se comporta como una secuencia de solo lectura (len, índices, iteración e
+    'in'). Para muestrear se usa choices(), que en disco lee solo las filas
+    elegidas.
+
+    Los valores de un autoincremento se guardan como un range, que ocupa lo
+    mismo sea cual sea el número de filas, mientras los lotes sean contiguos.
+    """
+
+    def __init__(self, values: Optional[Iterable[Any]] = None):
+        if isinstance(values, range):
+            self._values: Optional[Sequence] = values
+        else:
+            self._values = list(values) if values is not None else []
+        self._length = len(self._values)
+        # Bytes estimados de los valores mientras están en memoria
+        self.memory_bytes = self._estimate_memory()
+        self.path: Optional[str] = None
+        self._conn = None
+        self._finalizer = None
+
+    @classmethod
+    def from_sequence(cls, values: Sequence) -> "KeyPool":
+        """
+        Crea un pool sobre una secuencia de solo lectura, sin copiarla
+
+        Lo usan los snapshots para leer los valores directamente del archivo
+        mapeado en memoria. No cuentan en el presupuesto de memoria: el sistema
+        operativo carga y descarta sus páginas según se usan. Si el pool se
+        amplía, los valores se copian a una lista.
+        """
+        pool = cls()
+        pool._values = values
+        pool._length = len(values)
+        pool.memory_bytes = 0
+        return pool
+
+    @property
+    def spilled(self) -> bool:
+        """True si los valores están en disco."""
+        return self.path is not None
+
+    @property
+    def disk_bytes(self) -> int:
+        """Tamaño de los archivos en disco (0 si el pool está en memoria)."""
+        if self.path is None:
+            return 0
+        if isinstance(self._values, MappedKeys):
+            return self._values.nbytes
+        self._conn.commit()
+        return os.path.getsize(self.path)
+
+    def _estimate_memory(self) -> int:
+        if isinstance(self._values, range):
+            return sys.getsizeof(self._values)
+        return estimate_size(self._values)
+
+    def extend(self, values: Union[List[Any], range]) -> None:
+        """Añade un lote de valores al final del pool."""
+        if not values:
+            return
+        if self._conn is not None:
+            self._insert(values, self._length)
+        elif isinstance(self._values, MappedKeys):
+            if mapped_typecode(values) == self._values.typecode:
+                self._values.append(values)
+            else:
+                # Un lote de otro tipo: el pool pasa al archivo SQLite
+                self._spill_to_sqlite(os.path.dirname(self.path), extra=values)
+        elif isinstance(values, range) and values.step == 1 and self._extends_range(values):
+            start = self._values.start if self._values else values.start
+            self._values = range(start, values.stop)
+            self.memory_bytes = self._estimate_memory()
+        else:
+            if not isinstance(self._values, list):
+                # Un range o una secuencia mapeada se copian a una lista
+                self._values = list(self._values)
+                self.memory_bytes = estimate_size(self._values)
+            self._values.extend(values)
+            self.memory_bytes += estimate_size(values)
+        self._length += len(values)
+
+    def _extends_range(self, values: range) -> bool:
+        """True si values continúa el range del pool (o el pool está vacío)."""
+        if not self._values:
+            return True
+        current = self._values
+        return isinstance(current, range) and current.step == 1 and current.stop == values.start
+
+    def spill(self, directory: Optional[str] = None) -> None:
+        """
+        Mueve los valores a disco
+
+        Las columnas de enteros, reales o textos van a un archivo mapeado en
+        memoria; las demás, a un archivo SQLite temporal.
+
+        Args:
+            directory: Directorio de los archivos temporales (por defecto el del sistema)
+        """
+        if self.spilled:
+            return
+        typecode = mapped_typecode(self._values)
+        if typecode is None:
+            self._spill_to_sqlite(directory)
+            return
+
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="relleneitor-keys-", suffix=".bin", dir=directory)
+        os.close(fd)
+        self._values = MappedKeys.create(path, self._values, typecode)
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_files, path, self._values.index_path)
+        self.memory_bytes = 0
+
+    def _spill_to_sqlite(self, directory: Optional[str], extra: Iterable[Any] = ()) -> None:
+        """Mueve los valores (y opcionalmente un lote más) a un archivo SQLite temporal."""
+        import sqlite3
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="relleneitor-pool-", suffix=".sqlite", dir=directory)
+        os.close(fd)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("CREATE TABLE pool (i INTEGER PRIMARY KEY, v, p INTEGER)")
+
+        values, finalizer = self._values, self._finalizer
+        self._conn = conn
+        self._insert(values, 0)
+        self._insert(extra, len(values))
+        self._conn.commit()
+
+        # Liberar el archivo mapeado anterior, si lo había
+        if isinstance(values, MappedKeys):
+            values.close()
+        if finalizer is not None:
+            finalizer()
+        self.path, self._values = path, None
+        self._finalizer = weakref.finalize(self, _remove_files, path)
+        self.memory_bytes = 0
+
+    def close(self) -> None:
+        """Cierra y elimina los archivos en disco, si existen."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if isinstance(self._values, MappedKeys) and self.path is not None:
+            self._values.close()
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def share(self) -> "KeyPool":
+        """
+        Devuelve una vista de solo lectura del pool para otros procesos
+
+        Si los valores están en un archivo mapeado, la vista solo lleva la ruta
+        al enviarse con pickle (por ejemplo a un ProcessPoolExecutor): cada
+        proceso mapea el mismo archivo y las llaves no se copian. Los valores
+        en memoria sí se copian al enviarse. El pool original debe seguir vivo
+        mientras se usen las vistas, ya que al cerrarse borra sus archivos.
+        """
+        if self._conn is not None:
+            raise ValueError("Un pool en SQLite no se puede compartir entre procesos")
+        if isinstance(self._values, MappedKeys):
+            return KeyPool.from_sequence(self._values.reader())
+        return KeyPool.from_sequence(self._values)
+
+    def _insert(self, values: Iterable[Any], first_index: int) -> None:
+        import pickle
+
+        native = _NATIVE_TYPES
+        self._conn.executemany(
+            "INSERT INTO pool (i, v, p) VALUES (?, ?, ?)",
+            (
+                (i, value, 0) if type(value) in native else (i, pickle.dumps(value), 1)
+                for i, value in enumerate(values, first_index)
+            ),
+        )
+
+    @staticmethod
+    def _decode(value: Any, pickled: int) -> Any:
+        if pickled:
+            import pickle
+
+            return pickle.loads(value)
+        return value
+
+    def _fetch(self, indices: List[int]) -> dict:
+        """Lee de SQLite los valores de los índices indicados."""
+        found = {}
+        unique = list(set(indices))
+        for start in range(0, len(unique), _MAX_SQL_PARAMS):
+            chunk = unique[start:start + _MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            for i, value, pickled in self._conn.execute(
+                f"SELECT i, v, p FROM pool WHERE i IN ({placeholders})", chunk
+            ):
+                found[i] = self._decode(value, pickled)
+        return found
+
+    def choices(self, k: int, rng: Optional[random.Random] = None) -> List[Any]:
+        """
+        Elige k valores al azar con reemplazo
+
+        Consume el generador igual que random.choices sobre una lista, así que
+        el resultado no depende de dónde esté el pool. En disco, las llaves
+        elegidas se leen en un solo lote.
+
+        Args:
+            k: Número de valores
+            rng: Generador aleatorio (por defecto las funciones del módulo random)
+        """
+        if rng is None:
+            rng = random
+        values = self._values
+        if isinstance(values, (list, range)):
+            return rng.choices(values, k=k)
+        n = self._length
+        random_value = rng.random
+        indices = [int(random_value() * n) for _ in range(k)]
+        if self._conn is not None:
+            found = self._fetch(indices)
+            return [found[i] for i in indices]
+        take = getattr(values, "take", None)
+        if take is not None:
+            return take(indices)
+        return [values[i] for i in indices]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if self._conn is None:
+            if isinstance(index, slice):
+                return list(self._values[index])
+            return self._values[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("índice fuera del pool")
+        return self._fetch([index])[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._conn is None:
+            return iter(self._values)
+        return (
+            self._decode(value, pickled)
+            for value, pickled in self._conn.execute("SELECT v, p FROM pool ORDER BY i")
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (KeyPool, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        where = f"en disco: {self.path}" if self.spilled else "en memoria"
+        return f"KeyPool({self._length} valores, {where})"
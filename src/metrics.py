@@ -0,0 +1,406 @@
+"""
+Progreso y métricas de las generaciones largas
+
+Las funciones de generación y exportación aceptan un parámetro 'progress' con
+uno o varios callbacks. Cada callback recibe un ProgressEvent al empezar,
+después de cada lote, al terminar cada tabla y al final, con las filas
+hechas, filas/s, bytes emitidos, la tabla actual y el tiempo restante
+estimado por tabla y en total.
+
+Se incluyen dos callbacks:
+
+- TerminalProgressReporter: una línea de progreso en la terminal
+- PrometheusTextfileExporter: un archivo .prom para el textfile collector de
+  node_exporter
+
+Uso:
+    generate_insert_queries_in_order(tablas, progress=TerminalProgressReporter())
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, IO, List, Optional, Sequence, Union
+
+EVENTS = ("start", "table_start", "batch", "table_end", "end")
+
+
+@dataclass
+class TableProgress:
+    """Avance de una tabla."""
+
+    name: str
+    total_rows: Optional[int] = None
+    total_bytes: Optional[int] = None
+    rows: int = 0
+    bytes: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    def fraction(self) -> Optional[float]:
+        """Fracción completada según filas o, si no se conocen, según bytes."""
+        if self.finished is not None:
+            return 1.0
+        if self.total_rows:
+            return min(self.rows / self.total_rows, 1.0)
+        if self.total_bytes:
+            return min(self.bytes / self.total_bytes, 1.0)
+        return None
+
+    def elapsed(self, now: float) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or now) - self.started
+
+
+@dataclass
+class ProgressEvent:
+    """Estado del progreso enviado a los callbacks."""
+
+    event: str
+    table: Optional[str]
+    rows: int
+    total_rows: Optional[int]
+    bytes: int
+    elapsed: float
+    rows_per_sec: float
+    bytes_per_sec: float
+    eta: Optional[float]
+    table_rows: int = 0
+    table_total_rows: Optional[int] = None
+    table_eta: Optional[float] = None
+    # Avance de todas las tablas, por nombre
+    tables: Dict[str, TableProgress] = field(default_factory=dict)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def _eta(fraction: Optional[float], elapsed: float) -> Optional[float]:
+    """Tiempo restante extrapolando el ritmo actual."""
+    if fraction is None or fraction <= 0:
+        return None
+    return elapsed * (1 - fraction) / fraction
+
+
+class ProgressTracker:
+    """Acumula el avance de una generación y lo envía a los callbacks."""
+
+    def __init__(
+        self,
+        callbacks: Sequence[ProgressCallback],
+        total_rows: Optional[Dict[str, int]] = None,
+        total_bytes: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            callbacks: Funciones que reciben cada ProgressEvent
+            total_rows: Filas previstas por tabla, si se conocen
+            total_bytes: Bytes previstos por tabla, si se conocen; se usan para
+                estimar el tiempo restante cuando no se conocen las filas
+        """
+        self.callbacks = list(callbacks)
+        total_rows = total_rows or {}
+        total_bytes = total_bytes or {}
+        self.tables: Dict[str, TableProgress] = {
+            name: TableProgress(name, total_rows.get(name), total_bytes.get(name))
+            for name in list(total_rows) + [n for n in total_bytes if n not in total_rows]
+        }
+        self.current: Optional[str] = None
+        self.started: Optional[float] = None
+        self.rows = 0
+        self.bytes = 0
+
+    def _table(self, name: str) -> TableProgress:
+        if name not in self.tables:
+            self.tables[name] = TableProgress(name)
+        return self.tables[name]
+
+    def start(self):
+        """Marca el inicio de la generación."""
+        self.started = time.perf_counter()
+        self._emit("start")
+
+    def start_table(self, name: str):
+        """Marca el inicio de una tabla."""
+        if self.started is None:
+            self.start()
+        table = self._table(name)
+        table.started = time.perf_counter()
+        self.current = name
+        self._emit("table_start")
+
+    def update(self, name: str, rows: int = 0, nbytes: int = 0):
+        """
+        Registra un lote procesado
+
+        Args:
+            name: Nombre de la tabla
+            rows: Filas del lote
+            nbytes: Bytes emitidos por el lote
+        """
+        if self.current != name:
+            self.start_table(name)
+        table = self.tables[name]
+        table.rows += rows
+        table.bytes += nbytes
+        self.rows += rows
+        self.bytes += nbytes
+        self._emit("batch")
+
+    def end_table(self, name: str, nbytes: int = 0):
+        """Marca el final de una tabla, sumando los bytes que falten por contar."""
+        if self.current != name:
+            self.start_table(name)
+        table = self.tables[name]
+        table.bytes += nbytes
+        self.bytes += nbytes
+        table.finished = time.perf_counter()
+        self._emit("table_end")
+        self.current = None
+
+    def finish(self):
+        """Marca el final de la generación."""
+        if self.started is None:
+            self.start()
+        self._emit("end")
+
+    def fraction(self) -> Optional[float]:
+        """Fracción completada del total, según filas o, si no se conocen, según bytes."""
+        tables = list(self.tables.values())
+        if not tables:
+            return None
+        for attr, total_attr in (("rows", "total_rows"), ("bytes", "total_bytes")):
+            totals = [getattr(t, total_attr) for t in tables]
+            if None in totals:
+                continue
+            total = sum(totals)
+            done = sum(
+                target if t.finished is not None else min(getattr(t, attr), target)
+                for t, target in zip(tables, totals)
+            )
+            return done / total if total else 1.0
+        return None
+
+    def event(self, kind: str) -> ProgressEvent:
+        """Construye el evento con el estado actual."""
+        now = time.perf_counter()
+        elapsed = now - self.started if self.started is not None else 0.0
+        rate_elapsed = elapsed or 1e-9
+        table = self.tables.get(self.current) if self.current else None
+
+        known_totals = [t.total_rows for t in self.tables.values()]
+        return ProgressEvent(
+            event=kind,
+            table=self.current,
+            rows=self.rows,
+            total_rows=sum(known_totals) if known_totals and None not in known_totals else None,
+            bytes=self.bytes,
+            elapsed=elapsed,
+            rows_per_sec=self.rows / rate_elapsed,
+            bytes_per_sec=self.bytes / rate_elapsed,
+            eta=0.0 if kind == "end" else _eta(self.fraction(), elapsed),
+            table_rows=table.rows if table else 0,
+            table_total_rows=table.total_rows if table else None,
+            table_eta=_eta(table.fraction(), table.elapsed(now)) if table else None,
+            tables=self.tables,
+        )
+
+    def _emit(self, kind: str):
+        if not self.callbacks:
+            return
+        event = self.event(kind)
+        for callback in self.callbacks:
+            callback(event)
+
+
+ProgressArg = Union[None, ProgressCallback, Sequence[ProgressCallback]]
+
+
+def create_tracker(
+    progress: ProgressArg,
+    total_rows: Optional[Dict[str, int]] = None,
+    total_bytes: Optional[Dict[str, int]] = None,
+) -> Optional[ProgressTracker]:
+    """
+    Crea un ProgressTracker a partir del parámetro 'progress' de las funciones públicas
+
+    Args:
+        progress: None, un callback o una lista de callbacks
+        total_rows: Filas previstas por tabla
+        total_bytes: Bytes previstos por tabla
+
+    Devuelve:
+        El tracker, o None si no hay callbacks
+    """
+    if progress is None:
+        return None
+    if callable(progress):
+        progress = [progress]
+    return ProgressTracker(progress, total_rows, total_bytes)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Formatea una duración como H:MM:SS, o '?' si no se conoce."""
+    if seconds is None:
+        return "?"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_bytes(nbytes: float) -> str:
+    """Formatea un tamaño en bytes con la unidad más adecuada."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if nbytes < 1024:
+            return f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} TB"
+
+
+class TerminalProgressReporter:
+    """Muestra el progreso en una sola línea de la terminal."""
+
+    def __init__(self, stream: Optional[IO[str]] = None, min_interval: float = 0.5):
+        """
+        Args:
+            stream: Flujo de salida (por defecto sys.stderr)
+            min_interval: Segundos mínimos entre actualizaciones por lote
+        """
+        self.stream = stream or sys.stderr
+        self.min_interval = min_interval
+        self._last = 0.0
+        self._width = 0
+
+    def __call__(self, event: ProgressEvent):
+        now = time.perf_counter()
+        if event.event == "batch" and now - self._last < self.min_interval:
+            return
+        self._last = now
+
+        if event.event == "end":
+            line = (
+                f"{event.rows:,} filas en {format_duration(event.elapsed)} "
+                f"({event.rows_per_sec:,.0f} filas/s, {format_bytes(event.bytes)})"
+            )
+        else:
+            line = self.format_line(event)
+
+        padding = " " * max(self._width - len(line), 0)
+        self._width = len(line)
+        end = "\n" if event.event == "end" else ""
+        self.stream.write(f"\r{line}{padding}{end}")
+        self.stream.flush()
+
+    @staticmethod
+    def format_line(event: ProgressEvent) -> str:
+        """Construye la línea de progreso de un evento."""
+        total = f"/{event.total_rows:,}" if event.total_rows is not None else ""
+        parts = []
+        if event.table is not None:
+            table_total = (
+                f"/{event.table_total_rows:,}" if event.table_total_rows is not None else ""
+            )
+            parts.append(
+                f"{event.table}: {event.table_rows:,}{table_total} "
+                f"(ETA {format_duration(event.table_eta)})"
+            )
+        parts.append(f"total {event.rows:,}{total} filas")
+        parts.append(f"{event.rows_per_sec:,.0f} filas/s")
+        parts.append(format_bytes(event.bytes))
+        parts.append(f"ETA {format_duration(event.eta)}")
+        return " | ".join(parts)
+
+
+def _escape_label(value: str) -> str:
+    """Escapa un valor de etiqueta según el formato de texto de Prometheus."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusTextfileExporter:
+    """
+    Escribe las métricas en formato de texto de Prometheus
+
+    El archivo se reemplaza de forma atómica, como espera el textfile
+    collector de node_exporter.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        prefix: str = "relleneitor",
+        labels: Optional[Dict[str, str]] = None,
+        min_interval: float = 5.0,
+    ):
+        """
+        Args:
+            path: Ruta del archivo .prom
+            prefix: Prefijo de los nombres de las métricas
+            labels: Etiquetas adicionales para todas las métricas (por ejemplo el job)
+            min_interval: Segundos mínimos entre escrituras por lote
+        """
+        self.path = path
+        self.prefix = prefix
+        self.labels = labels or {}
+        self.min_interval = min_interval
+        self._last = 0.0
+
+    def __call__(self, event: ProgressEvent):
+        now = time.perf_counter()
+        if event.event == "batch" and now - self._last < self.min_interval:
+            return
+        self._last = now
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render(event))
+        os.replace(tmp_path, self.path)
+
+    def _labels(self, **extra: str) -> str:
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ""
+        escaped = (f'{key}="{_escape_label(str(value))}"' for key, value in labels.items())
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self, event: ProgressEvent) -> str:
+        """Construye el contenido del archivo para un evento."""
+        p = self.prefix
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{p}_{name}{labels} {value}")
+
+        tables = list(event.tables.values())
+        metric(
+            "rows_total", "counter", "Filas generadas",
+            [(self._labels(table=t.name), t.rows) for t in tables],
+        )
+        metric(
+            "rows_target", "gauge", "Filas previstas",
+            [(self._labels(table=t.name), t.total_rows) for t in tables if t.total_rows is not None],
+        )
+        metric(
+            "bytes_total", "counter", "Bytes emitidos",
+            [(self._labels(table=t.name), t.bytes) for t in tables],
+        )
+        metric(
+            "table_eta_seconds", "gauge", "Tiempo restante estimado de la tabla actual",
+            [(self._labels(table=event.table), f"{event.table_eta:.3f}")]
+            if event.table is not None and event.table_eta is not None
+            else [],
+        )
+        metric(
+            "current_table", "gauge", "Tabla en proceso",
+            [(self._labels(table=t.name), int(t.name == event.table)) for t in tables],
+        )
+        metric("rows_per_second", "gauge", "Filas por segundo", [(self._labels(), f"{event.rows_per_sec:.3f}")])
+        metric("bytes_per_second", "gauge", "Bytes por segundo", [(self._labels(), f"{event.bytes_per_sec:.3f}")])
+        metric("elapsed_seconds", "gauge", "Tiempo transcurrido", [(self._labels(), f"{event.elapsed:.3f}")])
+        if event.eta is not None:
+            metric("eta_seconds", "gauge", "Tiempo restante estimado", [(self._labels(), f"{event.eta:.3f}")])
+        metric("finished", "gauge", "1 cuando la generación terminó", [(self._labels(), int(event.event == "end"))])
+        return "\n".join(lines) + "\n"
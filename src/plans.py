@@ -0,0 +1,265 @@
+"""
+Planes de generación compilados y su caché en disco
+
+Un plan guarda lo que hay que calcular sobre un esquema antes de producir
+datos: el orden de dependencias y el origen de los valores de cada columna
+con sus providers ya analizados. Se identifica con un hash del esquema; si al volver a
+ejecutar el hash coincide con el de un plan en caché, se carga directamente y
+se omite la validación de los providers.
+
+Uso:
+    plan = load_or_compile_plan(list(tablas.keys()))
+    queries = generate_insert_queries_in_order(tablas, plan=plan)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from src.schema import Table, Column
+from src.context import GenerationContext, current_context
+from src.providers import DEFAULT_LOCALE, parse_provider_expression
+
+# Se incrementa cuando cambia el formato del plan o lo que se guarda en él
+PLAN_VERSION = 3
+
+DEFAULT_CACHE_DIR = ".relleneitor_cache"
+
+
+@dataclass
+class ColumnPlan:
+    """Origen de los valores de una columna."""
+
+    name: str
+    # "fk", "autoincrement", "faker", "custom" o "type"
+    kind: str
+    locale: str = DEFAULT_LOCALE
+    # Expresión del faker_provider y su análisis (nombre, args, kwargs)
+    expression: Optional[str] = None
+    parsed: Optional[Tuple[str, tuple, Dict[str, Any]]] = None
+
+
+@dataclass
+class GenerationPlan:
+    """Plan de generación de un conjunto de tablas."""
+
+    schema_hash: str
+    order: List[str]
+    columns: Dict[str, List[ColumnPlan]]
+    version: int = PLAN_VERSION
+    # True si el plan se cargó de la caché
+    from_cache: bool = False
+
+    def ordered_tables(self, tables, context: Optional[GenerationContext] = None) -> List[Table]:
+        """
+        Registra las tablas sin volver a validarlas y las devuelve en el orden del plan
+
+        Args:
+            tables: Tablas del esquema (lista o diccionario {tabla: filas})
+            context: Contexto de generación (por defecto el activo)
+
+        Devuelve:
+            Las tablas en orden de dependencias
+        """
+        context = context or current_context()
+        by_name = {table.name: table for table in tables}
+        if set(by_name) != set(self.order):
+            raise ValueError(
+                "Las tablas no coinciden con las del plan: "
+                f"{sorted(set(by_name) ^ set(self.order))}"
+            )
+
+        for column_plans in self.columns.values():
+            for column_plan in column_plans:
+                if column_plan.parsed is not None:
+                    context.preload_provider(
+                        column_plan.expression, column_plan.locale, *column_plan.parsed
+                    )
+
+        ordered = [by_name[name] for name in self.order]
+        for table in ordered:
+            context.registry.register(table, validate=False)
+        return ordered
+
+
+def _provider_identity(provider) -> Optional[str]:
+    if provider is None:
+        return None
+    module = getattr(provider, "__module__", None)
+    name = getattr(provider, "__qualname__", type(provider).__qualname__)
+    return f"{module}.{name}"
+
+
+def _faker_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("faker")
+    except Exception:
+        return "desconocida"
+
+
+def schema_hash(tables: List[Table]) -> str:
+    """
+    Calcula el hash de la definición de un esquema
+
+    Incluye todo lo que afecta al plan (columnas, tipos, providers, llaves) y
+    la versión de Faker, ya que de ella depende qué providers existen.
+
+    Args:
+        tables: Tablas del esquema
+
+    Devuelve:
+        Hash SHA-256 en hexadecimal
+    """
+    definition = {
+        "plan_version": PLAN_VERSION,
+        "faker": _faker_version(),
+        "tables": [
+            {
+                "name": table.name,
+                "primary_key": table.primary_key,
+                "columns": [
+                    {
+                        "name": column.name,
+                        "type": column.type,
+                        "faker_provider": column.faker_provider,
+                        "custom_provider": _provider_identity(column.custom_provider),
+                        "is_primary_key": column.is_primary_key,
+                        "autoincrement": column.primary_key_autoincrement,
+                        "start": column.start_autoincrement,
+                        "foreign_key": (
+                            [
+                                column.foreign_key.column,
+                                column.foreign_key.references_table,
+                                column.foreign_key.references_column,
+                            ]
+                            if column.foreign_key
+                            else None
+                        ),
+                        "constraints": column.constraints,
+                        "locale": column.locale,
+                    }
+                    for column in table.columns
+                ],
+            }
+            for table in tables
+        ],
+    }
+    encoded = json.dumps(definition, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _column_plan(column: Column, context: GenerationContext) -> ColumnPlan:
+    locale = column.locale or DEFAULT_LOCALE
+    if column.foreign_key:
+        return ColumnPlan(column.name, "fk", locale)
+    if column.primary_key_autoincrement:
+        return ColumnPlan(column.name, "autoincrement", locale)
+    if column.faker_provider:
+        context.compile_provider(column.faker_provider, column.locale)
+        return ColumnPlan(
+            column.name,
+            "faker",
+            locale,
+            expression=column.faker_provider,
+            parsed=parse_provider_expression(column.faker_provider),
+        )
+    if column.custom_provider:
+        return ColumnPlan(column.name, "custom", locale)
+    return ColumnPlan(column.name, "type", locale)
+
+
+def compile_plan(
+    tables: List[Table], context: Optional[GenerationContext] = None
+) -> GenerationPlan:
+    """
+    Compila el plan de generación de un esquema
+
+    Registra las tablas (validando sus providers), las ordena por
+    dependencias y analiza las expresiones de los providers.
+
+    Args:
+        tables: Tablas del esquema
+        context: Contexto de generación (por defecto el activo)
+
+    Devuelve:
+        El plan compilado
+    """
+    from src.generator import _order_tables_by_dependencies
+
+    context = context or current_context()
+    registry = context.registry
+    tables = list(tables)
+    ordered = _order_tables_by_dependencies(tables, registry)
+
+    return GenerationPlan(
+        schema_hash=schema_hash(tables),
+        order=[table.name for table in ordered],
+        columns={
+            table.name: [_column_plan(column, context) for column in table.columns]
+            for table in ordered
+        },
+    )
+
+
+def save_plan(plan: GenerationPlan, path: str):
+    """
+    Guarda un plan en disco
+
+    El archivo es un pickle: es una caché local y no se debe cargar un plan
+    de origen desconocido.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_plan(path: str) -> GenerationPlan:
+    """Carga un plan guardado con save_plan."""
+    with open(path, "rb") as f:
+        plan = pickle.load(f)
+    if not isinstance(plan, GenerationPlan) or plan.version != PLAN_VERSION:
+        raise ValueError(f"'{path}' no contiene un plan compatible")
+    plan.from_cache = True
+    return plan
+
+
+def plan_path(cache_dir: str, schema_hash_value: str) -> str:
+    """Ruta del plan en caché para un hash de esquema."""
+    return os.path.join(cache_dir, f"plan-{schema_hash_value[:32]}.pickle")
+
+
+def load_or_compile_plan(
+    tables: List[Table],
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    context: Optional[GenerationContext] = None,
+) -> GenerationPlan:
+    """
+    Devuelve el plan en caché del esquema, o lo compila y lo guarda
+
+    Args:
+        tables: Tablas del esquema
+        cache_dir: Directorio de la caché de planes
+        context: Contexto en el que se compila el plan (por defecto el activo)
+
+    Devuelve:
+        El plan; plan.from_cache indica si se reutilizó uno guardado
+    """
+    tables = list(tables)
+    path = plan_path(cache_dir, schema_hash(tables))
+    if os.path.exists(path):
+        try:
+            return load_plan(path)
+        except (ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass  # Caché corrupta o de otra versión: se recompila
+
+    plan = compile_plan(tables, context)
+    save_plan(plan, path)
+    return plan
@@ -0,0 +1,220 @@
+"""
+Instrumentación opcional para perfilar la generación de datos
+
+Registra el tiempo acumulado y el número de llamadas por tabla, columna,
+provider y etapa del proceso (generate, store, encode, write, load). Está
+desactivada por defecto: mientras no haya un perfilador activo, cada punto de
+medición solo consulta una variable de contexto una vez por lote. El
+perfilador activo es propio de cada hilo o tarea (contextvars), así que las
+generaciones en hilos distintos no mezclan sus mediciones.
+
+Uso:
+    with profile() as profiler:
+        generate_insert_queries_in_order(tablas)
+    print(profiler.report())
+"""
+
+import contextvars
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, Optional, Tuple
+
+STAGES = ("generate", "store", "encode", "write", "load")
+
+
+@dataclass
+class ProfileEntry:
+    """Tiempo y llamadas acumulados para un elemento perfilado."""
+
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+
+    def add(self, seconds: float, rows: int):
+        self.seconds += seconds
+        self.calls += 1
+        self.rows += rows
+
+
+class Profiler:
+    """Acumula las mediciones de una sesión de generación."""
+
+    def __init__(self):
+        # (tabla, columna) -> medición, junto con el provider usado por la columna
+        self.columns: Dict[Tuple[str, str], ProfileEntry] = {}
+        self.column_providers: Dict[Tuple[str, str], str] = {}
+        self.providers: Dict[str, ProfileEntry] = {}
+        # (tabla, etapa) -> medición
+        self.stages: Dict[Tuple[str, str], ProfileEntry] = {}
+
+    def record_column(
+        self, table: str, column: str, provider: str, seconds: float, rows: int
+    ):
+        """Registra la generación de un lote de valores de una columna."""
+        key = (table, column)
+        self.columns.setdefault(key, ProfileEntry()).add(seconds, rows)
+        self.column_providers[key] = provider
+        self.providers.setdefault(provider, ProfileEntry()).add(seconds, rows)
+
+    def record_stage(self, table: str, stage: str, seconds: float, rows: int = 0):
+        """Registra una etapa del proceso para un lote de una tabla."""
+        self.stages.setdefault((table, stage), ProfileEntry()).add(seconds, rows)
+
+    @contextmanager
+    def stage(self, table: str, stage: str, rows: int = 0) -> Iterator[None]:
+        """Mide el bloque como una etapa del proceso."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(table, stage, time.perf_counter() - start, rows)
+
+    def stage_totals(self) -> Dict[str, ProfileEntry]:
+        """Suma las etapas de todas las tablas."""
+        totals: Dict[str, ProfileEntry] = {}
+        for (_, stage), entry in self.stages.items():
+            total = totals.setdefault(stage, ProfileEntry())
+            total.seconds += entry.seconds
+            total.calls += entry.calls
+            total.rows += entry.rows
+        return totals
+
+    def to_dict(self) -> dict:
+        """Devuelve todas las mediciones en un diccionario serializable a JSON."""
+        return {
+            "columns": [
+                {
+                    "table": table,
+                    "column": column,
+                    "provider": self.column_providers[(table, column)],
+                    **asdict(entry),
+                }
+                for (table, column), entry in self._ranked(self.columns)
+            ],
+            "providers": [
+                {"provider": provider, **asdict(entry)}
+                for provider, entry in self._ranked(self.providers)
+            ],
+            "stages": [
+                {"table": table, "stage": stage, **asdict(entry)}
+                for (table, stage), entry in self._ranked(self.stages)
+            ],
+            "stage_totals": {
+                stage: asdict(entry) for stage, entry in self.stage_totals().items()
+            },
+        }
+
+    def export_json(self, path: str):
+        """Guarda las mediciones en un archivo JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, top: int = 20) -> str:
+        """
+        Construye un reporte de texto con las columnas más costosas
+
+        Args:
+            top: Número máximo de columnas y providers a mostrar
+
+        Devuelve:
+            Reporte listo para imprimir
+        """
+        total = sum(entry.seconds for entry in self.columns.values()) or 1e-9
+        lines = ["Columnas más costosas:"]
+        lines.append(
+            f"  {'tabla.columna':40s} {'provider':30s} {'seg':>9s} {'%':>6s} {'filas':>9s} {'us/fila':>9s}"
+        )
+        for (table, column), entry in self._ranked(self.columns)[:top]:
+            lines.append(
+                f"  {table + '.' + column:40s} "
+                f"{self.column_providers[(table, column)]:30s} "
+                f"{entry.seconds:9.4f} {100 * entry.seconds / total:6.1f} "
+                f"{entry.rows:9d} {1e6 * entry.seconds / max(entry.rows, 1):9.2f}"
+            )
+
+        lines.append("")
+        lines.append("Providers:")
+        for provider, entry in self._ranked(self.providers)[:top]:
+            lines.append(
+                f"  {provider:71s} {entry.seconds:9.4f} {100 * entry.seconds / total:6.1f} "
+                f"{entry.rows:9d} {1e6 * entry.seconds / max(entry.rows, 1):9.2f}"
+            )
+
+        lines.append("")
+        lines.append("Etapas:")
+        totals = self.stage_totals()
+        for stage in STAGES + tuple(s for s in totals if s not in STAGES):
+            if stage in totals:
+                entry = totals[stage]
+                lines.append(f"  {stage:10s} {entry.seconds:9.4f} seg {entry.calls:7d} lotes")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _ranked(entries: dict) -> list:
+        return sorted(entries.items(), key=lambda item: item[1].seconds, reverse=True)
+
+
+# Perfilador activo en el hilo o tarea actual; None mientras la instrumentación
+# esté desactivada
+_active_profiler: contextvars.ContextVar = contextvars.ContextVar(
+    "relleneitor_profiler", default=None
+)
+_NULL_CONTEXT = nullcontext()
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """Devuelve el perfilador activo en el hilo actual o None si la instrumentación está desactivada."""
+    return _active_profiler.get()
+
+
+def enable_profiling(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Activa la instrumentación en el hilo o tarea actual
+
+    Args:
+        profiler: Perfilador a usar (por defecto uno nuevo)
+
+    Devuelve:
+        El perfilador activo
+    """
+    active = profiler or Profiler()
+    _active_profiler.set(active)
+    return active
+
+
+def disable_profiling() -> Optional[Profiler]:
+    """Desactiva la instrumentación y devuelve el perfilador que estaba activo."""
+    profiler = _active_profiler.get()
+    _active_profiler.set(None)
+    return profiler
+
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Activa la instrumentación dentro de un bloque 'with', solo en el hilo actual."""
+    active = profiler or Profiler()
+    token = _active_profiler.set(active)
+    try:
+        yield active
+    finally:
+        _active_profiler.reset(token)
+
+
+def stage(table: str, stage_name: str, rows: int = 0):
+    """
+    Context manager que mide una etapa si la instrumentación está activa
+
+    Args:
+        table: Nombre de la tabla
+        stage_name: Etapa (generate, store, encode, write, load)
+        rows: Filas procesadas en el bloque
+
+    Devuelve:
+        Un context manager; sin perfilador activo es un nullcontext reutilizado
+    """
+    profiler = _active_profiler.get()
+    if profiler is None:
+        return _NULL_CONTEXT
+    return profiler.stage(table, stage_name, rows)
@@ -0,0 +1,377 @@
+"""
+Compilación de las expresiones de faker_provider
+
+Una expresión es el nombre de un provider de Faker, opcionalmente con
+argumentos literales de Python:
+
+    "name"
+    "random_int(min=1, max=100)"
+    "pyfloat(left_digits=3, right_digits=2)"
+    "date_between(start_date='-1y')"
+    "random_element(elements=('A', 'B'))"
+
+Cada expresión se analiza y valida una sola vez (al registrar la tabla) y se
+compila a un callable sin argumentos que se guarda en caché, de modo que
+generar un valor cuesta una única llamada. Los providers text, sentence y
+paragraph se compilan al motor de texto de src.text_corpus, y los de fechas
+sin argumentos (date, date_time, date_this_year...) al de src.temporal.
+
+También define el protocolo de lotes de custom_provider: un provider marcado
+con @batch_provider recibe (n, rng) y devuelve n valores de una vez.
+"""
+
+import ast
+import functools
+import inspect
+import random
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.text_corpus import CorpusProvider, can_use_corpus
+from src.temporal import FakerTemporalProvider, faker_equivalent
+
+DEFAULT_LOCALE = "es_MX"
+
+# Instancias de Faker por (locale, semilla) del contexto por defecto, creadas bajo demanda
+_fakers: Dict[Tuple[str, Optional[int]], Any] = {}
+
+# Expresiones compiladas por (expresión, locale) del contexto por defecto
+_compiled: Dict[Tuple[str, str], Callable[[], Any]] = {}
+
+
+class ProviderExpressionError(ValueError):
+    """La expresión de un faker_provider no es válida."""
+
+
+def create_faker(locale: Optional[str] = None, seed: Optional[Any] = None):
+    """
+    Crea una instancia nueva de Faker
+
+    Args:
+        locale: Locale de Faker (por defecto es_MX)
+        seed: Semilla de un flujo aleatorio propio. Sin semilla, la instancia
+            usa el generador compartido que controla Faker.seed()
+
+    Devuelve:
+        Instancia de Faker
+    """
+    from faker import Faker
+
+    faker = Faker(locale or DEFAULT_LOCALE)
+    if seed is not None:
+        faker.seed_instance(seed)
+    return faker
+
+
+def _current_context():
+    # Importación diferida: src.context depende de src.schema, que depende de este módulo
+    from src.context import current_context
+
+    return current_context()
+
+
+def get_faker(locale: Optional[str] = None, seed: Optional[int] = None):
+    """
+    Devuelve la instancia de Faker de un locale en el contexto de generación activo
+
+    Importar y construir Faker es lo más costoso del arranque, así que se
+    retrasa hasta que se genera el primer valor. Las instancias se comparten:
+    una tabla con columnas en varios locales cuesta lo mismo que una con uno.
+
+    Args:
+        locale: Locale de Faker (por defecto es_MX)
+        seed: Semilla de un flujo aleatorio propio. Sin semilla, la instancia
+            usa el flujo del contexto (en el contexto por defecto, el generador
+            compartido que controla Faker.seed())
+
+    Devuelve:
+        Instancia de Faker compartida para ese locale y semilla
+    """
+    return _current_context().get_faker(locale, seed)
+
+
+def _relleneitor_email(faker) -> str:
+    """Email con un dominio aleatorio en lugar de los dominios gratuitos de Faker."""
+    email = faker.email()
+    if "@" in email:
+        local_part, _ = email.split("@", 1)
+        email = f"{local_part}@{faker.domain_name()}"
+    return email
+
+
+# Providers propios de Relleneitor: reciben la instancia de Faker
+CUSTOM_PROVIDERS: Dict[str, Callable[[Any], Any]] = {
+    "relleneitor_email": _relleneitor_email,
+}
+
+
+def _literal(node: ast.AST, expression: str) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise ProviderExpressionError(
+            f"Argumento no literal en '{expression}': {ast.unparse(node)}. "
+            "Solo se admiten números, cadenas, booleanos, None, tuplas, listas y diccionarios"
+        ) from None
+
+
+def parse_provider_expression(expression: str) -> Tuple[str, tuple, Dict[str, Any]]:
+    """
+    Analiza una expresión de provider
+
+    Args:
+        expression: Expresión como "pyfloat(left_digits=3, right_digits=2)"
+
+    Devuelve:
+        Tupla (nombre del provider, argumentos posicionales, argumentos con nombre)
+    """
+    try:
+        node = ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError:
+        raise ProviderExpressionError(f"Expresión de provider inválida: '{expression}'") from None
+
+    if isinstance(node, ast.Name):
+        return node.id, (), {}
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+        raise ProviderExpressionError(
+            f"Expresión de provider inválida: '{expression}'. "
+            "Se esperaba 'provider' o 'provider(arg=valor, ...)'"
+        )
+
+    args = tuple(_literal(arg, expression) for arg in node.args)
+    kwargs = {}
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            raise ProviderExpressionError(f"No se admite **kwargs en '{expression}'")
+        kwargs[keyword.arg] = _literal(keyword.value, expression)
+    return node.func.id, args, kwargs
+
+
+def compile_provider(expression: str, locale: Optional[str] = None) -> Callable[[], Any]:
+    """
+    Compila una expresión de provider a un callable sin argumentos
+
+    El callable se guarda en caché en el contexto de generación activo.
+
+    Args:
+        expression: Expresión del faker_provider
+        locale: Locale de Faker (por defecto es_MX)
+
+    Devuelve:
+        Callable que devuelve un valor nuevo en cada llamada
+    """
+    return _current_context().compile_provider(expression, locale)
+
+
+def preload_provider(
+    expression: str,
+    locale: Optional[str],
+    name: str,
+    args: tuple,
+    kwargs: Dict[str, Any],
+) -> Callable[[], Any]:
+    """
+    Compila una expresión ya analizada y validada (por ejemplo desde un plan en caché)
+
+    No vuelve a analizar la expresión ni a comprobar los argumentos.
+    """
+    return _current_context().preload_provider(expression, locale, name, args, kwargs)
+
+
+def build_provider(
+    faker,
+    expression: str,
+    name: str,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    validate: bool = True,
+) -> Callable[[], Any]:
+    """
+    Construye el callable de una expresión ya analizada sobre una instancia de Faker
+
+    Args:
+        faker: Instancia de Faker
+        expression: Expresión original, para los mensajes de error
+        name: Nombre del provider
+        args: Argumentos posicionales
+        kwargs: Argumentos con nombre
+        validate: Comprobar que el provider existe y acepta los argumentos
+
+    Devuelve:
+        Callable sin argumentos
+    """
+    if name in CUSTOM_PROVIDERS:
+        if args or kwargs:
+            raise ProviderExpressionError(f"El provider '{name}' no admite argumentos")
+        return functools.partial(CUSTOM_PROVIDERS[name], faker)
+
+    try:
+        method = getattr(faker, name)
+    except AttributeError:
+        raise ProviderExpressionError(f"Provider de Faker desconocido: '{name}'") from None
+    if validate:
+        if not callable(method):
+            raise ProviderExpressionError(f"'{name}' no es un provider de Faker")
+        try:
+            inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as e:
+            raise ProviderExpressionError(f"Argumentos inválidos en '{expression}': {e}") from None
+    if can_use_corpus(name, args, kwargs):
+        # text, sentence y paragraph se componen desde el corpus del locale
+        return CorpusProvider(faker, name, args, kwargs)
+    if not args and not kwargs:
+        # date, date_time, date_this_year... se muestrean como enteros
+        temporal = faker_equivalent(name)
+        if temporal is not None:
+            return FakerTemporalProvider(faker, name, temporal)
+    return functools.partial(method, *args, **kwargs) if args or kwargs else method
+
+
+def validate_column(column, context=None) -> None:
+    """
+    Compila el faker_provider de una columna para detectar errores antes de generar
+
+    Args:
+        column: Columna a validar
+        context: Contexto de generación en el que se compila (por defecto el activo)
+    """
+    if column.faker_provider:
+        context = context if context is not None else _current_context()
+        context.compile_provider(column.faker_provider, column.locale)
+
+
+BatchProvider = Callable[[int, random.Random], Any]
+
+
+def get_rng() -> random.Random:
+    """
+    Devuelve el generador aleatorio que se pasa a los providers de lotes
+
+    Es el del contexto de generación activo. En el contexto por defecto es el
+    propio módulo random, de modo que random.seed() hace reproducibles también
+    los providers de lotes.
+    """
+    return _current_context().rng
+
+
+def batch_provider(func: BatchProvider) -> BatchProvider:
+    """
+    Marca un custom_provider como provider de lotes
+
+    El provider recibe el número de valores y un random.Random, y devuelve
+    una secuencia (lista, tupla o array de NumPy) con exactamente n valores
+    de Python. A diferencia de los providers escalares, los valores no se
+    interpretan como literales SQL.
+
+    Uso:
+        @batch_provider
+        def estado_provider(n, rng):
+            return rng.choices(["Pendiente", "Pagado"], k=n)
+    """
+    func.is_batch_provider = True
+    return func
+
+
+def is_batch_provider(provider: Callable) -> bool:
+    """True si el provider sigue el protocolo de lotes."""
+    return getattr(provider, "is_batch_provider", False)
+
+
+class SQLLiteral(str):
+    """
+    Texto SQL que los dialectos escriben tal cual, sin comillas
+
+    parse_sql_literal lo devuelve para los literales de los providers
+    escalares que no son un valor simple (por ejemplo "NOW()" o "007").
+    """
+
+
+_INT_LITERAL = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_FLOAT_LITERAL = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+(?:[eE][+-]?[0-9]+)?|[eE][+-]?[0-9]+)")
+_HEX_LITERAL = re.compile(r"X'((?:[0-9a-fA-F]{2})*)'")
+
+
+def parse_sql_literal(literal: Any) -> Any:
+    """
+    Convierte un literal SQL devuelto por un custom provider a un valor de Python
+
+    Solo se convierten los literales simples: cadenas entre comillas, NULL,
+    TRUE/FALSE, X'..' y números sin ceros a la izquierda ("42", "-3.5",
+    "1e3"). Cualquier otro texto ("NOW()", "007", "CURRENT_DATE") se devuelve
+    como SQLLiteral y se inserta sin modificar, igual que antes de los lotes.
+
+    Args:
+        literal: Literal SQL (por ejemplo "'texto'", "42", "NULL" o "X'0a1b'")
+
+    Devuelve:
+        El valor de Python equivalente (str, int, float, bool, bytes o None),
+        o un SQLLiteral con el texto original
+    """
+    if not isinstance(literal, str) or isinstance(literal, SQLLiteral):
+        return literal
+    if literal == "NULL":
+        return None
+    if len(literal) >= 2 and literal[0] == "'" and literal[-1] == "'":
+        return literal[1:-1].replace("''", "'")
+    match = _HEX_LITERAL.fullmatch(literal)
+    if match:
+        return bytes.fromhex(match.group(1))
+    upper = literal.upper()
+    if upper in ("TRUE", "FALSE"):
+        return upper == "TRUE"
+    if _INT_LITERAL.fullmatch(literal):
+        return int(literal)
+    if _FLOAT_LITERAL.fullmatch(literal):
+        return float(literal)
+    return SQLLiteral(literal)
+
+
+def scalar_batch_adapter(provider: Callable[[], Any]) -> BatchProvider:
+    """
+    Adapta un custom_provider escalar (sin argumentos, un literal SQL por llamada)
+    al protocolo de lotes
+
+    Args:
+        provider: Provider escalar como los de los ejemplos
+
+    Devuelve:
+        Provider de lotes que llama n veces al escalar
+    """
+
+    @batch_provider
+    def adapter(n: int, rng: random.Random) -> List[Any]:
+        return [parse_sql_literal(provider()) for _ in range(n)]
+
+    return adapter
+
+
+def as_batch_provider(provider: Callable) -> BatchProvider:
+    """Devuelve el provider tal cual si es de lotes, o adaptado si es escalar."""
+    if is_batch_provider(provider):
+        return provider
+    return scalar_batch_adapter(provider)
+
+
+def call_batch_provider(provider: BatchProvider, n: int, rng: random.Random) -> List[Any]:
+    """
+    Llama a un provider de lotes y normaliza su resultado a una lista
+
+    Args:
+        provider: Provider de lotes
+        n: Número de valores a generar
+        rng: Generador aleatorio
+
+    Devuelve:
+        Lista con n valores de Python
+    """
+    values = provider(n, rng)
+    if hasattr(values, "tolist"):
+        # Los arrays de NumPy se convierten a escalares de Python
+        values = values.tolist()
+    elif not isinstance(values, list):
+        values = list(values)
+    if len(values) != n:
+        raise ValueError(
+            f"El provider '{getattr(provider, '__name__', provider)}' devolvió "
+            f"{len(values)} valores en lugar de {n}"
+        )
+    return values
@@ -0,0 +1,384 @@
+"""
+Tamaño de los conjuntos de datos por factor de escala
+
+En lugar de escribir a mano las filas de cada tabla, se declara una vez cómo
+crece cada una y se genera a cualquier factor de escala (SF), como en TPC-H:
+SF=0.01 para CI, SF=100 para pruebas de carga.
+
+    escala = ScaleSpec({
+        paises: fixed(25),               # no crece con el SF
+        clientes: scaled(150_000),       # 150 000 filas por unidad de SF
+        pedidos: ratio("clientes", 10),  # 10 pedidos por cliente
+    })
+
+    estimacion = escala.estimate(100)
+    print(estimacion.report())
+    queries = generate_insert_queries_in_order(escala.rows(0.01))
+
+Un entero en lugar de un TableSize equivale a scaled(entero).
+"""
+
+import copy
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Union
+from src.schema import Column, Table
+from src.context import GenerationContext
+from src.dialects import SQLDialect, get_dialect
+from src.metrics import format_bytes, format_duration
+
+# Filas por tabla que se generan para estimar anchos y tiempos
+DEFAULT_SAMPLE_ROWS = 200
+
+
+@dataclass
+class TableSize:
+    """Regla de tamaño de una tabla."""
+
+    # Filas por unidad de factor de escala
+    per_scale: Optional[float] = None
+    # Filas fijas, sea cual sea el factor de escala (tablas de dimensión)
+    fixed: Optional[int] = None
+    # Tabla de la que depende el tamaño y filas por cada fila suya
+    ratio_of: Optional[str] = None
+    ratio: float = 1.0
+    # Filas mínimas, para que las tablas padre nunca queden vacías
+    minimum: int = 1
+
+
+def scaled(rows_per_scale: float, minimum: int = 1) -> TableSize:
+    """Tabla que crece linealmente con el factor de escala."""
+    return TableSize(per_scale=rows_per_scale, minimum=minimum)
+
+
+def fixed(rows: int) -> TableSize:
+    """Tabla con un número fijo de filas."""
+    return TableSize(fixed=rows, minimum=0)
+
+
+def ratio(table_name: str, rows_per_row: float, minimum: int = 1) -> TableSize:
+    """Tabla con un número de filas proporcional al de otra tabla."""
+    return TableSize(ratio_of=table_name, ratio=rows_per_row, minimum=minimum)
+
+
+class ScaleSpec:
+    """
+    Reglas de tamaño de las tablas de un esquema
+
+    Args:
+        sizes: Diccionario {tabla: TableSize o filas por unidad de SF}
+    """
+
+    def __init__(self, sizes: Dict[Table, Union[int, float, TableSize]]):
+        self.sizes: Dict[Table, TableSize] = {
+            table: size if isinstance(size, TableSize) else scaled(size)
+            for table, size in sizes.items()
+        }
+        self._by_name = {table.name: table for table in self.sizes}
+        for table, size in self.sizes.items():
+            if size.ratio_of is not None and size.ratio_of not in self._by_name:
+                raise ValueError(
+                    f"La tabla '{table.name}' es proporcional a '{size.ratio_of}', "
+                    "que no está en la especificación"
+                )
+
+    def rows(self, scale_factor: float) -> Dict[Table, int]:
+        """
+        Calcula las filas de cada tabla para un factor de escala
+
+        Args:
+            scale_factor: Factor de escala (1 = tamaño base)
+
+        Devuelve:
+            Diccionario {tabla: filas}, listo para las funciones de generación
+        """
+        if scale_factor <= 0:
+            raise ValueError("El factor de escala debe ser positivo")
+        resolved: Dict[str, int] = {}
+
+        def resolve(table: Table, path: tuple) -> int:
+            if table.name in resolved:
+                return resolved[table.name]
+            if table.name in path:
+                cycle = " -> ".join(path + (table.name,))
+                raise ValueError(f"Proporciones circulares: {cycle}")
+            size = self.sizes[table]
+            if size.fixed is not None:
+                rows = size.fixed
+            elif size.ratio_of is not None:
+                parent = resolve(self._by_name[size.ratio_of], path + (table.name,))
+                rows = round(parent * size.ratio)
+            else:
+                rows = round((size.per_scale or 0) * scale_factor)
+            resolved[table.name] = max(rows, size.minimum)
+            return resolved[table.name]
+
+        return {table: resolve(table, ()) for table in self.sizes}
+
+    def scale_for_bytes(
+        self,
+        target_bytes: int,
+        dialect: Union[str, SQLDialect] = "mariadb",
+        sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    ) -> float:
+        """
+        Busca el factor de escala con el que el conjunto de datos ocupa target_bytes
+
+        Mide el ancho medio de fila de cada tabla con estimate y busca por
+        bisección el factor de escala cuyo tamaño estimado es target_bytes.
+        Como el ancho de las llaves crece con el número de filas, la medida se
+        repite una vez al factor de escala encontrado.
+
+        Args:
+            target_bytes: Tamaño deseado de la salida en bytes
+            dialect: Dialecto SQL con el que se mide el tamaño
+            sample_rows: Filas de la muestra por tabla
+
+        Devuelve:
+            Factor de escala
+        """
+        if target_bytes <= 0:
+            raise ValueError("El tamaño objetivo debe ser positivo")
+        scale_factor = 1.0
+        for _ in range(2):
+            estimate = self.estimate(scale_factor, dialect, sample_rows)
+            widths = {table.table: table.bytes_per_row for table in estimate.tables}
+            scale_factor = self._solve_scale(target_bytes, widths)
+        return scale_factor
+
+    def _solve_scale(self, target_bytes: int, widths: Dict[str, float]) -> float:
+        """Bisección del factor de escala cuyo tamaño estimado es target_bytes."""
+
+        def size(scale_factor: float) -> float:
+            rows = self.rows(scale_factor)
+            return sum(count * widths[table.name] for table, count in rows.items())
+
+        low, high = 0.0, 1.0
+        while size(high) < target_bytes:
+            if high > 1e15:
+                raise ValueError(
+                    "Ninguna tabla crece con el factor de escala; no se puede alcanzar el tamaño"
+                )
+            low, high = high, high * 2
+        for _ in range(64):
+            middle = (low + high) / 2
+            if size(middle) < target_bytes:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def estimate(
+        self,
+        scale_factor: float,
+        dialect: Union[str, SQLDialect] = "mariadb",
+        sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    ) -> "DatasetEstimate":
+        """Estima filas, bytes y tiempo a un factor de escala (ver estimate_dataset)."""
+        estimate = estimate_dataset(self.rows(scale_factor), dialect, sample_rows)
+        estimate.scale_factor = scale_factor
+        return estimate
+
+
+@dataclass
+class TableEstimate:
+    """Estimación de una tabla."""
+
+    table: str
+    rows: int
+    bytes_per_row: float
+    seconds_per_row: float
+
+    @property
+    def bytes(self) -> int:
+        return int(self.rows * self.bytes_per_row)
+
+    @property
+    def seconds(self) -> float:
+        return self.rows * self.seconds_per_row
+
+
+@dataclass
+class DatasetEstimate:
+    """Estimación de un conjunto de datos completo."""
+
+    tables: List[TableEstimate] = field(default_factory=list)
+    scale_factor: Optional[float] = None
+
+    @property
+    def total_rows(self) -> int:
+        return sum(table.rows for table in self.tables)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(table.bytes for table in self.tables)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(table.seconds for table in self.tables)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "scale_factor": self.scale_factor,
+            "total_rows": self.total_rows,
+            "total_bytes": self.total_bytes,
+            "total_seconds": self.total_seconds,
+            "tables": {
+                table.table: {
+                    "rows": table.rows,
+                    "bytes": table.bytes,
+                    "seconds": table.seconds,
+                    "bytes_per_row": table.bytes_per_row,
+                }
+                for table in self.tables
+            },
+        }
+
+    def report(self) -> str:
+        """Tabla de texto con la estimación por tabla y el total."""
+        title = "Estimación" if self.scale_factor is None else f"Estimación SF={self.scale_factor:g}"
+        lines = [
+            title,
+            f"{'tabla':30s} {'filas':>15s} {'tamaño':>12s} {'tiempo':>10s}",
+        ]
+        for table in self.tables:
+            lines.append(
+                f"{table.table:30s} {table.rows:>15,d} {format_bytes(table.bytes):>12s} "
+                f"{format_duration(table.seconds):>10s}"
+            )
+        lines.append(
+            f"{'total':30s} {self.total_rows:>15,d} {format_bytes(self.total_bytes):>12s} "
+            f"{format_duration(self.total_seconds):>10s}"
+        )
+        return "\n".join(lines)
+
+
+def _sample_provider(provider: Any) -> Any:
+    """
+    Copia de un custom_provider para la muestra
+
+    Los providers con estado (como los temporales en modo monotonic) avanzan
+    al generar, así que la muestra usa una copia y el original queda como
+    estaba. Las funciones se usan tal cual.
+    """
+    if provider is None:
+        return None
+    try:
+        return copy.deepcopy(provider)
+    except (TypeError, copy.Error):
+        return copy.copy(provider)
+
+
+def _sample_column(column: Column, offset: int) -> Column:
+    changes = {}
+    if column.primary_key_autoincrement and offset:
+        changes["start_autoincrement"] = column.start_autoincrement + offset
+    if column.custom_provider is not None:
+        changes["custom_provider"] = _sample_provider(column.custom_provider)
+    return replace(column, **changes) if changes else column
+
+
+def _sample_copy(table: Table, offset: int = 0) -> Table:
+    """
+    Copia del esquema de una tabla sin valores generados
+
+    Los autoincrementos se desplazan offset posiciones, para que la muestra
+    tenga llaves tan anchas como las últimas filas del conjunto completo, y
+    los custom_provider se copian para no alterar su estado.
+    """
+    columns = [_sample_column(column, offset) for column in table.columns]
+    return Table(name=table.name, columns=columns, primary_key=table.primary_key)
+
+
+def _generate_sample(
+    tables_and_rows: Dict[Table, int], sql_dialect: SQLDialect, context: GenerationContext
+) -> Dict[str, tuple]:
+    """Genera y codifica una muestra de copias de las tablas; devuelve {tabla: (filas, bytes, segundos)}."""
+    from src.generator import generate_row_batches_in_order
+
+    copies = tables_and_rows
+    measured = {}
+    batches = generate_row_batches_in_order(copies, batch_size=max(copies.values()), context=context)
+    while True:
+        begin = time.perf_counter()
+        try:
+            table, batch = next(batches)
+        except StopIteration:
+            break
+        nbytes = sum(len(s.encode("utf-8")) for s in sql_dialect.insert_statements(table, batch))
+        elapsed = time.perf_counter() - begin
+        rows, total_bytes, seconds = measured.get(table.name, (0, 0, 0.0))
+        measured[table.name] = (rows + len(batch), total_bytes + nbytes, seconds + elapsed)
+    return measured
+
+
+def estimate_dataset(
+    tables_and_rows: Dict[Table, int],
+    dialect: Union[str, SQLDialect] = "mariadb",
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+) -> DatasetEstimate:
+    """
+    Estima el tamaño y el tiempo de generar un conjunto de datos sin generarlo
+
+    Genera una muestra de cada tabla en un contexto aislado (sin tocar el
+    registro ni las tablas originales), mide el ancho medio de fila en SQL y
+    el tiempo de generar y codificar cada fila, y lo extrapola a las filas
+    pedidas. La muestra son las últimas filas de cada tabla, así que los
+    autoincrementos y las llaves foráneas tienen el ancho que tendrán al final.
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas
+        dialect: Dialecto SQL con el que se mide el tamaño
+        sample_rows: Filas de la muestra por tabla
+
+    Devuelve:
+        DatasetEstimate con la estimación por tabla
+    """
+    sql_dialect = get_dialect(dialect)
+    sample = {table: max(min(rows, sample_rows), 1) for table, rows in tables_and_rows.items()}
+    context = GenerationContext(seed=0)
+
+    # Calentamiento: crea las instancias de Faker y compila los providers
+    _generate_sample({_sample_copy(table): 1 for table in sample}, sql_dialect, context)
+    copies = {
+        _sample_copy(table, max(tables_and_rows[table] - rows, 0)): rows
+        for table, rows in sample.items()
+    }
+    measured = _generate_sample(copies, sql_dialect, context)
+
+    estimate = DatasetEstimate()
+    for table, rows in tables_and_rows.items():
+        sample_count, nbytes, seconds = measured[table.name]
+        estimate.tables.append(
+            TableEstimate(
+                table=table.name,
+                rows=rows,
+                bytes_per_row=nbytes / sample_count,
+                seconds_per_row=seconds / sample_count,
+            )
+        )
+    return estimate
+
+
+def rows_for_target_bytes(
+    sizes: Union[ScaleSpec, Dict[Table, Union[int, float, TableSize]]],
+    target_bytes: int,
+    dialect: Union[str, SQLDialect] = "mariadb",
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+) -> Dict[Table, int]:
+    """
+    Reparte filas entre las tablas para que la salida ocupe unos target_bytes
+
+    Args:
+        sizes: ScaleSpec o diccionario {tabla: proporción}. Un número es el peso
+            relativo de la tabla ({clientes: 1, pedidos: 10} genera diez pedidos
+            por cliente); también se aceptan fixed() y ratio()
+        target_bytes: Tamaño deseado de la salida en bytes
+        dialect: Dialecto SQL con el que se mide el tamaño
+        sample_rows: Filas de la muestra por tabla
+
+    Devuelve:
+        Diccionario {tabla: filas}
+    """
+    spec = sizes if isinstance(sizes, ScaleSpec) else ScaleSpec(sizes)
+    return spec.rows(spec.scale_for_bytes(target_bytes, dialect, sample_rows))
@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Callable
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Dict, Any, Callable, Tuple, Union
+from src.key_pools import KeyPool, parse_size
+from src.providers import validate_column
+from src.sql_types import SQLType, parse_sql_type
 
 
 @dataclass
@@ -16,12 +19,19 @@ class Column:
     name: str
     type: str
     faker_provider: Optional[str] = None
-    custom_provider: Optional[Callable[[], str]] = None
+    # Callable sin argumentos que devuelve un literal SQL, o un provider de lotes (ver src.providers.batch_provider)
+    custom_provider: Optional[Callable[..., Any]] = None
     is_primary_key: bool = False
     primary_key_autoincrement: bool = False
     start_autoincrement: int = 1
     foreign_key: Optional[ForeignKey] = None
     constraints: Optional[List[str]] = None
+    locale: Optional[str] = None  # Locale de Faker de la columna (por defecto es_MX)
+
+    @property
+    def sql_type(self) -> SQLType:
+        """Tipo SQL analizado (ver src.sql_types); el análisis se hace una vez por cadena."""
+        return parse_sql_type(self.type)
 
 
 @dataclass
@@ -30,13 +40,8 @@ class Table:
     columns: List[Column]
     primary_key: Optional[str] = None  # Nombre de la columna que es PK
 
-    # Almacenamiento de valores generados para columnas - usado para llaves foráneas
-    _generated_values: Dict[str, List[Any]] = None
-
     def __post_init__(self):
-        """Inicializar el diccionario de valores generados."""
-        self._generated_values = {}
-
+        """Marcar la columna de la clave primaria."""
         # Si no se especificó una clave primaria y hay columnas, marcar la primera como PK
         if not self.primary_key and self.columns:
             self.primary_key = self.columns[0].name
@@ -46,22 +51,42 @@ class Table:
                 if col.name == self.primary_key:
                     col.is_primary_key = True
 
+    # Los valores generados y la marca de agua viven en el registro de cada
+    # contexto de generación (ver TableRegistry.state); estos accesos usan el
+    # registro del contexto activo.
+
+    @property
+    def row_count(self) -> int:
+        """Filas generadas o ya existentes en el contexto activo: el modo append continúa a partir de aquí."""
+        return _active_registry().state(self).row_count
+
+    @row_count.setter
+    def row_count(self, value: int):
+        _active_registry().state(self).row_count = value
+
     def store_generated_value(self, column_name: str, value: Any):
         """Almacena un valor generado para una columna específica."""
-        if column_name not in self._generated_values:
-            self._generated_values[column_name] = []
-
         # Extraer el valor sin comillas si es una cadena SQL
         if isinstance(value, str) and value.startswith("'") and value.endswith("'"):
             clean_value = value[1:-1].replace("''", "'")
         else:
             clean_value = value
 
-        self._generated_values[column_name].append(clean_value)
+        self.store_generated_values(column_name, [clean_value])
+
+    def store_generated_values(self, column_name: str, values: List[Any]):
+        """Almacena un lote de valores ya convertidos a tipos de Python para una columna."""
+        _active_registry().store_generated_values(self, column_name, values)
 
-    def get_generated_values(self, column_name: str) -> List[Any]:
-        """Obtiene los valores generados para una columna específica."""
-        return self._generated_values.get(column_name, [])
+    def get_generated_values(self, column_name: str) -> KeyPool:
+        """Obtiene los valores generados para una columna específica (en memoria o en disco)."""
+        return _active_registry().get_generated_values(self, column_name)
+
+    def record_existing_rows(
+        self, row_count: int, key_values: Optional[Dict[str, Iterable[Any]]] = None
+    ):
+        """Registra un conjunto de datos ya existente (ver TableRegistry.record_existing_rows)."""
+        _active_registry().record_existing_rows(self, row_count, key_values)
 
     def __hash__(self):
         """Implementación del método hash para poder usar la tabla como clave en diccionarios."""
@@ -74,31 +99,214 @@ class Table:
         return self.name == other.name
 
 
+@dataclass
+class TableState:
+    """Valores generados y marca de agua de una tabla dentro de un registro."""
+
+    # Almacenamiento de valores generados para columnas - usado para llaves foráneas
+    pools: Dict[str, KeyPool] = field(default_factory=dict)
+    # Filas generadas o ya existentes: el modo append continúa a partir de aquí
+    row_count: int = 0
+
+
 @dataclass
 class TableRegistry:
     """Registro central de tablas para gestionar relaciones entre ellas."""
 
     tables: Dict[str, Table] = None
+    # Bytes máximos en memoria para los valores generados; None es ilimitado
+    memory_budget: Optional[int] = None
+    # Directorio de los pools movidos a disco (por defecto el temporal del sistema)
+    spill_dir: Optional[str] = None
 
     def __post_init__(self):
         if self.tables is None:
             self.tables = {}
+        # Estado de cada tabla por nombre, junto con la definición a la que pertenece
+        self._states: Dict[str, Tuple[Table, TableState]] = {}
+        # Pico de bytes en memoria por tabla
+        self._peak_memory: Dict[str, int] = {}
+        # Contexto de generación dueño del registro (lo asigna GenerationContext)
+        self.context = None
+
+    def register(self, table: Table, validate: bool = True):
+        """
+        Registra una tabla en el registro
 
-    def register(self, table: Table):
-        """Registra una tabla en el registro."""
+        Args:
+            table: Tabla a registrar
+            validate: Si se validan las expresiones de sus providers (un plan
+                en caché ya las validó), con las instancias de Faker del
+                contexto dueño del registro
+        """
+        if validate:
+            for column in table.columns:
+                validate_column(column, self.context)
+        # Una definición nueva con el nombre de otra registrada empieza sin valores
+        entry = self._states.get(table.name)
+        if entry is not None and entry[0] is not table:
+            del self._states[table.name]
         self.tables[table.name] = table
         return table
 
+    def state(self, table: Table) -> TableState:
+        """
+        Devuelve el estado de una tabla en este registro, creándolo la primera vez
+
+        El estado se guarda por nombre de tabla. Mientras una definición esté
+        registrada, las demás con el mismo nombre comparten su estado; cuando se
+        registra otra definición (o la anterior deja de estar en tables), el
+        estado empieza vacío, como el de una tabla recién creada.
+        """
+        entry = self._states.get(table.name)
+        if entry is None or (entry[0] is not table and entry[0] is not self.tables.get(table.name)):
+            entry = (table, TableState())
+            self._states[table.name] = entry
+        return entry[1]
+
+    def row_count(self, table: Table) -> int:
+        """Filas generadas o registradas de una tabla en este registro."""
+        return self.state(table).row_count
+
+    def store_generated_values(self, table: Table, column_name: str, values: List[Any]):
+        """Almacena un lote de valores ya convertidos a tipos de Python para una columna."""
+        pools = self.state(table).pools
+        if column_name not in pools:
+            pools[column_name] = KeyPool()
+        pools[column_name].extend(values)
+
+    def get_generated_values(self, table: Table, column_name: str) -> KeyPool:
+        """Obtiene los valores generados para una columna (en memoria o en disco)."""
+        return self.state(table).pools.get(column_name) or KeyPool()
+
+    def record_existing_rows(
+        self,
+        table: Table,
+        row_count: int,
+        key_values: Optional[Dict[str, Iterable[Any]]] = None,
+    ):
+        """
+        Registra un conjunto de datos ya existente para generar filas nuevas encima (modo append)
+
+        Fija la marca de agua de la tabla y reemplaza los pools de llaves. Las
+        columnas autoincrementales sin valores explícitos se registran como el
+        rango start_autoincrement .. start_autoincrement + row_count, sin
+        materializar los valores.
+
+        Args:
+            table: Tabla cuyos datos ya existen
+            row_count: Número de filas que ya existen
+            key_values: Valores existentes por columna, para las columnas
+                referenciadas por llaves foráneas que no son autoincrementales
+        """
+        key_values = key_values or {}
+        unknown = set(key_values) - {column.name for column in table.columns}
+        if unknown:
+            raise ValueError(f"La tabla '{table.name}' no tiene las columnas {sorted(unknown)}")
+
+        state = self.state(table)
+        for pool in state.pools.values():
+            pool.close()
+        state.pools = {}
+        for column in table.columns:
+            if column.name in key_values:
+                values = key_values[column.name]
+                state.pools[column.name] = (
+                    values if isinstance(values, KeyPool) else KeyPool(values)
+                )
+            elif column.primary_key_autoincrement:
+                start = column.start_autoincrement
+                state.pools[column.name] = KeyPool(range(start, start + row_count))
+        state.row_count = row_count
+
     def get(self, table_name: str) -> Table:
         """Obtiene una tabla del registro."""
         return self.tables.get(table_name)
 
-    def get_foreign_key_values(self, foreign_key: ForeignKey) -> List[Any]:
+    def get_foreign_key_values(self, foreign_key: ForeignKey) -> KeyPool:
         """Obtiene los valores generados para una columna referenciada por una llave foránea."""
         referenced_table = self.get(foreign_key.references_table)
         if referenced_table:
-            return referenced_table.get_generated_values(foreign_key.references_column)
-        return []
+            return self.get_generated_values(referenced_table, foreign_key.references_column)
+        return KeyPool()
+
+    def set_memory_budget(
+        self, budget: Optional[Union[int, str]], spill_dir: Optional[str] = None
+    ):
+        """
+        Limita la memoria de los valores generados
+
+        Args:
+            budget: Bytes máximos ("512MB", "2G" o un entero); None para no limitar
+            spill_dir: Directorio para los pools que se muevan a disco
+        """
+        self.memory_budget = parse_size(budget) if budget is not None else None
+        self.spill_dir = spill_dir
+        self.enforce_memory_budget()
+
+    def memory_usage(self) -> int:
+        """Bytes estimados en memoria de todos los valores generados."""
+        return sum(
+            pool.memory_bytes
+            for table in self.tables.values()
+            for pool in self.state(table).pools.values()
+        )
+
+    def enforce_memory_budget(self):
+        """
+        Registra el pico de memoria por tabla y, si se supera el presupuesto,
+        mueve a disco los pools más grandes hasta volver a entrar en él.
+        """
+        usage = 0
+        for name, table in self.tables.items():
+            table_usage = sum(pool.memory_bytes for pool in self.state(table).pools.values())
+            if table_usage > self._peak_memory.get(name, 0):
+                self._peak_memory[name] = table_usage
+            usage += table_usage
+
+        if self.memory_budget is None or usage <= self.memory_budget:
+            return
+
+        pools = sorted(
+            (
+                pool
+                for table in self.tables.values()
+                for pool in self.state(table).pools.values()
+                if not pool.spilled
+            ),
+            key=lambda pool: pool.memory_bytes,
+            reverse=True,
+        )
+        for pool in pools:
+            if usage <= self.memory_budget:
+                break
+            usage -= pool.memory_bytes
+            pool.spill(self.spill_dir)
+
+    def memory_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resume el uso de memoria y disco de los valores generados por tabla
+
+        Devuelve:
+            {tabla: {"memory_bytes", "peak_memory_bytes", "disk_bytes", "spilled_columns"}}
+        """
+        report = {}
+        for name, table in self.tables.items():
+            pools = self.state(table).pools
+            report[name] = {
+                "memory_bytes": sum(pool.memory_bytes for pool in pools.values()),
+                "peak_memory_bytes": self._peak_memory.get(name, 0),
+                "disk_bytes": sum(pool.disk_bytes for pool in pools.values()),
+                "spilled_columns": [column for column, pool in pools.items() if pool.spilled],
+            }
+        return report
+
+
+def _active_registry() -> TableRegistry:
+    # Importación diferida: src.context depende de este módulo
+    from src.context import current_context
+
+    return current_context().registry
 
 
 # Instancia global del registro de tablas
@@ -0,0 +1,233 @@
+"""
+Snapshots de los pools de llaves del registro
+
+Un snapshot guarda en un único archivo binario los valores generados de cada
+tabla y su marca de agua (row_count), para generar las tablas padre en un
+proceso y las hijas en otro, o reintentar un trabajo sin regenerar las tablas
+ya cargadas.
+
+Formato (little o big endian según la máquina que lo escribe, indicado en la cabecera):
+
+    b"RLLNSNAP"                  firma
+    uint64                       longitud de la cabecera
+    cabecera JSON                tablas, columnas y posición de cada sección
+    secciones de datos           alineadas a 8 bytes
+
+Cada columna se guarda según sus valores:
+
+    range    autoincremento contiguo: solo el inicio y el final
+    int64    enteros, como un array de int64
+    float64  números reales, como un array de float64
+    str      desplazamientos int64 (n + 1) seguidos del texto en UTF-8
+    pickle   cualquier otro valor (fechas, decimales, NULL mezclados...)
+
+Al restaurar, las secciones int64, float64 y str se leen directamente del
+archivo mapeado en memoria, sin copiarlas; solo las secciones pickle se cargan.
+
+Uso:
+    save_snapshot("padres.snap")                          # proceso 1
+    load_snapshot("padres.snap", tables=create_schema())  # proceso 2
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional
+from src.key_pools import KeyPool, StringArray
+from src.schema import Table, TableRegistry
+from src.context import current_context
+
+MAGIC = b"RLLNSNAP"
+SNAPSHOT_VERSION = 1
+
+_LENGTH = struct.Struct("<Q")
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _encode_column(values: Sequence) -> Dict[str, Any]:
+    """
+    Elige la representación de una columna y la codifica
+
+    Devuelve:
+        Diccionario con "kind", "length" y los bytes de las secciones ("data" y,
+        para cadenas, "offsets")
+    """
+    if isinstance(values, KeyPool) and isinstance(values._values, range):
+        keys = values._values
+        return {"kind": "range", "length": len(keys), "start": keys.start, "stop": keys.stop}
+
+    values = list(values)
+    types = set(map(type, values))
+    if types == {int} and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return {"kind": "int64", "length": len(values), "data": array("q", values).tobytes()}
+    if types == {float}:
+        return {"kind": "float64", "length": len(values), "data": array("d", values).tobytes()}
+    if types == {str}:
+        data = "".join(values).encode("utf-8")
+        if len(data) == sum(map(len, values)):
+            # Solo ASCII: la longitud en bytes es la de cada cadena
+            lengths = map(len, values)
+        else:
+            encoded = [value.encode("utf-8") for value in values]
+            lengths = map(len, encoded)
+        offsets = array("q", [0])
+        offsets.extend(accumulate(lengths))
+        return {"kind": "str", "length": len(values), "offsets": offsets.tobytes(), "data": data}
+    return {
+        "kind": "pickle",
+        "length": len(values),
+        "data": pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL),
+    }
+
+
+def save_snapshot(
+    path: str,
+    registry: Optional[TableRegistry] = None,
+    tables: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """
+    Guarda los pools de llaves y la marca de agua de las tablas del registro
+
+    Args:
+        path: Archivo del snapshot
+        registry: Registro del que se leen los valores (por defecto el del
+            contexto activo)
+        tables: Nombres de las tablas a guardar (por defecto todas)
+
+    Devuelve:
+        {tabla: row_count} de las tablas guardadas
+    """
+    registry = registry if registry is not None else current_context().registry
+    names = list(tables) if tables is not None else list(registry.tables)
+    header = {"version": SNAPSHOT_VERSION, "byteorder": sys.byteorder, "tables": {}}
+    sections: List[bytes] = []
+    position = 0
+
+    def add_section(data: bytes) -> Dict[str, int]:
+        nonlocal position
+        entry = {"offset": position, "size": len(data)}
+        padding = -len(data) % 8
+        sections.append(data + b"\0" * padding)
+        position += len(data) + padding
+        return entry
+
+    for name in names:
+        table = registry.get(name)
+        if table is None:
+            raise ValueError(f"La tabla '{name}' no está en el registro")
+        columns = {}
+        state = registry.state(table)
+        for column_name, pool in state.pools.items():
+            encoded = _encode_column(pool)
+            for section in ("offsets", "data"):
+                if section in encoded:
+                    encoded[section] = add_section(encoded[section])
+            columns[column_name] = encoded
+        header["tables"][name] = {"row_count": state.row_count, "columns": columns}
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-(len(MAGIC) + _LENGTH.size + len(header_bytes)) % 8)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return {name: header["tables"][name]["row_count"] for name in names}
+
+
+def read_snapshot_header(path: str) -> Dict[str, Any]:
+    """Lee la cabecera de un snapshot (tablas, columnas y marcas de agua)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' no es un snapshot de Relleneitor")
+        (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        header = json.loads(f.read(length))
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Versión de snapshot no soportada: {header.get('version')}")
+    header["data_offset"] = len(MAGIC) + _LENGTH.size + length
+    return header
+
+
+def _decode_column(entry: Dict[str, Any], buffer: memoryview) -> KeyPool:
+    kind = entry["kind"]
+    if kind == "range":
+        return KeyPool(range(entry["start"], entry["stop"]))
+
+    def section(name: str) -> memoryview:
+        offset, size = entry[name]["offset"], entry[name]["size"]
+        return buffer[offset:offset + size]
+
+    if kind == "int64":
+        return KeyPool.from_sequence(section("data").cast("q"))
+    if kind == "float64":
+        return KeyPool.from_sequence(section("data").cast("d"))
+    if kind == "str":
+        return KeyPool.from_sequence(StringArray(section("offsets").cast("q"), section("data")))
+    if kind == "pickle":
+        return KeyPool(pickle.loads(section("data")))
+    raise ValueError(f"Tipo de columna desconocido en el snapshot: '{kind}'")
+
+
+def load_snapshot(
+    path: str,
+    tables: Optional[Iterable[Table]] = None,
+    registry: Optional[TableRegistry] = None,
+) -> Dict[str, int]:
+    """
+    Restaura en el registro los pools de llaves y las marcas de agua de un snapshot
+
+    Los valores numéricos y de texto no se copian: se leen del archivo mapeado
+    en memoria, así que restaurar cuesta lo mismo sea cual sea su tamaño. El
+    archivo no debe modificarse mientras el registro lo use.
+
+    Args:
+        path: Archivo del snapshot
+        tables: Definiciones de las tablas del snapshot; las que falten se buscan
+            en el registro
+        registry: Registro en el que se restauran (por defecto el del contexto activo)
+
+    Devuelve:
+        {tabla: row_count} de las tablas restauradas
+    """
+    registry = registry if registry is not None else current_context().registry
+    header = read_snapshot_header(path)
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"El snapshot '{path}' se escribió en una máquina {header['byteorder']} endian")
+
+    by_name = {table.name: table for table in tables or ()}
+    missing = [
+        name for name in header["tables"] if name not in by_name and registry.get(name) is None
+    ]
+    if missing:
+        raise ValueError(f"Faltan las definiciones de las tablas {missing} del snapshot")
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # Cada pool conserva una vista del mapa; se libera cuando dejan de usarse todos
+    buffer = memoryview(mapped)[header["data_offset"]:]
+
+    restored = {}
+    for name, table_entry in header["tables"].items():
+        table = by_name.get(name) or registry.get(name)
+        registry.register(table)
+        registry.record_existing_rows(
+            table,
+            table_entry["row_count"],
+            {
+                column_name: _decode_column(entry, buffer)
+                for column_name, entry in table_entry["columns"].items()
+            },
+        )
+        restored[name] = registry.row_count(table)
+    return restored
@@ -0,0 +1,331 @@
+"""
+Descriptores de tipos SQL y generadores por tipo
+
+Las columnas sin provider se generan a partir de su tipo SQL. Comparar la
+cadena del tipo tal cual deja fuera los tipos con parámetros (VARCHAR(50),
+DECIMAL(10,2)) y obliga a repetir la comparación en cada valor. Aquí la
+cadena se analiza una sola vez en un SQLType (tipo base, longitud,
+precisión, escala y UNSIGNED) y el descriptor elige un
+generador de lotes especializado que respeta sus límites:
+
+- INTEGER y variantes: enteros entre 0 y 1000, sin salirse del rango del
+  tipo (TINYINT llega a 127, o a 255 si es UNSIGNED)
+- DECIMAL(p,s) y NUMERIC(p,s): números con s decimales y como mucho p
+  dígitos (enteros si la escala es 0); sin parámetros, hasta 1000 con dos
+  decimales, como FLOAT
+- CHAR(n), VARCHAR(n), TEXT: texto del corpus del locale de como mucho n
+  caracteres (100 sin longitud)
+- BINARY(n), VARBINARY(n), BLOB: bytes aleatorios, n exactos en BINARY(n)
+- DATE, DATETIME, TIMESTAMP, TIME: motor de fechas (ver src.temporal)
+- YEAR, BOOLEAN y los pseudo-tipos EMAIL, NAME, URL, IP, PHONE y ADDRESS
+
+Uso:
+    sql_type = parse_sql_type("DECIMAL(10,2) UNSIGNED NOT NULL")
+    sql_type.precision, sql_type.scale, sql_type.unsigned   # 10, 2, True
+    sql_type.values(1000, faker, rng)
+"""
+
+import functools
+import random
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.text_corpus import get_corpus
+from src.temporal import TemporalProvider, provider_for_type
+
+# Longitud de los textos sin longitud declarada y valor máximo de los números
+DEFAULT_TEXT_LENGTH = 100
+DEFAULT_NUMBER_MAX = 1000
+# Bytes de los binarios sin longitud declarada
+DEFAULT_BINARY_LENGTH = 5
+
+# Nombres alternativos de los tipos base
+_ALIASES: Dict[str, str] = {
+    "INT2": "SMALLINT",
+    "INT4": "INTEGER",
+    "INT8": "BIGINT",
+    "MEDIUMINT": "INTEGER",
+    "SERIAL": "INTEGER",
+    "BIGSERIAL": "BIGINT",
+    "DEC": "DECIMAL",
+    "NUMBER": "NUMERIC",
+    "DOUBLE PRECISION": "DOUBLE",
+    "FLOAT4": "REAL",
+    "FLOAT8": "DOUBLE",
+    "CHARACTER": "CHAR",
+    "NCHAR": "CHAR",
+    "CHARACTER VARYING": "VARCHAR",
+    "NVARCHAR": "VARCHAR",
+    "VARCHAR2": "VARCHAR",
+    "TINYTEXT": "TEXT",
+    "MEDIUMTEXT": "TEXT",
+    "LONGTEXT": "TEXT",
+    "BYTEA": "BLOB",
+    "TINYBLOB": "BLOB",
+    "MEDIUMBLOB": "BLOB",
+    "LONGBLOB": "BLOB",
+    "BOOL": "BOOLEAN",
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMP",
+    "TIMESTAMP WITHOUT TIME ZONE": "TIMESTAMP",
+    "TIMESTAMPTZ": "TIMESTAMP",
+    "TIME WITH TIME ZONE": "TIME",
+    "TIME WITHOUT TIME ZONE": "TIME",
+}
+
+# Rango de los enteros con signo por tipo base
+_INTEGER_BITS = {"TINYINT": 8, "SMALLINT": 16, "INTEGER": 32, "INT": 32, "BIGINT": 64}
+
+_CATEGORIES: Dict[str, str] = {
+    **{name: "integer" for name in _INTEGER_BITS},
+    "DECIMAL": "decimal",
+    "NUMERIC": "decimal",
+    "FLOAT": "float",
+    "REAL": "float",
+    "DOUBLE": "float",
+    "CHAR": "text",
+    "VARCHAR": "text",
+    "TEXT": "text",
+    "CLOB": "text",
+    "BOOLEAN": "boolean",
+    "DATE": "temporal",
+    "DATETIME": "temporal",
+    "TIMESTAMP": "temporal",
+    "TIME": "temporal",
+    "YEAR": "year",
+    "BINARY": "binary",
+    "VARBINARY": "binary",
+    "BLOB": "binary",
+}
+
+# Pseudo-tipos que se sirven con Faker, por subcadena y en este orden
+_FAKER_TYPES: List[Tuple[str, str]] = [
+    ("EMAIL", "email"),
+    ("NAME", "name"),
+    ("URL", "url"),
+    ("IPADDRESS", "ipv4"),
+    ("PHONE", "phone_number"),
+    ("ADDRESS", "address"),
+]
+
+_PARAMETERS = re.compile(r"\(([^)]*)\)")
+
+
+@dataclass(frozen=True)
+class SQLType:
+    """
+    Tipo SQL de una columna, ya analizado
+
+    Args:
+        name: Cadena original del tipo, en mayúsculas
+        base: Tipo base normalizado ("VARCHAR", "DECIMAL", ...)
+        category: Familia del tipo, que decide el generador ("integer",
+            "decimal", "float", "text", "boolean", "temporal", "year",
+            "binary", "faker" o "unknown")
+        length: Longitud de CHAR, VARCHAR, TEXT y los binarios
+        precision: Dígitos totales de DECIMAL y NUMERIC (de FLOAT(p) y las
+            fracciones de segundo de TIMESTAMP(p) solo se registran)
+        scale: Dígitos decimales de DECIMAL y NUMERIC
+        unsigned: Si el tipo se declaró UNSIGNED
+    """
+
+    name: str
+    base: str
+    category: str
+    length: Optional[int] = None
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+    unsigned: bool = False
+
+    @property
+    def integer_range(self) -> Tuple[int, int]:
+        """Valores mínimo y máximo que admite un tipo entero."""
+        bits = _INTEGER_BITS[self.base]
+        if self.unsigned:
+            return 0, 2**bits - 1
+        return -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+
+    @property
+    def max_value(self) -> Optional[float]:
+        """Mayor valor que cabe en un DECIMAL(p,s), o None si no tiene precisión."""
+        if self.precision is None:
+            return None
+        scale = self.scale or 0
+        return 10 ** (self.precision - scale) - 10**-scale
+
+    def values(self, n: int, faker, rng: random.Random) -> List[Any]:
+        """
+        Genera un lote de valores del tipo
+
+        Args:
+            n: Número de valores
+            faker: Instancia de Faker del locale de la columna
+            rng: Generador aleatorio de los números, booleanos y binarios (el
+                texto y las fechas usan el de la instancia de Faker)
+
+        Devuelve:
+            Lista de n valores de Python
+        """
+        return _GENERATORS[self.category](self, n, faker, rng)
+
+    def truncate(self, values: List[Any]) -> List[Any]:
+        """Recorta a la longitud del tipo los textos que la superan."""
+        length = self.length
+        if length is None or self.category != "text":
+            return values
+        return [
+            value[:length] if value.__class__ is str and len(value) > length else value
+            for value in values
+        ]
+
+
+def _int_parameter(text: str) -> Optional[int]:
+    text = text.strip()
+    return int(text) if text.isdigit() else None
+
+
+@functools.lru_cache(maxsize=None)
+def parse_sql_type(type_string: str) -> SQLType:
+    """
+    Analiza la cadena de un tipo SQL
+
+    Args:
+        type_string: Tipo tal como se declara en la columna ("VARCHAR(50)",
+            "DECIMAL(10, 2)", "INT UNSIGNED NOT NULL", "CHARACTER VARYING(20)")
+
+    Devuelve:
+        SQLType con el tipo base y sus parámetros. Los tipos que no se
+        reconocen quedan en la categoría "unknown" (o "faker" si nombran un
+        pseudo-tipo como EMAIL)
+    """
+    name = " ".join(type_string.upper().split())
+    match = _PARAMETERS.search(name)
+    parameters = match.group(1).split(",") if match else []
+    words = _PARAMETERS.sub(" ", name).split()
+
+    unsigned = "UNSIGNED" in words
+    # NULL y NOT NULL no cambian los valores generados
+    words = [w for w in words if w not in ("UNSIGNED", "SIGNED", "ZEROFILL", "NOT", "NULL")]
+
+    base = " ".join(words)
+    base = _ALIASES.get(base, base)
+    category = _CATEGORIES.get(base)
+    if category is None:
+        faker_type = any(marker in base for marker, _ in _FAKER_TYPES) or base == "IP"
+        category = "faker" if faker_type else "unknown"
+
+    length = precision = scale = None
+    if category == "decimal":
+        if parameters:
+            precision = _int_parameter(parameters[0])
+            # DECIMAL(p) equivale a DECIMAL(p,0)
+            scale = _int_parameter(parameters[1]) if len(parameters) > 1 else 0
+            if precision is not None and scale is not None and scale > precision:
+                raise ValueError(f"La escala de '{type_string}' es mayor que su precisión")
+    elif category in ("float", "temporal"):
+        # FLOAT(p) y las fracciones de segundo de TIMESTAMP(p)
+        precision = _int_parameter(parameters[0]) if parameters else None
+    elif parameters:
+        # VARCHAR(MAX) y similares quedan sin longitud
+        length = _int_parameter(parameters[0])
+
+    return SQLType(name, base, category, length, precision, scale, unsigned)
+
+
+def _integer_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[int]:
+    low, high = sql_type.integer_range
+    low, high = max(low, 0), min(high, DEFAULT_NUMBER_MAX)
+    width = high - low + 1
+    random_ = rng.random
+    return [low + int(random_() * width) for _ in range(n)]
+
+
+def _decimal_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[Any]:
+    random_ = rng.random
+    if sql_type.precision is None:
+        return [round(random_() * DEFAULT_NUMBER_MAX, 2) for _ in range(n)]
+    scale = sql_type.scale or 0
+    upper = min(sql_type.max_value, DEFAULT_NUMBER_MAX)
+    if scale == 0:
+        width = int(upper) + 1
+        return [int(random_() * width) for _ in range(n)]
+    return [round(random_() * upper, scale) for _ in range(n)]
+
+
+def _float_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[float]:
+    random_ = rng.random
+    return [round(random_() * DEFAULT_NUMBER_MAX, 2) for _ in range(n)]
+
+
+def _text_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[str]:
+    length = sql_type.length if sql_type.length is not None else DEFAULT_TEXT_LENGTH
+    corpus = get_corpus(faker)
+    if length >= 5:
+        return corpus.texts(n, faker.random, max_nb_chars=length)
+    # CHAR(1) a CHAR(4): palabras del corpus recortadas
+    words = corpus.words
+    count = len(words)
+    random_ = faker.random.random
+    return [words[int(random_() * count)][:length] for _ in range(n)]
+
+
+def _boolean_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[bool]:
+    random_ = rng.random
+    return [random_() < 0.5 for _ in range(n)]
+
+
+@functools.lru_cache(maxsize=None)
+def _temporal_provider(base: str) -> TemporalProvider:
+    """Proveedor de un tipo temporal, creado una sola vez por tipo base."""
+    return provider_for_type(base)
+
+
+def _temporal_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[Any]:
+    return _temporal_provider(sql_type.base)(n, faker.random)
+
+
+def _year_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[int]:
+    width = date.today().year - 1970 + 1
+    random_ = rng.random
+    return [1970 + int(random_() * width) for _ in range(n)]
+
+
+def _binary_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[bytes]:
+    length = sql_type.length
+    if length is None:
+        size = DEFAULT_BINARY_LENGTH
+    elif sql_type.base == "BINARY":
+        size = length
+    else:
+        size = min(length, DEFAULT_BINARY_LENGTH)
+    randbytes = rng.randbytes
+    return [randbytes(size) for _ in range(n)]
+
+
+def _faker_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[str]:
+    if sql_type.base == "IP":
+        provider = "ipv4"
+    else:
+        provider = next(name for marker, name in _FAKER_TYPES if marker in sql_type.base)
+    method = getattr(faker, provider)
+    if provider == "address":
+        return [method().replace("\n", ", ") for _ in range(n)]
+    return [method() for _ in range(n)]
+
+
+def _unknown_values(sql_type: SQLType, n: int, faker, rng: random.Random) -> List[str]:
+    return [f"Tipo desconocido:{sql_type.name}"] * n
+
+
+_GENERATORS: Dict[str, Callable[[SQLType, int, Any, random.Random], List[Any]]] = {
+    "integer": _integer_values,
+    "decimal": _decimal_values,
+    "float": _float_values,
+    "text": _text_values,
+    "boolean": _boolean_values,
+    "temporal": _temporal_values,
+    "year": _year_values,
+    "binary": _binary_values,
+    "faker": _faker_values,
+    "unknown": _unknown_values,
+}
@@ -0,0 +1,241 @@
+"""
+Módulo para manejar operaciones de base de datos SQLite
+
+Ofrece la misma interfaz que MariaDBManager pero sin necesidad de un servidor,
+lo que permite cargar y validar los datos generados de forma local, ya sea en
+un archivo o en memoria.
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+import logging
+from contextlib import contextmanager
+from src.dialects import split_sql_statements
+from src.schema import Table
+from src.profiling import stage
+from src.metrics import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteManager:
+    def __init__(
+        self,
+        database: str = ":memory:",
+        journal_mode: Optional[str] = "WAL",
+        synchronous: Optional[str] = "NORMAL",
+        foreign_keys: bool = False,
+        batch_size: int = 1000,
+    ):
+        """
+        Inicializa el gestor de base de datos SQLite
+
+        Args:
+            database: Ruta del archivo de la base de datos (por defecto: ":memory:")
+            journal_mode: Valor de PRAGMA journal_mode (por defecto: WAL, None para no modificarlo)
+            synchronous: Valor de PRAGMA synchronous (por defecto: NORMAL, None para no modificarlo)
+            foreign_keys: Si se deben validar las llaves foráneas al insertar (por defecto: False)
+            batch_size: Número de filas enviadas en cada executemany (por defecto: 1000)
+        """
+        self.database = database
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.foreign_keys = foreign_keys
+        self.batch_size = batch_size
+        self.connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión y aplica los PRAGMA configurados"""
+        conn = sqlite3.connect(self.database)
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous:
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}")
+        return conn
+
+    def open(self) -> bool:
+        """
+        Abre una conexión que se reutiliza en todas las operaciones hasta close()
+
+        Los escritores por lotes la abren al empezar, así que cada lote no
+        vuelve a conectar ni a aplicar los PRAGMA.
+
+        Devuelve:
+            True si la conexión se abrió ahora y quien la pidió debe cerrarla con
+            close(); False si ya había una abierta o la base de datos está en
+            memoria (su conexión se conserva hasta close() del gestor)
+        """
+        if self.connection is not None:
+            return False
+        try:
+            self.connection = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Error al conectar a la base de datos: {e}")
+            raise
+        return self.database != ":memory:"
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Context manager para obtener una conexión a la base de datos
+
+        Si hay una conexión abierta con open() se reutiliza. Las bases de datos
+        en memoria conservan una única conexión abierta hasta llamar a close(),
+        ya que cerrarla descartaría los datos.
+        """
+        if self.connection is not None:
+            yield self.connection
+            return
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Error al conectar a la base de datos: {e}")
+            raise
+
+        if self.database == ":memory:":
+            self.connection = conn
+            yield conn
+            return
+
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def execute_queries(
+        self, queries: Dict[str, str], tracker: Optional[ProgressTracker] = None
+    ) -> None:
+        """
+        Ejecuta un conjunto de queries en la base de datos
+
+        Args:
+            queries: Diccionario con nombres de tablas como claves y consultas como valores.
+                Cada consulta puede contener varias sentencias, que se ejecutan por separado
+            tracker: ProgressTracker que recibe el avance por tabla (opcional)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                for table_name, query in queries.items():
+                    logger.info(f"Ejecutando queries para la tabla {table_name}")
+                    if tracker is not None:
+                        tracker.start_table(table_name)
+                    with stage(table_name, "load"):
+                        for statement in split_sql_statements(query):
+                            cursor.execute(statement)
+                    if tracker is not None:
+                        tracker.end_table(table_name, len(query.encode("utf-8")))
+                conn.commit()
+                logger.info("Todas las queries se ejecutaron exitosamente")
+            except sqlite3.Error as e:
+                logger.error(f"Error al ejecutar queries: {e}")
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def create_tables(self, tables: List[Table], with_constraints: bool = True) -> None:
+        """
+        Crea las tablas indicadas si aún no existen
+
+        Args:
+            tables: Lista de esquemas de tablas
+            with_constraints: Si se incluyen PRIMARY KEY y FOREIGN KEY. Conviene
+                desactivarlo cuando las llaves primarias usan providers aleatorios
+                que pueden repetir valores.
+        """
+        with self.get_connection() as conn:
+            for table in tables:
+                conn.execute(create_table_ddl(table, with_constraints))
+            conn.commit()
+
+    def insert_rows(
+        self, table: Table, rows: Iterable[Sequence], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Inserta filas de valores de Python usando executemany por lotes
+
+        Args:
+            table: Esquema de la tabla destino
+            rows: Filas con los valores en el orden de table.columns
+            batch_size: Filas por executemany (por defecto: el configurado en el gestor)
+
+        Devuelve:
+            Número de filas insertadas
+        """
+        batch_size = batch_size or self.batch_size
+        column_names = [column.name for column in table.columns]
+        placeholders = ", ".join("?" for _ in column_names)
+        query = (
+            f"INSERT INTO {table.name} ({', '.join(column_names)}) "
+            f"VALUES ({placeholders})"
+        )
+
+        inserted = 0
+        with self.get_connection() as conn:
+            try:
+                batch = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        conn.executemany(query, batch)
+                        inserted += len(batch)
+                        batch = []
+                if batch:
+                    conn.executemany(query, batch)
+                    inserted += len(batch)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error al insertar filas en {table.name}: {e}")
+                conn.rollback()
+                raise
+
+        return inserted
+
+    def close(self) -> None:
+        """Cierra la conexión persistente (la abierta con open() o la de una base de datos en memoria)"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
+
+
+def create_table_ddl(table: Table, with_constraints: bool = True) -> str:
+    """
+    Construye la sentencia CREATE TABLE para un esquema
+
+    Args:
+        table: El esquema de la tabla
+        with_constraints: Si se incluyen PRIMARY KEY, restricciones y FOREIGN KEY
+
+    Devuelve:
+        Cadena con la sentencia CREATE TABLE IF NOT EXISTS
+    """
+    definitions = []
+    for column in table.columns:
+        definition = f"{column.name} {column.type}"
+        if with_constraints and column.is_primary_key:
+            definition += " PRIMARY KEY"
+        if with_constraints and column.constraints:
+            definition += " " + " ".join(column.constraints)
+        definitions.append(definition)
+
+    for column in table.columns:
+        if with_constraints and column.foreign_key:
+            fk = column.foreign_key
+            definitions.append(
+                f"FOREIGN KEY ({column.name}) REFERENCES "
+                f"{fk.references_table}({fk.references_column})"
+            )
+
+    return f"CREATE TABLE IF NOT EXISTS {table.name} ({', '.join(definitions)})"
@@ -0,0 +1,345 @@
+"""
+Motor de fechas y horas sobre enteros
+
+Faker crea un objeto datetime por valor y lo formatea con strftime, lo que
+domina el tiempo de las tablas de hechos con varias columnas de fecha. Aquí
+los valores se muestrean por lotes como enteros (días o segundos desde
+1970-01-01) dentro de un rango, y se formatean reutilizando cadenas
+precalculadas: la fecha se busca en una caché por día y la hora en tablas de
+"HH:MM" y ":SS", sin pasar por strftime.
+
+Las fechas se tratan como horas de reloj, sin zona horaria: "now" es la hora
+local del sistema tal cual.
+
+Uso como custom_provider (proveedor de lotes):
+
+    Column(name="creado", type="DATETIME",
+           custom_provider=datetimes("2024-01-01", "2024-12-31"))
+
+    # Tabla de eventos: marcas de tiempo crecientes a lo largo de un millón de filas
+    Column(name="ts", type="TIMESTAMP",
+           custom_provider=datetimes("2024-01-01", "now", monotonic=True, rows=1_000_000))
+
+Las expresiones de faker_provider date, time, date_time, date_object,
+time_object, date_this_* y date_time_this_* sin argumentos, y las columnas
+DATE, DATETIME, TIMESTAMP y TIME sin provider, también usan este motor y
+devuelven los mismos tipos que Faker.
+"""
+
+import random
+import threading
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Union
+
+EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+SECONDS_PER_DAY = 86400
+
+# Cadenas precalculadas de la parte horaria
+_HOURS_MINUTES = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+_SECONDS = [f":{s:02d}" for s in range(60)]
+
+# "YYYY-MM-DD" por día desde 1970-01-01, rellenada bajo demanda
+_date_strings: Dict[int, str] = {}
+
+TimePoint = Union[int, float, str, date, datetime, time]
+
+
+def date_string(day: int) -> str:
+    """Fecha ISO ("YYYY-MM-DD") de un día contado desde 1970-01-01."""
+    text = _date_strings.get(day)
+    if text is None:
+        text = date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+        _date_strings[day] = text
+    return text
+
+
+def time_string(second_of_day: int) -> str:
+    """Hora "HH:MM:SS" de un segundo del día."""
+    return _HOURS_MINUTES[second_of_day // 60] + _SECONDS[second_of_day % 60]
+
+
+def datetime_string(epoch: int) -> str:
+    """Fecha y hora "YYYY-MM-DD HH:MM:SS" de un entero de segundos desde 1970-01-01."""
+    day, second = divmod(epoch, SECONDS_PER_DAY)
+    return date_string(day) + " " + _HOURS_MINUTES[second // 60] + _SECONDS[second % 60]
+
+
+def format_datetime(value: datetime) -> str:
+    """Formatea un datetime como "YYYY-MM-DD HH:MM:SS" sin strftime (ignora la zona horaria)."""
+    return (
+        date_string(value.toordinal() - _EPOCH_ORDINAL)
+        + " "
+        + _HOURS_MINUTES[value.hour * 60 + value.minute]
+        + _SECONDS[value.second]
+    )
+
+
+def format_time(value: time) -> str:
+    """Formatea un time como "HH:MM:SS" sin strftime."""
+    return _HOURS_MINUTES[value.hour * 60 + value.minute] + _SECONDS[value.second]
+
+
+def to_epoch(value: TimePoint) -> int:
+    """
+    Convierte un instante a segundos desde 1970-01-01
+
+    Args:
+        value: Entero de segundos, date, datetime, cadena ISO ("2024-01-31" o
+            "2024-01-31 10:00:00"), "now" o "today"
+
+    Devuelve:
+        Segundos desde 1970-01-01 (hora de reloj, sin zona horaria)
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        if value == "now":
+            value = datetime.now()
+        elif value == "today":
+            value = date.today()
+        else:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Fecha no reconocida: '{value}'") from None
+    if isinstance(value, datetime):
+        value = value.replace(tzinfo=None)
+        return (value.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY + (
+            value.hour * 3600 + value.minute * 60 + value.second
+        )
+    if isinstance(value, date):
+        return (value.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY
+    raise TypeError(f"No se puede convertir {value!r} a una fecha")
+
+
+def _to_second_of_day(value: Union[int, str, time]) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class TemporalProvider:
+    """
+    Proveedor de lotes de fechas, fechas con hora u horas
+
+    Sigue el protocolo de los custom_provider de lotes: se llama con (n, rng)
+    y devuelve n valores.
+
+    Args:
+        kind: "date", "datetime" o "time"
+        start: Inicio del rango (incluido)
+        end: Fin del rango (incluido)
+        monotonic: Generar valores crecientes, lote tras lote (tablas de eventos)
+        rows: Filas que cubren el rango en modo monotonic; el paso medio entre
+            valores es el rango entre rows
+        interval: Paso medio entre valores en modo monotonic, en días para
+            "date" y en segundos para "datetime" (alternativa a rows)
+        as_objects: Devolver date, datetime o time en lugar de cadenas ISO
+    """
+
+    is_batch_provider = True
+
+    def __init__(
+        self,
+        kind: str,
+        start: TimePoint,
+        end: TimePoint,
+        monotonic: bool = False,
+        rows: Optional[int] = None,
+        interval: Optional[float] = None,
+        as_objects: bool = False,
+    ):
+        if kind not in ("date", "datetime", "time"):
+            raise ValueError(f"Tipo temporal desconocido: '{kind}'")
+        self.kind = kind
+        self.as_objects = as_objects
+        self.monotonic = monotonic
+        if kind == "time":
+            self.start, self.end = _to_second_of_day(start), _to_second_of_day(end)
+        elif kind == "date":
+            self.start = to_epoch(start) // SECONDS_PER_DAY
+            self.end = to_epoch(end) // SECONDS_PER_DAY
+        else:
+            self.start, self.end = to_epoch(start), to_epoch(end)
+        if self.end < self.start:
+            raise ValueError("El fin del rango temporal es anterior al inicio")
+
+        if monotonic:
+            if interval is None:
+                if not rows:
+                    raise ValueError("El modo monotonic necesita rows o interval")
+                interval = (self.end - self.start) / rows
+            # Pasos uniformes entre 0 y el doble del paso medio
+            self._step_width = max(int(2 * interval) + 1, 1)
+        self._lock = threading.Lock()
+        self._next = self.start
+
+    def __call__(self, n: int, rng: random.Random) -> List[Any]:
+        return self.format(self.sample(n, rng))
+
+    def sample(self, n: int, rng: random.Random) -> List[int]:
+        """Muestrea n enteros del rango (crecientes en modo monotonic)."""
+        random_ = rng.random
+        if not self.monotonic:
+            start = self.start
+            width = self.end - self.start + 1
+            return [start + int(random_() * width) for _ in range(n)]
+
+        step_width = self._step_width
+        with self._lock:
+            values = list(
+                accumulate(
+                    (int(random_() * step_width) for _ in range(n)), initial=self._next
+                )
+            )
+            self._next = values.pop()
+        end = self.end
+        return [value if value <= end else end for value in values]
+
+    def reset(self):
+        """Reinicia la secuencia monotonic desde el inicio del rango."""
+        with self._lock:
+            self._next = self.start
+
+    def format(self, values: List[int]) -> List[Any]:
+        """Convierte los enteros muestreados en cadenas ISO u objetos."""
+        if self.kind == "date":
+            if self.as_objects:
+                return [date.fromordinal(day + _EPOCH_ORDINAL) for day in values]
+            return [date_string(day) for day in values]
+        if self.kind == "time":
+            if self.as_objects:
+                return [time(s // 3600, s // 60 % 60, s % 60) for s in values]
+            return [_HOURS_MINUTES[s // 60] + _SECONDS[s % 60] for s in values]
+        if self.as_objects:
+            return [EPOCH + timedelta(seconds=s) for s in values]
+        return list(map(datetime_string, values))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # El cerrojo no se copia: cada copia (o proceso) crea el suyo
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"TemporalProvider({self.kind!r}, monotonic={self.monotonic})"
+
+
+def dates(
+    start: TimePoint = "1970-01-01",
+    end: TimePoint = "today",
+    monotonic: bool = False,
+    rows: Optional[int] = None,
+    interval: Optional[float] = None,
+    as_objects: bool = False,
+) -> TemporalProvider:
+    """Proveedor de lotes de fechas "YYYY-MM-DD" (ver TemporalProvider)."""
+    return TemporalProvider("date", start, end, monotonic, rows, interval, as_objects)
+
+
+def datetimes(
+    start: TimePoint = "1970-01-01",
+    end: TimePoint = "now",
+    monotonic: bool = False,
+    rows: Optional[int] = None,
+    interval: Optional[float] = None,
+    as_objects: bool = False,
+) -> TemporalProvider:
+    """Proveedor de lotes de fechas con hora "YYYY-MM-DD HH:MM:SS" (ver TemporalProvider)."""
+    return TemporalProvider("datetime", start, end, monotonic, rows, interval, as_objects)
+
+
+def times(
+    start: Union[int, str, time] = "00:00:00",
+    end: Union[int, str, time] = "23:59:59",
+    as_objects: bool = False,
+) -> TemporalProvider:
+    """Proveedor de lotes de horas "HH:MM:SS" (ver TemporalProvider)."""
+    return TemporalProvider("time", start, end, as_objects=as_objects)
+
+
+def _period_start(period: str, today: date) -> date:
+    if period == "century":
+        return date(today.year - today.year % 100, 1, 1)
+    if period == "decade":
+        return date(today.year - today.year % 10, 1, 1)
+    if period == "year":
+        return date(today.year, 1, 1)
+    return date(today.year, today.month, 1)
+
+
+def faker_equivalent(name: str) -> Optional[TemporalProvider]:
+    """
+    Proveedor equivalente a un provider temporal de Faker sin argumentos
+
+    Args:
+        name: Nombre del provider de Faker
+
+    Devuelve:
+        TemporalProvider con el mismo rango y tipo de valor, o None si el
+        provider no tiene equivalente
+    """
+    if name == "date":
+        return dates()
+    if name == "date_object":
+        return dates(as_objects=True)
+    if name == "date_time":
+        return datetimes(as_objects=True)
+    if name == "time":
+        return times()
+    if name == "time_object":
+        return times(as_objects=True)
+    for prefix, factory in (("date_time_this_", datetimes), ("date_this_", dates)):
+        period = name[len(prefix):]
+        if name.startswith(prefix) and period in ("century", "decade", "year", "month"):
+            start = _period_start(period, date.today())
+            end = "now" if factory is datetimes else "today"
+            return factory(start, end, as_objects=True)
+    return None
+
+
+class FakerTemporalProvider:
+    """
+    Provider compilado de una expresión temporal de Faker, servido por el motor de enteros
+
+    Se llama como cualquier provider compilado (un valor por llamada) y ofrece
+    batch(n). Usa el generador aleatorio de la instancia de Faker, así que
+    Faker.seed() y las semillas de los contextos lo hacen reproducible.
+    """
+
+    def __init__(self, faker, name: str, provider: TemporalProvider):
+        self.faker = faker
+        self.name = name
+        self.provider = provider
+
+    def __call__(self) -> Any:
+        return self.provider(1, self.faker.random)[0]
+
+    def batch(self, n: int) -> List[Any]:
+        return self.provider(n, self.faker.random)
+
+    def __repr__(self) -> str:
+        return f"FakerTemporalProvider({self.name!r})"
+
+
+# Providers de las columnas sin provider, por tipo SQL
+_TYPE_PROVIDERS = {
+    "DATE": "date",
+    "DATETIME": "date_time",
+    "TIMESTAMP": "date_time",
+    "TIME": "time",
+}
+
+
+def provider_for_type(column_type: str) -> Optional[TemporalProvider]:
+    """Proveedor con el que se generan las columnas DATE, DATETIME, TIMESTAMP y TIME sin provider."""
+    name = _TYPE_PROVIDERS.get(column_type.upper())
+    return faker_equivalent(name) if name is not None else None
@@ -4,9 +4,11 @@ Utilidades específicas para testing con el generador de SQL
 
 import os
 from typing import Dict, List, Tuple, Optional
-from src.schema import Table, Column, ForeignKey, registry
+from src.schema import Table, Column, ForeignKey
+from src.context import current_context
 from src.generator import generate_insert_queries_in_order
-from src.utils import export_sql_to_file
+from src.utils import export_sql_to_file, export_to_writer
+from src.writers import FanOutWriter, SQLFilesWriter, SQLInsertWriter
 
 
 def generate_testing_schemas() -> Dict[str, Tuple[Table, int]]:
@@ -183,21 +185,24 @@ def generate_testing_sql(
 
     schemas = generate_testing_schemas()
 
-    # Convertir al formato esperado por generate_insert_queries_in_order
+    # Convertir al formato esperado por generate_row_batches_in_order
     tables_and_rows = {}
     for table, num_rows in schemas.values():
         tables_and_rows[table] = num_rows
 
-    queries = generate_insert_queries_in_order(tables_and_rows)
-
+    # Cada lote se genera y se codifica una sola vez para el archivo combinado
+    # y para el archivo de su tabla
     all_sql_file = os.path.join(output_dir, f"{prefix}_all.sql")
-    export_sql_to_file(queries, all_sql_file)
-
-    for table_name, query in queries.items():
-        table_sql_file = os.path.join(output_dir, f"{prefix}_{table_name}.sql")
-        export_sql_to_file({table_name: query}, table_sql_file)
+    writer = FanOutWriter(
+        [
+            SQLInsertWriter(all_sql_file),
+            SQLFilesWriter(output_dir, prefix=f"{prefix}_"),
+        ]
+    )
+    total_rows = export_to_writer(tables_and_rows, writer)
+    print(f"SQL exportado a {all_sql_file} y a un archivo por tabla en {output_dir}")
 
-    return len(queries), sum(tables_and_rows.values())
+    return len(tables_and_rows), total_rows
 
 
 def generate_custom_testing_sql(
@@ -416,7 +421,8 @@ def create_related_schemas_example():
         primary_key="id",
     )
 
-    # Registrar las tablas en el registro global para que las relaciones funcionen
+    # Registrar las tablas en el registro del contexto activo para que las relaciones funcionen
+    registry = current_context().registry
     registry.register(categoria_table)
     registry.register(productos_table)
     registry.register(clientes_table)
@@ -0,0 +1,273 @@
+"""
+Motor de texto rápido a partir de un corpus precalculado
+
+Los providers de texto de Faker (text, paragraph, sentence) construyen cada
+valor palabra a palabra, y en los esquemas con muchas columnas TEXT son lo
+más lento de la generación. Este módulo construye una vez por locale un
+corpus con las palabras de Faker y un conjunto de oraciones y párrafos ya
+armados, y compone cada valor eligiendo índices al azar dentro del corpus.
+
+El resultado sigue las mismas reglas que Faker (palabras del locale, la
+primera en mayúscula, la puntuación y el separador del locale, text nunca
+más largo que max_nb_chars) y usa el generador aleatorio de la instancia de
+Faker, así que Faker.seed() y las semillas de los contextos lo hacen
+reproducible. El corpus conserva todas las palabras del locale; los valores
+se escapan como cualquier otro al convertirlos a SQL.
+
+Uso:
+    corpus = get_corpus(get_faker("es_MX"))
+    corpus.text(rng, max_nb_chars=80)
+    corpus.texts(1000, rng, min_nb_chars=40, max_nb_chars=80)
+"""
+
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Oraciones y párrafos precalculados por locale
+POOL_SIZE = 4096
+
+# Providers de Faker que se sirven desde el corpus y cuántos argumentos
+# posicionales admiten antes de ext_word_list (que obliga a usar Faker)
+CORPUS_PROVIDERS: Dict[str, int] = {"text": 1, "sentence": 2, "paragraph": 2}
+
+# Intentos de añadir una pieza más cuando el texto aún no llega a min_nb_chars
+_FILL_ATTEMPTS = 32
+
+_corpora: Dict[str, "TextCorpus"] = {}
+_lock = threading.Lock()
+
+
+def _vary(number: int, rng: random.Random) -> int:
+    """Número aleatorio alrededor de number (±40 %, mínimo 1), como randomize_nb_elements de Faker."""
+    return max(rng.randint(int(number * 0.6), int(number * 1.4)), 1)
+
+
+class TextCorpus:
+    """
+    Corpus de palabras, oraciones y párrafos de un locale
+
+    Args:
+        words: Palabras del locale
+        word_connector: Separador entre palabras y entre oraciones
+        sentence_punctuation: Puntuación final de las oraciones
+        pool_size: Número de oraciones y de párrafos precalculados
+        seed: Semilla con la que se arman las oraciones y párrafos del corpus
+    """
+
+    def __init__(
+        self,
+        words: Sequence[str],
+        word_connector: str = " ",
+        sentence_punctuation: str = ".",
+        pool_size: int = POOL_SIZE,
+        seed: int = 0,
+    ):
+        self.words = [word for word in words if word]
+        if not self.words:
+            raise ValueError("El corpus necesita al menos una palabra")
+        self.word_connector = word_connector
+        self.sentence_punctuation = sentence_punctuation
+
+        rng = random.Random(seed)
+        self.sentences = [self.sentence(rng) for _ in range(pool_size)]
+        self.paragraphs = [
+            word_connector.join(rng.choices(self.sentences, k=_vary(3, rng)))
+            for _ in range(pool_size)
+        ]
+        self._sentence_lengths = [len(sentence) for sentence in self.sentences]
+        self._paragraph_lengths = [len(paragraph) for paragraph in self.paragraphs]
+        self._shortest_sentence = min(self._sentence_lengths)
+        self._shortest_paragraph = min(self._paragraph_lengths)
+
+    def sentence(
+        self, rng: random.Random, nb_words: int = 6, variable_nb_words: bool = True
+    ) -> str:
+        """Oración de unas nb_words palabras, con la primera en mayúscula."""
+        if nb_words <= 0:
+            return ""
+        if variable_nb_words:
+            nb_words = _vary(nb_words, rng)
+        text = self.word_connector.join(rng.choices(self.words, k=nb_words))
+        return text[:1].upper() + text[1:] + self.sentence_punctuation
+
+    def paragraph(
+        self, rng: random.Random, nb_sentences: int = 3, variable_nb_sentences: bool = True
+    ) -> str:
+        """Párrafo de unas nb_sentences oraciones del corpus."""
+        if nb_sentences <= 0:
+            return ""
+        if variable_nb_sentences:
+            nb_sentences = _vary(nb_sentences, rng)
+        return self.word_connector.join(rng.choices(self.sentences, k=nb_sentences))
+
+    def text(
+        self, rng: random.Random, max_nb_chars: int = 200, min_nb_chars: int = 0
+    ) -> str:
+        """
+        Texto de como mucho max_nb_chars caracteres
+
+        Como en Faker, se compone de palabras (menos de 25 caracteres), de
+        oraciones (menos de 100) o de párrafos separados por saltos de línea.
+
+        Args:
+            rng: Generador aleatorio
+            max_nb_chars: Longitud máxima
+            min_nb_chars: Longitud mínima deseada; se siguen añadiendo oraciones
+                que quepan mientras el texto sea más corto
+
+        Devuelve:
+            Texto en el idioma del corpus
+        """
+        if max_nb_chars < 5:
+            raise ValueError("text() solo genera textos de al menos 5 caracteres")
+        # Con longitud mínima se usan oraciones: son piezas más finas para cerrar el hueco
+        if max_nb_chars >= 100 and max_nb_chars >= self._shortest_paragraph and not min_nb_chars:
+            return self._fill(
+                rng, self.paragraphs, self._paragraph_lengths, "\n", max_nb_chars, min_nb_chars
+            )
+        if max_nb_chars >= 25 and max_nb_chars >= self._shortest_sentence:
+            return self._fill(
+                rng,
+                self.sentences,
+                self._sentence_lengths,
+                self.word_connector,
+                max_nb_chars,
+                min_nb_chars,
+            )
+        return self._words_text(rng, max_nb_chars)
+
+    def texts(
+        self,
+        n: int,
+        rng: random.Random,
+        max_nb_chars: int = 200,
+        min_nb_chars: int = 0,
+    ) -> List[str]:
+        """Lote de n textos con longitudes entre min_nb_chars y max_nb_chars (ver text)."""
+        text = self.text
+        return [text(rng, max_nb_chars, min_nb_chars) for _ in range(n)]
+
+    def _fill(
+        self,
+        rng: random.Random,
+        pool: List[str],
+        lengths: List[int],
+        separator: str,
+        max_chars: int,
+        min_chars: int,
+    ) -> str:
+        """Une piezas del corpus elegidas al azar mientras quepan en max_chars."""
+        separator_length = len(separator)
+        count = len(pool)
+        random_ = rng.random
+        while True:
+            parts: List[str] = []
+            size = 0
+            misses = 0
+            while True:
+                index = int(random_() * count)
+                added = lengths[index] + (separator_length if parts else 0)
+                if size + added > max_chars:
+                    # Una pieza que no cabe termina el texto, salvo que aún sea corto
+                    misses += 1
+                    if size >= min_chars or misses > _FILL_ATTEMPTS:
+                        break
+                    continue
+                parts.append(pool[index])
+                size += added
+            if parts:
+                return separator.join(parts)
+
+    def _words_text(self, rng: random.Random, max_chars: int) -> str:
+        """Texto corto de palabras sueltas, con mayúscula inicial y puntuación final."""
+        connector_length = len(self.word_connector)
+        words = self.words
+        while True:
+            parts: List[str] = []
+            # Se reserva el espacio de la puntuación final
+            size = len(self.sentence_punctuation)
+            while True:
+                word = words[int(rng.random() * len(words))]
+                added = len(word) + (connector_length if parts else 0)
+                if size + added > max_chars:
+                    break
+                parts.append(word)
+                size += added
+            if parts:
+                text = self.word_connector.join(parts)
+                return text[:1].upper() + text[1:] + self.sentence_punctuation
+
+
+def _lorem_provider(faker) -> Any:
+    """Provider lorem de una instancia de Faker (el que define las palabras del locale)."""
+    for provider in faker.providers:
+        if hasattr(provider, "word_connector") and hasattr(provider, "get_words_list"):
+            return provider
+    raise ValueError("La instancia de Faker no tiene provider lorem")
+
+
+def get_corpus(faker) -> TextCorpus:
+    """
+    Devuelve el corpus del locale de una instancia de Faker, construyéndolo la primera vez
+
+    El corpus solo depende del locale, así que se comparte entre instancias
+    y contextos de generación.
+
+    Args:
+        faker: Instancia de Faker
+
+    Devuelve:
+        TextCorpus del locale
+    """
+    locale = faker.locales[0] if hasattr(faker, "locales") else str(faker.locale)
+    corpus = _corpora.get(locale)
+    if corpus is None:
+        with _lock:
+            corpus = _corpora.get(locale)
+            if corpus is None:
+                lorem = _lorem_provider(faker)
+                corpus = TextCorpus(
+                    lorem.get_words_list(),
+                    word_connector=lorem.word_connector,
+                    sentence_punctuation=lorem.sentence_punctuation,
+                )
+                _corpora[locale] = corpus
+    return corpus
+
+
+class CorpusProvider:
+    """
+    Provider compilado de text, sentence o paragraph que se sirve desde el corpus
+
+    Se llama como cualquier provider compilado (un valor por llamada) y además
+    ofrece batch(n) para generar un lote de una vez. El generador aleatorio se
+    toma de la instancia de Faker en cada llamada, de modo que reiniciar su
+    semilla afecta también a los valores ya compilados.
+    """
+
+    def __init__(self, faker, name: str, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None):
+        self.faker = faker
+        self.name = name
+        self._method: Callable[..., str] = getattr(get_corpus(faker), name)
+        self._args = args
+        self._kwargs = kwargs or {}
+
+    def __call__(self) -> str:
+        return self._method(self.faker.random, *self._args, **self._kwargs)
+
+    def batch(self, n: int) -> List[str]:
+        method, rng, args, kwargs = self._method, self.faker.random, self._args, self._kwargs
+        return [method(rng, *args, **kwargs) for _ in range(n)]
+
+    def __repr__(self) -> str:
+        return f"CorpusProvider({self.name!r})"
+
+
+def can_use_corpus(name: str, args: tuple, kwargs: Dict[str, Any]) -> bool:
+    """True si una expresión de provider se puede servir desde el corpus."""
+    return (
+        name in CORPUS_PROVIDERS
+        and len(args) <= CORPUS_PROVIDERS[name]
+        and "ext_word_list" not in kwargs
+    )
@@ -2,26 +2,118 @@
 Utilidades para la generación de esquemas y datos
 """
 
-from typing import Dict
+from typing import Dict, Optional
+from src.compression import open_output
 from src.database import MariaDBManager
+from src.sqlite_database import SQLiteManager
+from src.schema import Table
+from src.context import GenerationContext
+from src.generator import generate_row_batches_in_order
+from src.metrics import ProgressArg, create_tracker
+from src.scaling import rows_for_target_bytes
+from src.writers import (
+    CopyWriter,
+    CSVWriter,
+    TSVWriter,
+    JSONLinesWriter,
+    DatabaseWriter,
+)
 
 
-def export_sql_to_file(queries: Dict[str, str], output_file: str):
+def export_sql_to_file(
+    queries: Dict[str, str], output_file: str, compression: Optional[str] = "infer"
+):
     """
     Exporta las consultas SQL a un archivo
 
     Args:
         queries: Diccionario con nombres de tablas como claves y consultas como valores
         output_file: Ruta del archivo de salida
+        compression: "infer" para comprimir según la extensión (.gz, .bz2, .xz, .zst),
+            None para no comprimir, o "gzip", "bz2", "xz", "zstd"
     """
-    with open(output_file, "w") as f:
+    with open_output(output_file, compression) as f:
         for table_name, query in queries.items():
             f.write(f"-- Inserciones para la tabla {table_name}\n")
             f.write(query)
             f.write("\n\n")
     print(f"SQL exportado a {output_file}")
 
-def export_sql_to_mariadb(queries: Dict[str, str], host: str, user: str, password: str, database: str, port: int = 3306):
+
+def export_to_writer(
+    tables_and_rows: Dict[Table, int],
+    writer,
+    batch_size: int = 1000,
+    progress: ProgressArg = None,
+    append: bool = False,
+    context: Optional[GenerationContext] = None,
+    target_bytes: Optional[int] = None,
+) -> int:
+    """
+    Genera los datos en orden de dependencias y los envía por lotes a un escritor
+
+    El escritor se cierra al terminar. Para enviar los mismos lotes a varios
+    destinos se puede usar un FanOutWriter.
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        writer: Escritor con write_batch y close (ver src.writers)
+        batch_size: Número de filas por lote (por defecto 1000)
+        progress: Callback o lista de callbacks de progreso (ver src.metrics). Los
+            bytes se informan si el escritor expone bytes_written.
+        append: Generar solo las filas nuevas sobre las ya generadas o registradas
+            (ver src.generator.generate_row_batches)
+        context: Contexto de generación (por defecto el activo, ver src.context)
+        target_bytes: Tamaño de la salida en bytes. Si se indica, los valores de
+            tables_and_rows son proporciones entre tablas: las filas de cada
+            tabla se calculan a partir de una muestra (ver
+            src.scaling.rows_for_target_bytes) y se generan completas. Los
+            anchos de fila se miden con el dialecto del escritor o, si no tiene,
+            en SQL de MariaDB
+
+    Devuelve:
+        Número total de filas generadas
+    """
+    if target_bytes is not None:
+        tables_and_rows = rows_for_target_bytes(
+            tables_and_rows, target_bytes, getattr(writer, "dialect", "mariadb")
+        )
+    tracker = create_tracker(
+        progress, {table.name: rows for table, rows in tables_and_rows.items()}
+    )
+    total_rows = 0
+    with writer:
+        for table, batch in generate_row_batches_in_order(
+            tables_and_rows, batch_size, append=append, context=context
+        ):
+            if tracker is None:
+                writer.write_batch(table, batch)
+            else:
+                if tracker.current not in (None, table.name):
+                    tracker.end_table(tracker.current)
+                written = getattr(writer, "bytes_written", 0)
+                writer.write_batch(table, batch)
+                tracker.update(
+                    table.name, len(batch), getattr(writer, "bytes_written", 0) - written
+                )
+            total_rows += len(batch)
+
+    if tracker is not None:
+        if tracker.current is not None:
+            tracker.end_table(tracker.current)
+        tracker.finish()
+    return total_rows
+
+
+def export_sql_to_mariadb(
+    queries: Dict[str, str],
+    host: str,
+    user: str,
+    password: str,
+    database: str,
+    port: int = 3306,
+    progress: ProgressArg = None,
+):
     """
     Exporta las consultas SQL directamente a una base de datos MariaDB
 
@@ -32,11 +124,112 @@ def export_sql_to_mariadb(queries: Dict[str, str], host: str, user: str, passwor
         password: Contraseña del usuario
         database: Nombre de la base de datos
         port: Puerto de la base de datos (por defecto 3306)
+        progress: Callback o lista de callbacks de progreso (ver src.metrics); el
+            avance se mide en bytes de SQL ejecutados por tabla
     """
+    tracker = create_tracker(
+        progress,
+        total_bytes={name: len(query.encode("utf-8")) for name, query in queries.items()},
+    )
     try:
         with MariaDBManager(host, user, password, database, port) as db:
-            db.execute_queries(queries)
+            db.execute_queries(queries, tracker)
+        if tracker is not None:
+            tracker.finish()
         print(f"SQL exportado exitosamente a la base de datos {database}")
     except Exception as e:
         print(f"Error al exportar a MariaDB: {str(e)}")
         raise
+
+
+def export_rows_to_sqlite(
+    tables_and_rows: Dict[Table, int],
+    database: str = ":memory:",
+    create_tables: bool = True,
+    batch_size: int = 1000,
+) -> SQLiteManager:
+    """
+    Genera los datos y los carga directamente en una base de datos SQLite
+
+    Las filas se insertan por lotes con executemany a medida que se generan,
+    sin construir las sentencias INSERT completas en memoria.
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        database: Ruta del archivo SQLite (por defecto ":memory:")
+        create_tables: Si se deben crear las tablas antes de insertar (por defecto True)
+        batch_size: Número de filas por lote (por defecto 1000)
+
+    Devuelve:
+        El SQLiteManager usado. Para bases de datos en memoria la conexión sigue
+        abierta y debe cerrarse con close() cuando ya no se necesite.
+    """
+    db = SQLiteManager(database, batch_size=batch_size)
+
+    if create_tables:
+        db.create_tables(list(tables_and_rows.keys()), with_constraints=False)
+
+    total_rows = export_to_writer(tables_and_rows, DatabaseWriter(db), batch_size)
+
+    print(f"{total_rows} filas exportadas a la base de datos SQLite {database}")
+    return db
+
+
+def export_copy_to_file(
+    tables_and_rows: Dict[Table, int], output_file: str, batch_size: int = 1000
+):
+    """
+    Genera los datos y los exporta como bloques COPY de PostgreSQL
+
+    Las filas se escriben por lotes a medida que se generan. El archivo se
+    puede cargar con `psql -f output_file`.
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        output_file: Ruta del archivo de salida (comprimido si termina en .gz,
+            .bz2, .xz o .zst)
+        batch_size: Número de filas por lote (por defecto 1000)
+    """
+    export_to_writer(tables_and_rows, CopyWriter(output_file), batch_size)
+    print(f"COPY exportado a {output_file}")
+
+
+FLAT_FILE_WRITERS = {
+    "csv": CSVWriter,
+    "tsv": TSVWriter,
+    "jsonl": JSONLinesWriter,
+}
+
+
+def export_flat_files(
+    tables_and_rows: Dict[Table, int],
+    output_dir: str,
+    file_format: str = "csv",
+    prefix: str = "",
+    compression: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Dict[str, str]:
+    """
+    Genera los datos y los exporta como archivos planos, uno por tabla
+
+    Args:
+        tables_and_rows: Diccionario de tablas y número de filas a generar para cada una
+        output_dir: Directorio donde se guardarán los archivos
+        file_format: Formato de salida: "csv", "tsv" o "jsonl" (por defecto "csv")
+        prefix: Prefijo para los nombres de archivo
+        compression: Compresión de los archivos ("gzip", "bz2", "xz", "zstd" o None)
+        batch_size: Número de filas por lote (por defecto 1000)
+
+    Devuelve:
+        Diccionario con nombres de tablas como claves y rutas de archivo como valores
+    """
+    if file_format not in FLAT_FILE_WRITERS:
+        raise ValueError(
+            f"Formato desconocido: '{file_format}'. Opciones: {', '.join(FLAT_FILE_WRITERS)}"
+        )
+
+    writer = FLAT_FILE_WRITERS[file_format](output_dir, prefix, compression)
+    export_to_writer(tables_and_rows, writer, batch_size)
+
+    print(f"{len(writer.files)} archivos {file_format} exportados a {output_dir}")
+    return writer.files
@@ -0,0 +1,674 @@
+"""
+Escritores de salida que consumen lotes de filas generadas
+
+Cada escritor recibe lotes de tuplas (en el orden de table.columns) a través
+de write_batch y los serializa directamente a un archivo, sin construir la
+salida completa en memoria.
+"""
+
+import abc
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, IO, List, Optional, Sequence, Union
+from src.schema import Table
+from src.dialects import SQLDialect, get_dialect
+from src.compression import (
+    DEFAULT_BUFFER_SIZE,
+    compression_extension,
+    open_binary_output,
+    open_output,
+)
+from src.profiling import stage
+from src.temporal import format_datetime
+
+# Tabla de traducción para los caracteres especiales del formato texto de COPY
+_COPY_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
+
+def _open_output(output: Union[str, IO[str]]) -> IO[str]:
+    """Abre la ruta de salida (comprimida según su extensión) o devuelve el archivo recibido"""
+    if isinstance(output, str):
+        return open_output(output)
+    return output
+
+
+def format_copy_value(value: Any) -> str:
+    """
+    Formatear un valor para el formato texto de COPY de PostgreSQL
+
+    Args:
+        value: Valor de Python generado
+
+    Devuelve:
+        El valor escapado, o \\N para NULL
+    """
+    if value is None:
+        return "\\N"
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    elif isinstance(value, (int, float)):
+        return str(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea en formato hex; la barra se duplica por el escape de COPY
+        return "\\\\x" + bytes(value).hex()
+    elif isinstance(value, datetime):
+        return format_datetime(value)
+    elif isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class CopyWriter:
+    """
+    Escribe las filas como bloques COPY ... FROM stdin en formato texto de PostgreSQL
+
+    El archivo resultante se puede cargar con `psql -f archivo.sql`, que procesa
+    los datos de cada bloque a la velocidad de COPY en lugar de ejecutar
+    sentencias INSERT.
+    """
+
+    def __init__(self, output: Union[str, IO[str]]):
+        """
+        Args:
+            output: Ruta del archivo de salida (comprimido si termina en .gz,
+                .bz2, .xz o .zst) o un archivo de texto ya abierto
+        """
+        self._owns_file = isinstance(output, str)
+        self._file = _open_output(output)
+        self._current_table: Optional[str] = None
+        self.rows_written = 0
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        """
+        Escribe un lote de filas de una tabla
+
+        Los lotes consecutivos de la misma tabla comparten un único bloque COPY.
+
+        Args:
+            table: Esquema de la tabla a la que pertenecen las filas
+            rows: Filas con los valores en el orden de table.columns
+        """
+        if self._current_table != table.name:
+            self._end_block()
+            column_names = ", ".join(column.name for column in table.columns)
+            self._file.write(f"-- Datos para la tabla {table.name}\n")
+            self._file.write(f"COPY {table.name} ({column_names}) FROM stdin;\n")
+            self._current_table = table.name
+
+        with stage(table.name, "encode", len(rows)):
+            lines = [
+                "\t".join([format_copy_value(value) for value in row]) for row in rows
+            ]
+        with stage(table.name, "write", len(rows)):
+            if lines:
+                self._file.write("\n".join(lines))
+                self._file.write("\n")
+        self.rows_written += len(rows)
+
+    def _end_block(self) -> None:
+        """Cierra el bloque COPY abierto, si lo hay"""
+        if self._current_table is not None:
+            self._file.write("\\.\n\n")
+            self._current_table = None
+
+    def close(self) -> None:
+        """Termina el último bloque y cierra el archivo si fue abierto por el escritor"""
+        self._end_block()
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
+
+
+class ByteBuffer:
+    """
+    bytearray reutilizable en el que se acumulan los bytes de salida
+
+    Los datos se copian por asignación de rebanada dentro de un bloque que no
+    se libera entre lotes, y se entregan al archivo como un memoryview, sin
+    construir un bytes intermedio con todo el lote.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        self._data = bytearray(capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> int:
+        """Añade bytes al final del buffer, ampliándolo si no caben."""
+        end = self._size + len(data)
+        if end > len(self._data):
+            self._data.extend(bytes(max(end, 2 * len(self._data)) - len(self._data)))
+        self._data[self._size:end] = data
+        self._size = end
+        return len(data)
+
+    def flush_to(self, file: IO[bytes]) -> None:
+        """Escribe el contenido en un archivo binario y vacía el buffer, conservando su memoria."""
+        if self._size:
+            with memoryview(self._data)[:self._size] as view:
+                file.write(view)
+            self._size = 0
+
+
+class _TextSink:
+    """Adapta un archivo de texto sin buffer binario (p. ej. StringIO) a escrituras de bytes"""
+
+    def __init__(self, file: IO[str]):
+        self._file = file
+
+    def write(self, data) -> int:
+        return self._file.write(str(data, "utf-8"))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+
+def _open_binary(output: Union[str, IO]) -> IO[bytes]:
+    """Abre la ruta de salida en binario o devuelve la capa binaria del archivo recibido"""
+    if isinstance(output, str):
+        return open_binary_output(output)
+    if isinstance(output, io.TextIOBase):
+        binary = getattr(output, "buffer", None)
+        if binary is None:
+            return _TextSink(output)
+        # Lo ya escrito como texto debe llegar antes que los bytes
+        output.flush()
+        return binary
+    return output
+
+
+class SQLInsertWriter:
+    """
+    Escribe las filas como sentencias INSERT de varias filas en un único archivo
+
+    Produce el mismo formato que export_sql_to_file: un comentario por tabla
+    seguido de una sentencia INSERT que abarca todos sus lotes. La sentencia
+    solo se divide si supera el tamaño máximo del dialecto.
+
+    Las filas se codifican a UTF-8 en bloque dentro de un ByteBuffer
+    reutilizable, que se entrega al archivo binario como un memoryview cuando
+    acumula flush_size bytes; la capa de texto de Python no interviene.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, IO],
+        dialect: Union[str, SQLDialect] = "mariadb",
+        flush_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        """
+        Args:
+            output: Ruta del archivo de salida (comprimido si termina en .gz,
+                .bz2, .xz o .zst) o un archivo ya abierto, de texto o binario
+            dialect: Dialecto SQL de los literales
+            flush_size: Bytes acumulados a partir de los cuales se escribe el buffer
+        """
+        self.dialect = get_dialect(dialect)
+        self._owns_file = isinstance(output, str)
+        self._file = _open_binary(output)
+        self._buffer = ByteBuffer(flush_size)
+        self._flush_size = flush_size
+        self._current_table: Optional[str] = None
+        self._header = b""
+        self._header_size = 0
+        # Tamaño de la sentencia abierta; 0 indica que no hay ninguna abierta
+        self._statement_size = 0
+        self.rows_written = 0
+        # Bytes UTF-8 escritos en las sentencias, para el progreso
+        self.bytes_written = 0
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        """
+        Escribe un lote de filas de una tabla
+
+        Args:
+            table: Esquema de la tabla a la que pertenecen las filas
+            rows: Filas con los valores en el orden de table.columns
+        """
+        with stage(table.name, "encode", len(rows)):
+            encoded_rows = self.dialect.encode_rows(rows)
+        self.write_encoded_batch(table, encoded_rows)
+
+    def write_encoded_batch(self, table: Table, encoded_rows: List[str]) -> None:
+        """
+        Escribe un lote de filas ya codificadas por self.dialect
+
+        Args:
+            table: Esquema de la tabla a la que pertenecen las filas
+            encoded_rows: Tuplas SQL "(v1, v2, ...)" devueltas por dialect.encode_rows
+        """
+        if self._current_table != table.name:
+            self._end_table()
+            column_names = ", ".join(column.name for column in table.columns)
+            self._header = f"INSERT INTO {table.name} ({column_names}) VALUES \n".encode("utf-8")
+            self._header_size = len(self._header)
+            self._buffer.write(f"-- Inserciones para la tabla {table.name}\n".encode("utf-8"))
+            self._current_table = table.name
+
+        with stage(table.name, "write", len(encoded_rows)):
+            self._write_rows(encoded_rows)
+        self.rows_written += len(encoded_rows)
+
+    def _write_rows(self, encoded_rows: List[str]) -> None:
+        """Añade las filas a la sentencia abierta, dividiéndola si supera el tamaño máximo"""
+        if not encoded_rows:
+            return
+        # Tamaño en bytes de cada fila más el ",\n" que la separa de la siguiente
+        sizes = [
+            (len(row) if row.isascii() else len(row.encode("utf-8"))) + 2 for row in encoded_rows
+        ]
+        max_size = self.dialect.max_statement_bytes
+        buffer = self._buffer
+        size = self._statement_size
+        remaining = sum(sizes)
+        start = 0
+        count = len(encoded_rows)
+        # Las filas se codifican por tramos de ~1/4 de flush_size para acotar la memoria temporal
+        step = max(1, self._flush_size * count // (4 * remaining))
+        while start < count:
+            if size == 0:
+                buffer.write(self._header)
+                size = self._header_size
+                self.bytes_written += self._header_size - 2
+                separator = False
+            elif size + sizes[start] > max_size:
+                buffer.write(b";\n")
+                buffer.write(self._header)
+                size = self._header_size
+                self.bytes_written += self._header_size
+                separator = False
+            else:
+                separator = True
+
+            # Filas consecutivas que caben en la sentencia (al menos una)
+            if size + remaining <= max_size:
+                end = count
+                chunk_size = remaining
+            else:
+                end = start + 1
+                chunk_size = sizes[start]
+                while end < count and size + chunk_size + sizes[end] <= max_size:
+                    chunk_size += sizes[end]
+                    end += 1
+
+            for first in range(start, end, step):
+                if separator or first > start:
+                    buffer.write(b",\n")
+                buffer.write(",\n".join(encoded_rows[first:min(first + step, end)]).encode("utf-8"))
+                if len(buffer) >= self._flush_size:
+                    buffer.flush_to(self._file)
+            size += chunk_size
+            self.bytes_written += chunk_size
+            remaining -= chunk_size
+            start = end
+
+        self._statement_size = size
+
+    def _end_table(self) -> None:
+        """Termina la sentencia de la tabla actual, si la hay"""
+        if self._current_table is not None:
+            if self._statement_size:
+                self._buffer.write(b";")
+            self._buffer.write(b"\n\n")
+            self._current_table = None
+            self._statement_size = 0
+
+    def close(self) -> None:
+        """Termina la última sentencia y cierra el archivo si fue abierto por el escritor"""
+        self._end_table()
+        self._buffer.flush_to(self._file)
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
+
+
+def format_flat_value(value: Any) -> Any:
+    """
+    Formatear un valor para archivos planos (CSV/TSV/JSONL)
+
+    Los tipos que csv y json ya serializan bien se devuelven sin cambios.
+
+    Args:
+        value: Valor de Python generado
+
+    Devuelve:
+        El valor listo para el escritor de archivos planos
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, datetime):
+        return format_datetime(value)
+    elif isinstance(value, (date, time)):
+        return value.isoformat()
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    elif isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+# Tipos que los escritores de archivos planos no necesitan convertir
+_FLAT_NATIVE_TYPES = (str, int, float, type(None))
+
+
+def _flat_rows(rows: List[Sequence[Any]]) -> List[Sequence[Any]]:
+    """Convierte solo las filas que contienen valores que no son nativos de csv/json"""
+    native = _FLAT_NATIVE_TYPES
+    return [
+        row
+        if all(type(value) in native for value in row)
+        else [format_flat_value(value) for value in row]
+        for row in rows
+    ]
+
+
+class _PerTableWriter(abc.ABC):
+    """Base para escritores que producen un archivo por tabla dentro de un directorio"""
+
+    extension = ""
+
+    def __init__(
+        self, output_dir: str, prefix: str = "", compression: Optional[str] = None
+    ):
+        """
+        Args:
+            output_dir: Directorio donde se crearán los archivos
+            prefix: Prefijo para los nombres de archivo
+            compression: Compresión de los archivos ("gzip", "bz2", "xz", "zstd" o None)
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.compression = compression
+        self.files: Dict[str, str] = {}
+        self.rows_written = 0
+        self._open_files: Dict[str, IO[str]] = {}
+
+    def _file_for(self, table: Table) -> IO[str]:
+        """Devuelve el archivo abierto de la tabla, creándolo en el primer lote"""
+        file = self._open_files.get(table.name)
+        if file is None:
+            extension = self.extension + compression_extension(self.compression)
+            path = os.path.join(
+                self.output_dir, f"{self.prefix}{table.name}{extension}"
+            )
+            file = open_output(path, self.compression, newline="")
+            self._open_files[table.name] = file
+            self.files[table.name] = path
+            self._start_file(table, file)
+        return file
+
+    def _start_file(self, table: Table, file: IO[str]) -> None:
+        """Escribe el encabezado del archivo, si el formato lo usa"""
+
+    @abc.abstractmethod
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        """
+        Escribe un lote de filas en el archivo de su tabla
+
+        Args:
+            table: Esquema de la tabla a la que pertenecen las filas
+            rows: Filas con los valores en el orden de table.columns
+        """
+
+    def close(self) -> None:
+        """Cierra todos los archivos abiertos"""
+        for file in self._open_files.values():
+            file.close()
+        self._open_files = {}
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
+
+
+class CSVWriter(_PerTableWriter):
+    """Escribe un archivo CSV por tabla con las columnas en el orden de table.columns"""
+
+    extension = ".csv"
+
+    def __init__(
+        self,
+        output_dir: str,
+        prefix: str = "",
+        compression: Optional[str] = None,
+        delimiter: str = ",",
+        header: bool = True,
+    ):
+        """
+        Args:
+            output_dir: Directorio donde se crearán los archivos
+            prefix: Prefijo para los nombres de archivo
+            compression: Compresión de los archivos ("gzip", "bz2", "xz", "zstd" o None)
+            delimiter: Separador de campos
+            header: Si se escribe una primera fila con los nombres de las columnas
+        """
+        super().__init__(output_dir, prefix, compression)
+        self.delimiter = delimiter
+        self.header = header
+        self._csv_writers: Dict[str, Any] = {}
+
+    def _start_file(self, table: Table, file: IO[str]) -> None:
+        writer = csv.writer(file, delimiter=self.delimiter, lineterminator="\n")
+        self._csv_writers[table.name] = writer
+        if self.header:
+            writer.writerow([column.name for column in table.columns])
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        self._file_for(table)
+        with stage(table.name, "write", len(rows)):
+            self._csv_writers[table.name].writerows(_flat_rows(rows))
+        self.rows_written += len(rows)
+
+
+class TSVWriter(CSVWriter):
+    """Escribe un archivo TSV por tabla"""
+
+    extension = ".tsv"
+
+    def __init__(
+        self,
+        output_dir: str,
+        prefix: str = "",
+        compression: Optional[str] = None,
+        header: bool = True,
+    ):
+        super().__init__(output_dir, prefix, compression, delimiter="\t", header=header)
+
+
+class JSONLinesWriter(_PerTableWriter):
+    """Escribe un archivo JSON Lines por tabla, un objeto por fila"""
+
+    extension = ".jsonl"
+
+    def __init__(
+        self, output_dir: str, prefix: str = "", compression: Optional[str] = None
+    ):
+        super().__init__(output_dir, prefix, compression)
+        # Los booleanos y números se escriben como tipos JSON nativos; el resto
+        # (fechas, bytes, Decimal) pasa por format_flat_value
+        self._encoder = json.JSONEncoder(ensure_ascii=False, default=format_flat_value)
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        file = self._file_for(table)
+        column_names = [column.name for column in table.columns]
+        encode = self._encoder.encode
+        with stage(table.name, "encode", len(rows)):
+            lines = [encode(dict(zip(column_names, row))) for row in rows]
+        with stage(table.name, "write", len(rows)):
+            if lines:
+                file.write("\n".join(lines))
+                file.write("\n")
+        self.rows_written += len(rows)
+
+
+class SQLFilesWriter(_PerTableWriter):
+    """Escribe un archivo .sql por tabla con el formato de SQLInsertWriter"""
+
+    extension = ".sql"
+
+    def __init__(
+        self,
+        output_dir: str,
+        prefix: str = "",
+        compression: Optional[str] = None,
+        dialect: Union[str, SQLDialect] = "mariadb",
+    ):
+        super().__init__(output_dir, prefix, compression)
+        self.dialect = get_dialect(dialect)
+        self._sql_writers: Dict[str, SQLInsertWriter] = {}
+        self.bytes_written = 0
+
+    def _start_file(self, table: Table, file: IO[str]) -> None:
+        self._sql_writers[table.name] = SQLInsertWriter(file, self.dialect)
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        with stage(table.name, "encode", len(rows)):
+            encoded_rows = self.dialect.encode_rows(rows)
+        self.write_encoded_batch(table, encoded_rows)
+
+    def write_encoded_batch(self, table: Table, encoded_rows: List[str]) -> None:
+        self._file_for(table)
+        writer = self._sql_writers[table.name]
+        written = writer.bytes_written
+        writer.write_encoded_batch(table, encoded_rows)
+        self.bytes_written += writer.bytes_written - written
+        self.rows_written += len(encoded_rows)
+
+    def close(self) -> None:
+        for writer in self._sql_writers.values():
+            writer.close()
+        self._sql_writers = {}
+        super().close()
+
+
+class DatabaseWriter:
+    """Inserta los lotes en una base de datos a través de un gestor con insert_rows"""
+
+    def __init__(self, manager):
+        """
+        Args:
+            manager: Gestor de base de datos (SQLiteManager o MariaDBManager)
+        """
+        self.manager = manager
+        self.rows_written = 0
+        self._opened = False
+        self._owns_connection = False
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        if not self._opened:
+            # Una sola conexión para todos los lotes, si el gestor lo permite
+            self._opened = True
+            open_connection = getattr(self.manager, "open", None)
+            if open_connection is not None:
+                self._owns_connection = open_connection()
+        with stage(table.name, "load", len(rows)):
+            self.rows_written += self.manager.insert_rows(table, rows)
+
+    def close(self) -> None:
+        """Cierra la conexión si la abrió el escritor"""
+        if self._owns_connection:
+            self.manager.close()
+            self._owns_connection = False
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
+
+
+class FanOutWriter:
+    """
+    Reparte cada lote entre varios escritores en una sola pasada
+
+    Los escritores SQL que comparten dialecto reciben las mismas filas ya
+    codificadas, de modo que añadir un destino no repite la generación ni el
+    formateo de los valores.
+    """
+
+    def __init__(self, writers: List[Any]):
+        """
+        Args:
+            writers: Escritores destino (cualquier objeto con write_batch y close)
+        """
+        self.writers = writers
+        self.rows_written = 0
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes escritos por los escritores que los informan"""
+        return sum(getattr(writer, "bytes_written", 0) for writer in self.writers)
+
+    def write_batch(self, table: Table, rows: List[Sequence[Any]]) -> None:
+        """
+        Escribe un lote en todos los escritores
+
+        Args:
+            table: Esquema de la tabla a la que pertenecen las filas
+            rows: Filas con los valores en el orden de table.columns
+        """
+        encoded_by_dialect: Dict[type, List[str]] = {}
+        for writer in self.writers:
+            dialect = getattr(writer, "dialect", None)
+            if dialect is not None and hasattr(writer, "write_encoded_batch"):
+                key = type(dialect)
+                if key not in encoded_by_dialect:
+                    with stage(table.name, "encode", len(rows)):
+                        encoded_by_dialect[key] = dialect.encode_rows(rows)
+                writer.write_encoded_batch(table, encoded_by_dialect[key])
+            else:
+                writer.write_batch(table, rows)
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Cierra todos los escritores, aunque alguno falle"""
+        error = None
+        for writer in self.writers:
+            try:
+                writer.close()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def __enter__(self):
+        """Método para usar con el contexto 'with'"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Método para usar con el contexto 'with'"""
+        self.close()
@@ -6,7 +6,8 @@ import pytest
 import os
 import shutil
 from faker import Faker
-from src.schema import registry
+from src.context import GenerationContext, use_context
+from src.schema import Table, Column, ForeignKey
 
 # Inicializar Faker con una semilla fija para tests reproducibles
 faker = Faker()
@@ -30,12 +31,71 @@ def test_dir():
 
 
 @pytest.fixture(autouse=True)
-def reset_registry():
-    """Resetear el registro global antes de cada test"""
-    old_registry = registry.tables.copy() if registry.tables else {}
+def context():
+    """Cada test genera en su propio contexto, con un registro de tablas vacío"""
+    with use_context(GenerationContext()) as test_context:
+        yield test_context
 
-    registry.tables = {}
 
-    yield
+@pytest.fixture
+def clientes_pedidos():
+    """
+    Fixture que construye las tablas clientes y pedidos (pedidos.cliente_id -> clientes.id)
+
+    Cada llamada devuelve tablas nuevas; las columnas extra se añaden al final.
+    """
+
+    def build(clientes_columns=(), pedidos_columns=()):
+        clientes = Table(
+            name="clientes",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(name="nombre", type="VARCHAR(50)", faker_provider="name"),
+                *clientes_columns,
+            ],
+        )
+        pedidos = Table(
+            name="pedidos",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(
+                    name="cliente_id",
+                    type="INT",
+                    foreign_key=ForeignKey("cliente_id", "clientes", "id"),
+                ),
+                *pedidos_columns,
+            ],
+        )
+        return clientes, pedidos
+
+    return build
+
+
+@pytest.fixture
+def padres_hijos():
+    """
+    Fixture que construye las tablas padres e hijos (hijos.padre_id -> padres.id)
+
+    Cada llamada devuelve tablas nuevas; las columnas extra de hijos se añaden al final.
+    """
+
+    def build(hijos_columns=()):
+        padres = Table(
+            name="padres",
+            columns=[
+                Column("id", "INTEGER", primary_key_autoincrement=True),
+                Column("nombre", "VARCHAR(50)", faker_provider="name"),
+            ],
+        )
+        hijos = Table(
+            name="hijos",
+            columns=[
+                Column("id", "INTEGER", primary_key_autoincrement=True),
+                Column("padre_id", "INTEGER", foreign_key=ForeignKey("padre_id", "padres", "id")),
+                *hijos_columns,
+            ],
+        )
+        return padres, hijos
+
+    return build
 
-    registry.tables = old_registry
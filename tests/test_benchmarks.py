@@ -0,0 +1,82 @@
+"""
+Tests para la suite de benchmarks
+"""
+
+import json
+from benchmarks.run_benchmarks import compare_results, fk_benchmarks, measure, main
+from benchmarks.import_time import measure_import, parse_importtime
+
+
+def test_measure_reports_rates():
+    """Test para verificar las métricas de un benchmark"""
+    result = measure(fk_benchmarks(50)["fk/small_parent"], load=True, repeat=1)
+
+    assert result["rows"] == 60
+    assert result["bytes"] > 0
+    assert result["rows_per_sec"] > 0
+    assert result["load_seconds"] > 0
+    assert result["seconds"] >= result["generate_seconds"] + result["encode_seconds"]
+
+
+def test_compare_results_flags_regressions():
+    """Test para verificar la detección de regresiones contra la línea base"""
+    baseline = {"a": {"rows_per_sec": 1000}, "b": {"rows_per_sec": 1000}}
+    results = {
+        "a": {"rows_per_sec": 900},
+        "b": {"rows_per_sec": 500},
+        "nuevo": {"rows_per_sec": 1},
+    }
+
+    regressions = compare_results(results, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
+
+
+def test_main_writes_json_and_compares(tmp_path):
+    """Test para verificar la salida JSON y el código de salida ante regresiones"""
+    output = tmp_path / "resultados.json"
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"results": {"fk/small_parent": {"rows_per_sec": 1e12}}})
+    )
+
+    code = main(
+        [
+            "--quick",
+            "--only",
+            "fk/small_parent",
+            "--output",
+            str(output),
+            "--baseline",
+            str(baseline),
+        ]
+    )
+
+    report = json.loads(output.read_text())
+    assert code == 1
+    assert list(report["results"]) == ["fk/small_parent"]
+    assert report["meta"]["repeat"] == 1
+
+
+def test_parse_importtime():
+    """Test para verificar la lectura de la salida de -X importtime"""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   src.schema\n"
+        "import time:        80 |        200 | src.generator\n"
+    )
+
+    modules = parse_importtime(output)
+
+    assert modules["src.generator"] == {"self_us": 80, "cumulative_us": 200}
+    assert modules["src.schema"]["cumulative_us"] == 120
+
+
+def test_utils_import_is_lazy():
+    """Test para verificar que importar src.utils no carga Faker ni el driver de MariaDB"""
+    result = measure_import("src.utils", repeat=1)
+
+    assert result["cumulative_us"] > 0
+    assert not result["imports_faker"]
+    assert not result["imports_mariadb"]
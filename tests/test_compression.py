@@ -0,0 +1,92 @@
+"""
+Tests para la salida comprimida
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import pytest
+from src.schema import Table, Column
+from src.compression import (
+    ThreadedWriter,
+    compression_extension,
+    detect_compression,
+    open_output,
+)
+from src.writers import CSVWriter
+
+READERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def test_detect_compression():
+    """Test para verificar la detección del formato por extensión"""
+    assert detect_compression("datos.sql") is None
+    assert detect_compression("datos.sql.gz") == "gzip"
+    assert detect_compression("datos.csv.bz2") == "bz2"
+    assert detect_compression("datos.jsonl.xz") == "xz"
+    assert detect_compression("datos.sql.zst") == "zstd"
+    assert compression_extension("gzip") == ".gz"
+    with pytest.raises(ValueError):
+        compression_extension("rar")
+
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+@pytest.mark.parametrize("threaded", [True, False])
+def test_open_output_roundtrip(extension, threaded):
+    """Test para verificar que el contenido comprimido se recupera intacto"""
+    content = "INSERT INTO t (a) VALUES ('ñandú');\n" * 5000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, f"datos.sql{extension}")
+        with open_output(path, threaded=threaded) as f:
+            for line in content.splitlines(keepends=True):
+                f.write(line)
+
+        with READERS[extension](path, "rt", encoding="utf-8") as f:
+            assert f.read() == content
+        assert os.path.getsize(path) < len(content.encode("utf-8"))
+
+
+def test_open_output_zstd():
+    """Test para verificar la compresión zstd cuando el paquete está disponible"""
+    zstandard = pytest.importorskip("zstandard")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "datos.sql.zst")
+        with open_output(path) as f:
+            f.write("hola\n" * 100)
+
+        with open(path, "rb") as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        assert data == b"hola\n" * 100
+
+
+def test_threaded_writer_propagates_errors():
+    """Test para verificar que un error del hilo de compresión llega al productor"""
+
+    class FailingStream:
+        def write(self, data):
+            raise OSError("disco lleno")
+
+        def close(self):
+            pass
+
+    writer = ThreadedWriter(FailingStream())
+    writer.write(b"datos")
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def test_csv_writer_compressed():
+    """Test para verificar los archivos CSV comprimidos por tabla"""
+    tabla = Table(name="datos", columns=[Column("id", "INTEGER")])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with CSVWriter(temp_dir, compression="gzip") as writer:
+            writer.write_batch(tabla, [(1,), (2,)])
+
+        assert writer.files["datos"].endswith("datos.csv.gz")
+        with gzip.open(writer.files["datos"], "rt", encoding="utf-8") as f:
+            assert f.read() == "id\n1\n2\n"
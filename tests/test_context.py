@@ -0,0 +1,116 @@
+"""
+Tests para los contextos de generación aislados
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.schema import Table, Column, registry
+from src.generator import generate_insert_queries_in_order
+from src.context import GenerationContext, current_context, default_context, use_context
+from src.providers import batch_provider, get_faker, get_rng
+
+
+@batch_provider
+def _estado(n, rng):
+    return rng.choices(["Pendiente", "Pagado", "Enviado"], k=n)
+
+
+@pytest.fixture
+def tablas(clientes_pedidos):
+    """Fixture que construye clientes y pedidos con un saldo y un estado de lotes"""
+
+    def build():
+        clientes, pedidos = clientes_pedidos(
+            clientes_columns=[Column(name="saldo", type="FLOAT")],
+            pedidos_columns=[Column(name="estado", type="VARCHAR(10)", custom_provider=_estado)],
+        )
+        return {clientes: 20, pedidos: 50}
+
+    return build
+
+
+def test_contexts_are_isolated(tablas):
+    """Test para verificar que cada contexto tiene su propio registro"""
+    first = GenerationContext(seed=1)
+    second = GenerationContext(seed=2)
+    generate_insert_queries_in_order(tablas(), context=first)
+    generate_insert_queries_in_order(tablas(), context=second)
+
+    assert sorted(first.registry.tables) == ["clientes", "pedidos"]
+    assert first.registry.get("clientes") is not second.registry.get("clientes")
+    assert registry.tables == {}
+    assert first.get_faker() is not second.get_faker()
+
+
+def test_seed_makes_generation_reproducible(tablas):
+    """Test para verificar que la misma semilla produce los mismos datos"""
+    first = generate_insert_queries_in_order(tablas(), context=GenerationContext(seed=7))
+    again = generate_insert_queries_in_order(tablas(), context=GenerationContext(seed=7))
+    other = generate_insert_queries_in_order(tablas(), context=GenerationContext(seed=8))
+
+    assert first == again
+    assert first != other
+
+
+def test_concurrent_threads(tablas):
+    """Test para verificar que varias generaciones en hilos no se mezclan"""
+    expected = generate_insert_queries_in_order(tablas(), context=GenerationContext(seed=3))
+
+    def generate(_):
+        return generate_insert_queries_in_order(tablas(), context=GenerationContext(seed=3))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(generate, range(8)))
+
+    assert all(result == expected for result in results)
+
+
+def test_shared_tables_across_contexts(tablas):
+    """Test para verificar que dos contextos sobre las mismas tablas no mezclan sus valores"""
+    schema = tablas()
+    clientes = next(iter(schema))
+    first, second = GenerationContext(seed=3), GenerationContext(seed=3)
+
+    expected = generate_insert_queries_in_order(schema, context=first)
+    assert generate_insert_queries_in_order(schema, context=second) == expected
+    assert first.registry.row_count(clientes) == 20
+    assert len(first.registry.get_generated_values(clientes, "id")) == 20
+    assert len(second.registry.get_generated_values(clientes, "id")) == 20
+    # El registro global no recibe nada
+    assert clientes.row_count == 0
+
+    def generate(_):
+        return generate_insert_queries_in_order(schema, context=GenerationContext(seed=3))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(generate, range(8)))
+
+    assert all(result == expected for result in results)
+
+
+def test_register_validates_with_owning_context():
+    """Test para verificar que register compila los providers en el contexto del registro"""
+    context = GenerationContext(seed=6)
+    tabla = Table(
+        name="personas",
+        columns=[Column(name="nombre", type="VARCHAR(50)", faker_provider="name", locale="fr_FR")],
+    )
+    context.registry.register(tabla)
+
+    assert ("name", "fr_FR") in context._compiled
+    assert ("name", "fr_FR") not in default_context._compiled
+
+
+def test_use_context(tablas):
+    """Test para verificar que use_context activa el contexto solo dentro del bloque"""
+    outer = current_context()
+    context = GenerationContext(seed=5)
+    with use_context(context):
+        assert current_context() is context
+        assert get_faker() is context.get_faker()
+        assert get_rng() is context.rng
+        generate_insert_queries_in_order(tablas())
+
+    assert current_context() is outer
+    assert "pedidos" in context.registry.tables
+    assert registry.tables == {}
@@ -0,0 +1,106 @@
+"""
+Tests para los codificadores de literales SQL por dialecto
+"""
+
+from datetime import date, datetime
+import pytest
+from src.schema import Table, Column
+from src.generator import generate_insert_query, generate_row_batches
+from src.dialects import (
+    MariaDBDialect,
+    PostgreSQLDialect,
+    SQLiteDialect,
+    split_sql_statements,
+    get_dialect,
+)
+
+
+@pytest.fixture
+def tabla():
+    """Fixture con una tabla de tipos variados"""
+    return Table(
+        name="eventos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("nombre", "TEXT"),
+            Column("activo", "BOOLEAN"),
+            Column("fecha", "DATETIME"),
+        ],
+    )
+
+
+def test_encode_values_per_dialect():
+    """Test para verificar los literales propios de cada dialecto"""
+    mariadb = get_dialect("mariadb")
+    postgres = get_dialect("postgresql")
+    sqlite = get_dialect("sqlite")
+
+    assert mariadb.encode_value("O'Brien\\") == "'O''Brien\\\\'"
+    assert postgres.encode_value("O'Brien\\") == "'O''Brien\\'"
+    assert sqlite.encode_value("O'Brien\\") == "'O''Brien\\'"
+
+    assert mariadb.encode_value(True) == "true"
+    assert postgres.encode_value(False) == "FALSE"
+    assert sqlite.encode_value(True) == "1"
+
+    assert mariadb.encode_value(b"\x01\xff") == "X'01ff'"
+    assert postgres.encode_value(b"\x01\xff") == "'\\x01ff'::bytea"
+
+    assert sqlite.encode_value(None) == "NULL"
+    assert sqlite.encode_value(datetime(2024, 5, 6, 7, 8, 9)) == "'2024-05-06 07:08:09'"
+    assert sqlite.encode_value(date(2024, 5, 6)) == "'2024-05-06'"
+
+
+def test_get_dialect_unknown():
+    """Test para verificar el error con un dialecto desconocido"""
+    assert isinstance(get_dialect("MySQL"), MariaDBDialect)
+    with pytest.raises(ValueError):
+        get_dialect("oracle")
+
+
+def test_same_rows_several_dialects(tabla):
+    """Test para verificar que un mismo lote se codifica para varios motores"""
+    rows = [row for batch in generate_row_batches(tabla, 10) for row in batch]
+
+    for dialect in (MariaDBDialect(), PostgreSQLDialect(), SQLiteDialect()):
+        statements = dialect.insert_statements(tabla, rows)
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT INTO eventos (id, nombre, activo, fecha)")
+        assert statements[0].count("\n(") == 10
+
+
+def test_statement_size_limit(tabla):
+    """Test para verificar que se divide la sentencia al superar el tamaño máximo"""
+    dialect = SQLiteDialect()
+    dialect.max_statement_bytes = 400
+
+    rows = [(i, "x" * 50, True, None) for i in range(20)]
+    statements = dialect.insert_statements(tabla, rows)
+
+    assert len(statements) > 1
+    assert all(len(statement.encode("utf-8")) <= 400 for statement in statements)
+    assert sum(statement.count("\n(") for statement in statements) == 20
+
+
+def test_generate_insert_query_dialect(tabla):
+    """Test para verificar el parámetro dialect de generate_insert_query"""
+    sql = generate_insert_query(tabla, 5, dialect="sqlite")
+
+    assert "true" not in sql and "false" not in sql
+    assert sql.endswith(";")
+
+
+def test_split_sql_statements():
+    """Test para verificar que la división en sentencias respeta las cadenas"""
+    script = "INSERT INTO t VALUES ('a;b', 'it''s;');\nINSERT INTO t VALUES ('\\');"
+    assert split_sql_statements(script) == [
+        "INSERT INTO t VALUES ('a;b', 'it''s;');",
+        "INSERT INTO t VALUES ('\\');",
+    ]
+    # Con escapes de barra invertida, \' no cierra la cadena
+    assert split_sql_statements("SELECT 'x\\';'; SELECT 2;", backslash_escapes=True) == [
+        "SELECT 'x\\';';",
+        "SELECT 2;",
+    ]
+    assert split_sql_statements("SELECT 1") == ["SELECT 1"]
+
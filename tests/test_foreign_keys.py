@@ -3,19 +3,19 @@ Tests específicos para las funcionalidades de llaves foráneas
 """
 
 import pytest
-from src.schema import Table, Column, ForeignKey, registry, TableRegistry
+from src.schema import Table, Column, ForeignKey, TableRegistry
 from src.generator import (
     generate_insert_query,
     generate_insert_queries_in_order,
+    generate_row_batches_in_order,
 )
 from src.test_utils import create_related_schemas_example
 
 
 @pytest.fixture
-def clear_registry():
-    """Fixture para limpiar el registro global antes de cada test"""
-    registry.tables = {}
-    return registry
+def clear_registry(context):
+    """Fixture con el registro vacío del contexto del test"""
+    return context.registry
 
 
 @pytest.fixture
@@ -203,6 +203,41 @@ def test_error_on_invalid_foreign_key():
 # Funciones auxiliares para extraer y analizar los datos de SQL
 
 
+def test_append_continues_sequences(clientes_pedidos):
+    """Test para verificar que el modo append continúa los autoincrementos y amplía los pools"""
+    clientes, pedidos = clientes_pedidos()
+    list(generate_row_batches_in_order({clientes: 10, pedidos: 20}, append=True))
+    assert clientes.row_count == 10
+
+    new = [
+        row
+        for _, batch in generate_row_batches_in_order({clientes: 5, pedidos: 7}, append=True)
+        for row in batch
+    ]
+    assert [row[0] for row in new[:5]] == [11, 12, 13, 14, 15]
+    assert [row[0] for row in new[5:]] == list(range(21, 28))
+    assert list(clientes.get_generated_values("id")) == list(range(1, 16))
+    assert all(1 <= row[1] <= 15 for row in new[5:])
+
+
+def test_append_on_recorded_dataset(context, clientes_pedidos):
+    """Test para verificar que se generan solo las filas nuevas sobre un conjunto existente"""
+    clientes, pedidos = clientes_pedidos()
+    context.registry.register(clientes).record_existing_rows(10_000_000)
+    context.registry.register(pedidos).record_existing_rows(12_000_000)
+
+    # Solo se generan los pedidos nuevos; los clientes existentes no se materializan
+    batches = list(generate_row_batches_in_order({pedidos: 100}, append=True))
+    rows = [row for _, batch in batches for row in batch]
+    assert rows[0][0] == 12_000_001 and rows[-1][0] == 12_000_100
+    assert all(1 <= row[1] <= 10_000_000 for row in rows)
+    assert clientes.get_generated_values("id").memory_bytes < 100
+    assert pedidos.row_count == 12_000_100
+
+    with pytest.raises(ValueError):
+        clientes.record_existing_rows(1, {"no_existe": [1]})
+
+
 def extract_ids_from_sql(sql):
     """Extrae los IDs (primer campo) de una consulta SQL"""
     ids = []
@@ -0,0 +1,158 @@
+"""
+Tests para los pools de llaves y el presupuesto de memoria
+"""
+
+import os
+import pickle
+import random
+from datetime import date
+from decimal import Decimal
+import pytest
+from src.schema import Table, Column, ForeignKey
+from src.generator import generate_insert_queries_in_order
+from src.key_pools import KeyPool, MappedKeys, mapped_typecode, parse_size
+
+
+@pytest.fixture
+def memory_budget(context, tmp_path):
+    """Activa un presupuesto de memoria mínimo en el registro del test"""
+    context.registry.set_memory_budget(1, spill_dir=str(tmp_path))
+    return tmp_path
+
+
+def test_parse_size():
+    """Test para verificar la conversión de tamaños legibles a bytes"""
+    assert parse_size(1024) == 1024
+    assert parse_size("512MB") == 512 * 1024**2
+    assert parse_size("2G") == 2 * 1024**3
+    assert parse_size("1.5 KiB") == 1536
+    with pytest.raises(ValueError):
+        parse_size("mucho")
+
+
+def test_spilled_pool_keeps_values(tmp_path):
+    """Test para verificar que un pool en disco conserva valores, tipos y orden"""
+    values = [1, "dos", 3.5, None, b"\x00\x01", True, date(2024, 1, 2), Decimal("1.10")]
+    pool = KeyPool(values)
+    pool.spill(str(tmp_path))
+    pool.extend(["nueve"])
+
+    assert pool.spilled
+    assert pool.memory_bytes == 0
+    assert len(pool) == 9
+    assert list(pool) == values + ["nueve"]
+    assert pool[-1] == "nueve"
+    assert pool[6] == date(2024, 1, 2)
+    assert pool[5] is True
+    assert "dos" in pool
+
+    path = pool.path
+    pool.close()
+    assert not os.path.exists(path)
+
+
+def test_choices_same_result_in_memory_and_on_disk(tmp_path):
+    """Test para verificar que el muestreo no cambia al mover el pool a disco"""
+    values = list(range(5000))
+    memory_pool = KeyPool(values)
+    disk_pool = KeyPool(values)
+    disk_pool.spill(str(tmp_path))
+
+    random.seed(7)
+    expected = memory_pool.choices(3000)
+    random.seed(7)
+    assert disk_pool.choices(3000) == expected
+
+
+def test_range_pool_stays_compact():
+    """Test para verificar que los lotes contiguos de un autoincremento no se materializan"""
+    pool = KeyPool()
+    pool.extend(range(1, 1001))
+    pool.extend(range(1001, 2001))
+    assert len(pool) == 2000
+    assert pool.memory_bytes < 100
+    assert pool[1999] == 2000 and pool[:3] == [1, 2, 3]
+
+    random.seed(5)
+    expected = random.choices(list(range(1, 2001)), k=50)
+    random.seed(5)
+    assert pool.choices(50) == expected
+
+    # Un lote no contiguo convierte el pool en una lista
+    pool.extend([5000])
+    assert pool[-1] == 5000 and len(pool) == 2001
+
+
+def test_mapped_typecode():
+    """Test para verificar el formato mapeado de rangos, listas homogéneas y tipos mezclados"""
+    assert mapped_typecode(range(1, 10**12)) == "q"
+    assert mapped_typecode(range(2**63, 2**63 + 5)) is None
+    assert mapped_typecode(range(0)) is None
+    assert mapped_typecode([1.5, 2.0]) == "d"
+    assert mapped_typecode(["a"] * 70_000) == "s"
+    assert mapped_typecode(["a"] * 70_000 + [1]) is None
+    assert mapped_typecode([True, 1]) is None
+    assert mapped_typecode([2**63]) is None
+
+
+def test_memory_budget_spills_and_reports(context, memory_budget):
+    """Test para verificar que al superar el presupuesto los pools pasan a disco"""
+    padres = Table(
+        name="padres",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("nombre", "VARCHAR(50)", faker_provider="name"),
+        ],
+    )
+    hijos = Table(
+        name="hijos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("padre_id", "INTEGER", foreign_key=ForeignKey("padre_id", "padres", "id")),
+        ],
+    )
+
+    generate_insert_queries_in_order({padres: 1500, hijos: 2000})
+
+    assert context.registry.memory_usage() == 0
+    assert all(value in range(1, 1501) for value in hijos.get_generated_values("padre_id"))
+
+    report = context.registry.memory_report()
+    assert sorted(report["padres"]["spilled_columns"]) == ["id", "nombre"]
+    assert report["padres"]["peak_memory_bytes"] > 0
+    assert report["padres"]["disk_bytes"] > 0
+    assert report["hijos"]["memory_bytes"] == 0
+    # Un archivo por pool (los textos añaden su archivo .idx de desplazamientos)
+    assert len([path for path in memory_budget.iterdir() if path.suffix != ".idx"]) == 4
+
+
+def test_mapped_pool_sampling_and_sharing(tmp_path):
+    """Test para verificar el muestreo desde archivos mapeados y su envío a otros procesos"""
+    ints = [random.randrange(-10**12, 10**12) for _ in range(3000)]
+    texts = [f"código-{i}" for i in range(3000)]
+    for values in (ints, texts):
+        memory_pool = KeyPool(values)
+        disk_pool = KeyPool(values)
+        disk_pool.spill(str(tmp_path))
+        assert isinstance(disk_pool._values, MappedKeys)
+        assert disk_pool.memory_bytes == 0 and disk_pool.disk_bytes > 0
+
+        random.seed(11)
+        expected = memory_pool.choices(500)
+        random.seed(11)
+        assert disk_pool.choices(500) == expected
+
+        disk_pool.extend(values[:10])
+        assert len(disk_pool) == 3010 and disk_pool[-1] == values[9]
+
+        # Al enviar la vista compartida solo viaja la ruta del archivo
+        shared = pickle.loads(pickle.dumps(disk_pool.share()))
+        assert len(pickle.dumps(disk_pool.share())) < 500
+        assert list(shared) == list(disk_pool)
+
+    # Un lote de otro tipo mueve el pool a SQLite sin perder valores
+    disk_pool = KeyPool(ints)
+    disk_pool.spill(str(tmp_path))
+    disk_pool.extend([None])
+    assert disk_pool.path.endswith(".sqlite")
+    assert list(disk_pool) == ints + [None]
@@ -0,0 +1,108 @@
+"""
+Tests para los callbacks de progreso y métricas
+"""
+
+import io
+import os
+import tempfile
+import pytest
+from src.generator import generate_insert_queries_in_order
+from src.metrics import (
+    PrometheusTextfileExporter,
+    ProgressTracker,
+    TerminalProgressReporter,
+    format_duration,
+)
+from src.utils import export_to_writer
+from src.writers import SQLInsertWriter
+
+
+@pytest.fixture
+def tablas(padres_hijos):
+    """Fixture con pocos padres y muchos hijos"""
+
+    def build():
+        padres, hijos = padres_hijos()
+        return {hijos: 2500, padres: 10}
+
+    return build
+
+
+def test_progress_events_generate_queries(tablas):
+    """Test para verificar los eventos de progreso de generate_insert_queries_in_order"""
+    events = []
+    queries = generate_insert_queries_in_order(tablas(), progress=events.append)
+
+    kinds = [event.event for event in events]
+    assert kinds[0] == "start" and kinds[-1] == "end"
+    assert kinds.count("table_end") == 2
+    assert kinds.count("batch") == 4  # 1 lote de padres y 3 de hijos
+
+    # Las tablas se procesan en orden de dependencias
+    orden = [event.table for event in events if event.event == "table_start"]
+    assert orden == ["padres", "hijos"]
+
+    primer_lote = next(e for e in events if e.event == "batch" and e.table == "hijos")
+    assert primer_lote.table_rows == 1000
+    assert primer_lote.table_total_rows == 2500
+    assert primer_lote.total_rows == 2510
+    assert primer_lote.eta is not None
+
+    final = events[-1]
+    assert final.rows == 2510
+    assert final.eta == 0.0
+    assert final.bytes == sum(len(q.encode("utf-8")) for q in queries.values())
+
+
+def test_progress_export_to_writer_counts_bytes(tablas):
+    """Test para verificar que export_to_writer informa los bytes del escritor"""
+    events = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "datos.sql")
+        export_to_writer(tablas(), SQLInsertWriter(path), progress=[events.append])
+        size = os.path.getsize(path)
+
+    final = events[-1]
+    assert final.event == "end"
+    assert final.rows == 2510
+    # Solo quedan fuera los comentarios y el cierre de cada sentencia
+    assert 0 < size - final.bytes < 200
+
+
+def test_eta_from_bytes():
+    """Test para verificar el tiempo restante estimado a partir de bytes"""
+    tracker = ProgressTracker([], total_bytes={"a": 100, "b": 300})
+    tracker.start()
+    tracker.end_table("a", 100)
+    assert tracker.fraction() == 0.25
+    assert format_duration(3725) == "1:02:05"
+    assert format_duration(None) == "?"
+
+
+def test_terminal_reporter(tablas):
+    """Test para verificar la línea de progreso de la terminal"""
+    stream = io.StringIO()
+    generate_insert_queries_in_order(
+        tablas(), progress=TerminalProgressReporter(stream, min_interval=0)
+    )
+    output = stream.getvalue()
+    assert "hijos: 2,500/2,500" in output
+    assert output.endswith("\n")
+    assert "2,510 filas en" in output
+
+
+def test_prometheus_textfile_exporter(tablas):
+    """Test para verificar el archivo de métricas de Prometheus"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "relleneitor.prom")
+        exporter = PrometheusTextfileExporter(path, labels={"job": "carga"})
+        generate_insert_queries_in_order(tablas(), progress=exporter)
+
+        with open(path) as f:
+            content = f.read()
+        assert os.listdir(temp_dir) == ["relleneitor.prom"]
+
+    assert "# TYPE relleneitor_rows_total counter" in content
+    assert 'relleneitor_rows_total{job="carga",table="hijos"} 2500' in content
+    assert 'relleneitor_rows_target{job="carga",table="padres"} 10' in content
+    assert 'relleneitor_finished{job="carga"} 1' in content
@@ -0,0 +1,105 @@
+"""
+Tests para los planes de generación compilados y su caché
+"""
+
+import pytest
+from src.schema import Column
+from src.generator import generate_insert_queries_in_order
+from src.plans import (
+    compile_plan,
+    load_or_compile_plan,
+    plan_path,
+    schema_hash,
+)
+from src import providers
+from src.context import GenerationContext
+
+
+@pytest.fixture
+def tablas(clientes_pedidos):
+    """Fixture que construye clientes y pedidos con una edad y un total"""
+
+    def build():
+        return clientes_pedidos(
+            clientes_columns=[
+                Column(name="edad", type="INT", faker_provider="random_int(min=18, max=90)")
+            ],
+            pedidos_columns=[Column(name="total", type="FLOAT")],
+        )
+
+    return build
+
+
+def test_compile_plan(tablas):
+    """Test para verificar el orden y el análisis de las columnas"""
+    clientes, pedidos = tablas()
+    plan = compile_plan([pedidos, clientes])
+
+    assert plan.order == ["clientes", "pedidos"]
+    kinds = {c.name: c.kind for c in plan.columns["clientes"]}
+    assert kinds == {"id": "autoincrement", "nombre": "faker", "edad": "faker"}
+    edad = plan.columns["clientes"][2]
+    assert edad.parsed == ("random_int", (), {"min": 18, "max": 90})
+    assert [c.kind for c in plan.columns["pedidos"]] == ["autoincrement", "fk", "type"]
+
+
+def test_schema_hash_changes_with_schema(tablas):
+    """Test para verificar que el hash cambia cuando cambia la definición"""
+    clientes, pedidos = tablas()
+    original = schema_hash([clientes, pedidos])
+    assert schema_hash([clientes, pedidos]) == original
+
+    clientes.columns[2].faker_provider = "random_int(min=18, max=65)"
+    assert schema_hash([clientes, pedidos]) != original
+
+
+def test_load_or_compile_plan_uses_cache(tablas, tmp_path, monkeypatch):
+    """Test para verificar que un segundo arranque carga el plan sin validar"""
+    clientes, pedidos = tablas()
+    plan = load_or_compile_plan([clientes, pedidos], cache_dir=str(tmp_path))
+    assert not plan.from_cache
+    assert (tmp_path / plan_path("", plan.schema_hash)).exists()
+
+    cached = load_or_compile_plan([clientes, pedidos], cache_dir=str(tmp_path))
+    assert cached.from_cache
+    assert cached.order == plan.order
+
+    # Con el plan en caché no se vuelven a analizar las expresiones
+    providers._compiled.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("se volvió a validar la expresión")
+
+    monkeypatch.setattr(providers, "parse_provider_expression", fail)
+    monkeypatch.setattr(providers, "validate_column", fail)
+
+    tables = {clientes: 5, pedidos: 10}
+    queries = generate_insert_queries_in_order(tables, plan=cached)
+    assert list(queries) == ["clientes", "pedidos"]
+    assert queries["pedidos"].startswith("INSERT INTO pedidos")
+
+
+def test_plan_produces_same_data(tablas):
+    """Test para verificar que generar con plan produce los mismos datos que sin él"""
+    clientes, pedidos = tablas()
+    without_plan = generate_insert_queries_in_order(
+        {clientes: 5, pedidos: 8}, context=GenerationContext(seed=3)
+    )
+
+    # Tablas nuevas: las anteriores conservan los valores ya generados
+    clientes, pedidos = tablas()
+    context = GenerationContext(seed=3)
+    plan = compile_plan([clientes, pedidos], GenerationContext())
+    with_plan = generate_insert_queries_in_order(
+        {clientes: 5, pedidos: 8}, plan=plan, context=context
+    )
+
+    assert with_plan == without_plan
+
+
+def test_plan_rejects_other_tables(tablas):
+    """Test para verificar que un plan no se aplica a otro conjunto de tablas"""
+    clientes, pedidos = tablas()
+    plan = compile_plan([clientes])
+    with pytest.raises(ValueError):
+        generate_insert_queries_in_order({clientes: 1, pedidos: 1}, plan=plan)
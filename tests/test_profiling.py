@@ -0,0 +1,105 @@
+"""
+Tests para la instrumentación de perfilado
+"""
+
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.context import GenerationContext
+from src.schema import Column
+from src.generator import generate_insert_queries_in_order
+from src.profiling import Profiler, get_active_profiler, profile, stage
+from src.sqlite_database import SQLiteManager
+from src.utils import export_to_writer
+from src.writers import DatabaseWriter, FanOutWriter, SQLInsertWriter
+
+
+@pytest.fixture
+def tablas(padres_hijos):
+    """Fixture con padres e hijos con una biografía"""
+
+    def build():
+        padres, hijos = padres_hijos(hijos_columns=[Column("bio", "TEXT", faker_provider="paragraph")])
+        return {padres: 20, hijos: 30}
+
+    return build
+
+
+def test_profiling_disabled_by_default(tablas):
+    """Test para verificar que sin perfilador activo no se registra nada"""
+    assert get_active_profiler() is None
+
+    with stage("tabla", "encode") as result:
+        assert result is None
+
+    generate_insert_queries_in_order(tablas())
+    assert get_active_profiler() is None
+
+
+def test_profile_columns_and_stages(tablas):
+    """Test para verificar las mediciones por columna, provider y etapa"""
+    with profile() as profiler:
+        generate_insert_queries_in_order(tablas())
+
+    assert get_active_profiler() is None
+    assert profiler.columns[("hijos", "bio")].rows == 30
+    assert profiler.column_providers[("hijos", "bio")] == "faker:paragraph"
+    assert profiler.column_providers[("hijos", "padre_id")] == "fk:padres.id"
+    assert profiler.column_providers[("padres", "id")] == "autoincrement"
+    assert "faker:name" in profiler.providers
+
+    totals = profiler.stage_totals()
+    assert totals["generate"].rows == 50
+    assert totals["encode"].rows == 50
+    assert "store" in totals
+
+    report = profiler.report()
+    assert report.startswith("Columnas más costosas:")
+    assert "hijos.bio" in report
+
+
+def test_profilers_per_thread(padres_hijos):
+    """Test para verificar que las generaciones en hilos distintos no mezclan sus mediciones"""
+
+    def generate(rows):
+        padres, hijos = padres_hijos()
+        with profile() as profiler:
+            generate_insert_queries_in_order(
+                {padres: rows, hijos: rows}, context=GenerationContext(seed=rows)
+            )
+        return profiler
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        profilers = list(executor.map(generate, [10, 20, 30, 40]))
+
+    for rows, profiler in zip([10, 20, 30, 40], profilers):
+        assert profiler.columns[("padres", "nombre")].rows == rows
+        assert profiler.stage_totals()["generate"].rows == 2 * rows
+
+
+def test_profile_writer_stages_and_json(tablas):
+    """Test para verificar las etapas encode, write y load y la exportación a JSON"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with SQLiteManager() as db:
+            with profile(Profiler()) as profiler:
+                esquema = tablas()
+                db.create_tables(list(esquema.keys()))
+                export_to_writer(
+                    esquema,
+                    FanOutWriter(
+                        [
+                            SQLInsertWriter(os.path.join(temp_dir, "datos.sql")),
+                            DatabaseWriter(db),
+                        ]
+                    ),
+                )
+
+        path = os.path.join(temp_dir, "perfil.json")
+        profiler.export_json(path)
+        with open(path) as f:
+            data = json.load(f)
+
+    assert set(data["stage_totals"]) >= {"generate", "store", "encode", "write", "load"}
+    assert data["columns"][0]["seconds"] >= data["columns"][-1]["seconds"]
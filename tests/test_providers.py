@@ -0,0 +1,191 @@
+"""
+Tests para el compilador de expresiones de providers y los providers de lotes
+"""
+
+import random
+from datetime import date, timedelta
+import pytest
+from src.schema import Table, Column
+from src.context import default_context, use_context
+from src.dialects import get_dialect
+from src.generator import generate_row_batches
+from src.providers import (
+    ProviderExpressionError,
+    SQLLiteral,
+    as_batch_provider,
+    batch_provider,
+    call_batch_provider,
+    compile_provider,
+    get_rng,
+    is_batch_provider,
+    parse_provider_expression,
+    parse_sql_literal,
+)
+
+
+def test_parse_provider_expression():
+    """Test para verificar el análisis de nombres y argumentos literales"""
+    assert parse_provider_expression("name") == ("name", (), {})
+    assert parse_provider_expression("random_int(min=1, max=100)") == (
+        "random_int",
+        (),
+        {"min": 1, "max": 100},
+    )
+    assert parse_provider_expression("random_element(('A', 'B'))") == (
+        "random_element",
+        (("A", "B"),),
+        {},
+    )
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "name(",
+        "faker.name",
+        "name()()",
+        "random_int(min=__import__('os'))",
+        "pyfloat(**opciones)",
+    ],
+)
+def test_invalid_expressions(expression):
+    """Test para verificar el rechazo de expresiones que no son un provider con literales"""
+    with pytest.raises(ProviderExpressionError):
+        parse_provider_expression(expression)
+
+
+def test_compile_provider_with_arguments():
+    """Test para verificar los argumentos tipados y la caché de providers compilados"""
+    pyfloat = compile_provider("pyfloat(left_digits=3, right_digits=2, positive=True)")
+    assert compile_provider("pyfloat(left_digits=3, right_digits=2, positive=True)") is pyfloat
+    for _ in range(50):
+        value = pyfloat()
+        assert 0 <= value < 1000
+        assert round(value, 2) == value
+
+    fecha = compile_provider("date_between(start_date='-1y', end_date='today')")
+    assert date.today() - timedelta(days=366) <= fecha() <= date.today()
+
+    estado = compile_provider("random_element(elements=('Pendiente', 'Pagado'))")
+    assert estado() in ("Pendiente", "Pagado")
+
+    assert "@" in compile_provider("relleneitor_email")()
+
+
+def test_compile_provider_errors():
+    """Test para verificar los errores de providers desconocidos o mal llamados"""
+    with pytest.raises(ProviderExpressionError, match="desconocido"):
+        compile_provider("no_existe")
+    with pytest.raises(ProviderExpressionError, match="Argumentos inválidos"):
+        compile_provider("random_int(minimo=1)")
+    with pytest.raises(ProviderExpressionError):
+        compile_provider("relleneitor_email(dominio='x.com')")
+
+
+def test_register_validates_providers(context):
+    """Test para verificar que los errores se detectan al registrar la tabla"""
+    tabla = Table(
+        name="mala",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("valor", "INTEGER", faker_provider="random_int(min=1, maxx=3)"),
+        ],
+    )
+
+    with pytest.raises(ProviderExpressionError):
+        context.registry.register(tabla)
+    assert "mala" not in context.registry.tables
+
+
+def test_generated_values_use_arguments():
+    """Test para verificar que las columnas generan con los argumentos de la expresión"""
+    tabla = Table(
+        name="productos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("codigo", "VARCHAR(20)", faker_provider="bothify(text='??-####')"),
+            Column("stock", "INTEGER", faker_provider="random_int(min=5, max=7)"),
+        ],
+    )
+
+    (batch,) = generate_row_batches(tabla, 100)
+
+    assert all(len(codigo) == 7 and codigo[2] == "-" for _, codigo, _ in batch)
+    assert {stock for _, _, stock in batch} <= {5, 6, 7}
+
+
+def test_batch_provider_protocol():
+    """Test para verificar que un provider de lotes se llama una vez por lote"""
+    llamadas = []
+
+    @batch_provider
+    def estado_provider(n, rng):
+        llamadas.append(n)
+        return rng.choices(["Pendiente", "Pagado"], k=n)
+
+    tabla = Table(
+        name="pedidos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("estado", "TEXT", custom_provider=estado_provider),
+            Column("nota", "TEXT", custom_provider=lambda: "'sin nota'"),
+        ],
+    )
+
+    batches = list(generate_row_batches(tabla, 2500))
+
+    assert llamadas == [1000, 1000, 500]
+    assert all(estado in ("Pendiente", "Pagado") for batch in batches for _, estado, _ in batch)
+    # Los providers escalares siguen funcionando a través del adaptador
+    assert batches[0][0][2] == "sin nota"
+
+
+def test_batch_provider_seeded_and_array_like():
+    """Test para verificar la reproducibilidad con random.seed y la conversión con tolist()"""
+
+    class Array(list):
+        def tolist(self):
+            return [int(value) for value in self]
+
+    @batch_provider
+    def numeros(n, rng):
+        return Array(rng.randint(1, 9) for _ in range(n))
+
+    # En el contexto por defecto, rng es el del módulo random
+    with use_context(default_context):
+        random.seed(3)
+        primero = call_batch_provider(numeros, 5, get_rng())
+        random.seed(3)
+        assert call_batch_provider(numeros, 5, get_rng()) == primero
+    assert type(primero) is list
+
+
+def test_batch_provider_wrong_length():
+    """Test para verificar el error cuando un provider de lotes devuelve otra cantidad"""
+    with pytest.raises(ValueError, match="devolvió 1 valores en lugar de 3"):
+        call_batch_provider(batch_provider(lambda n, rng: [0]), 3, get_rng())
+
+
+def test_scalar_adapter_parses_sql_literals():
+    """Test para verificar que el adaptador interpreta los literales SQL de los providers escalares"""
+    adapter = as_batch_provider(lambda: "NULL")
+    assert is_batch_provider(adapter)
+    assert adapter(2, get_rng()) == [None, None]
+    assert parse_sql_literal("X'0a1b'") == b"\x0a\x1b"
+
+
+def test_parse_sql_literal_keeps_raw_sql():
+    """Test para verificar que solo se convierten los literales simples y el resto se inserta tal cual"""
+    assert parse_sql_literal("42") == 42 and type(parse_sql_literal("42")) is int
+    assert parse_sql_literal("-3.5") == -3.5
+    assert parse_sql_literal("'a''b'") == "a'b"
+    assert parse_sql_literal("NULL") is None
+    assert parse_sql_literal("TRUE") is True
+
+    for raw in ("007", "NOW()", "1 + 1", "X'0g'", "nan", "1_000"):
+        value = parse_sql_literal(raw)
+        assert isinstance(value, SQLLiteral) and value == raw
+
+    rows = [[parse_sql_literal("NOW()"), parse_sql_literal("007"), parse_sql_literal("'NOW()'")]]
+    assert get_dialect("sqlite").encode_rows(rows) == ["(NOW(), 007, 'NOW()')"]
+
@@ -0,0 +1,159 @@
+"""
+Tests para el tamaño de los conjuntos de datos por factor de escala
+"""
+
+import io
+import pytest
+from src.schema import Table, Column, ForeignKey
+from src.context import GenerationContext
+from src.generator import generate_insert_queries_in_order
+from src.scaling import ScaleSpec, estimate_dataset, fixed, ratio, rows_for_target_bytes, scaled
+from src.temporal import datetimes
+from src.utils import export_to_writer
+from src.writers import SQLInsertWriter
+
+
+@pytest.fixture
+def tablas(clientes_pedidos):
+    """Fixture que construye paises, clientes de un país y pedidos con un total"""
+
+    def build():
+        paises = Table(
+            name="paises",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(name="nombre", type="VARCHAR(50)", faker_provider="country"),
+            ],
+        )
+        clientes, pedidos = clientes_pedidos(
+            clientes_columns=[
+                Column(name="pais_id", type="INT", foreign_key=ForeignKey("pais_id", "paises", "id"))
+            ],
+            pedidos_columns=[Column(name="total", type="FLOAT")],
+        )
+        return paises, clientes, pedidos
+
+    return build
+
+
+def test_rows_per_scale_factor(tablas):
+    """Test para verificar las filas de tablas fijas, escaladas y proporcionales"""
+    paises, clientes, pedidos = tablas()
+    spec = ScaleSpec({paises: fixed(25), clientes: 1000, pedidos: ratio("clientes", 2.5)})
+
+    assert spec.rows(1) == {paises: 25, clientes: 1000, pedidos: 2500}
+    assert spec.rows(100) == {paises: 25, clientes: 100_000, pedidos: 250_000}
+    # Con un factor muy pequeño las tablas no quedan vacías
+    assert spec.rows(0.0001) == {paises: 25, clientes: 1, pedidos: 2}
+
+
+def test_invalid_specs(tablas):
+    """Test para verificar los errores de proporciones y factores inválidos"""
+    paises, clientes, pedidos = tablas()
+    with pytest.raises(ValueError):
+        ScaleSpec({pedidos: ratio("clientes", 2)})
+    with pytest.raises(ValueError):
+        ScaleSpec({clientes: ratio("pedidos", 1), pedidos: ratio("clientes", 1)}).rows(1)
+    with pytest.raises(ValueError):
+        ScaleSpec({clientes: scaled(10)}).rows(0)
+
+
+def test_estimate_matches_generation(tablas, context):
+    """Test para verificar que la estimación se acerca al tamaño real sin tocar el registro"""
+    paises, clientes, pedidos = tablas()
+    spec = ScaleSpec({paises: fixed(10), clientes: 100, pedidos: ratio("clientes", 3)})
+
+    estimate = spec.estimate(2, sample_rows=100)
+    assert context.registry.tables == {}
+    assert [t.table for t in estimate.tables] == ["paises", "clientes", "pedidos"]
+    assert estimate.total_rows == 10 + 200 + 600
+    assert estimate.total_seconds > 0
+    assert "total" in estimate.report()
+
+    queries = generate_insert_queries_in_order(spec.rows(2))
+    actual = {name: len(sql.encode("utf-8")) for name, sql in queries.items()}
+    for table in estimate.tables:
+        assert table.bytes == pytest.approx(actual[table.table], rel=0.25)
+
+
+def test_estimate_dataset_with_explicit_rows(tablas):
+    """Test para verificar la estimación a partir de un diccionario de filas"""
+    paises, clientes, pedidos = tablas()
+    estimate = estimate_dataset({paises: 5, clientes: 1_000_000, pedidos: 0}, sample_rows=20)
+
+    rows = {t.table: t.rows for t in estimate.tables}
+    assert rows == {"paises": 5, "clientes": 1_000_000, "pedidos": 0}
+    assert estimate.to_dict()["tables"]["pedidos"]["bytes"] == 0
+    assert paises.row_count == 0
+
+
+def test_estimate_keeps_provider_state():
+    """Test para verificar que estimar no avanza los custom_provider con estado"""
+
+    def generate(estimate_first):
+        eventos = Table(
+            name="eventos",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(
+                    name="ts",
+                    type="DATETIME",
+                    custom_provider=datetimes("2024-01-01", "2024-01-31", monotonic=True, rows=500),
+                ),
+            ],
+        )
+        if estimate_first:
+            estimate_dataset({eventos: 500}, sample_rows=100)
+        return generate_insert_queries_in_order({eventos: 500}, context=GenerationContext(seed=1))
+
+    queries = generate(estimate_first=True)
+    assert queries == generate(estimate_first=False)
+    assert "(1, '2024-01-01 00:00:00')" in queries["eventos"]
+
+
+def test_rows_for_target_bytes_keeps_proportions(tablas, context):
+    """Test para verificar que el reparto por tamaño respeta las proporciones y las tablas fijas"""
+    paises, clientes, pedidos = tablas()
+    rows = rows_for_target_bytes({paises: fixed(10), clientes: 1, pedidos: 4}, 2_000_000)
+
+    assert rows[paises] == 10
+    assert rows[pedidos] == pytest.approx(4 * rows[clientes], abs=1)
+    assert rows[clientes] > 1000
+    assert context.registry.tables == {}
+
+
+def test_generate_to_target_bytes(tablas):
+    """Test para verificar que la salida ocupa aproximadamente el tamaño pedido"""
+    paises, clientes, pedidos = tablas()
+    target = 300_000
+    rows = rows_for_target_bytes({paises: fixed(5), clientes: 1, pedidos: 3}, target)
+    queries = generate_insert_queries_in_order(rows)
+
+    size = sum(len(sql.encode("utf-8")) for sql in queries.values())
+    assert size == pytest.approx(target, rel=0.1)
+    assert list(queries) == ["paises", "clientes", "pedidos"]
+    assert pedidos.row_count == pytest.approx(3 * clientes.row_count, rel=0.1)
+
+
+def test_small_target_generates_every_table(tablas):
+    """Test para verificar que con un tamaño pequeño se generan completas todas las tablas"""
+    paises, clientes, pedidos = tablas()
+    output = io.StringIO()
+    export_to_writer(
+        {paises: fixed(3), clientes: 1, pedidos: 4}, SQLInsertWriter(output), target_bytes=5_000
+    )
+
+    assert output.getvalue().count("-- Inserciones para la tabla") == 3
+    assert paises.row_count == 3
+    assert pedidos.row_count == pytest.approx(4 * clientes.row_count, abs=1)
+
+
+def test_export_to_writer_target_bytes(tablas):
+    """Test para verificar el modo por tamaño al escribir por lotes"""
+    paises, clientes, pedidos = tablas()
+    output = io.StringIO()
+    writer = SQLInsertWriter(output, dialect="postgresql")
+    export_to_writer({paises: fixed(5), clientes: 1, pedidos: 3}, writer, target_bytes=200_000)
+
+    assert writer.bytes_written == pytest.approx(200_000, rel=0.1)
+    assert output.getvalue().count("-- Inserciones para la tabla") == 3
@@ -0,0 +1,111 @@
+"""
+Tests para los snapshots de los pools de llaves
+"""
+
+from datetime import date
+import pytest
+from src.schema import Column, ForeignKey, TableRegistry
+from src.context import GenerationContext, use_context
+from src.generator import generate_row_batches_in_order
+from src.snapshots import load_snapshot, read_snapshot_header, save_snapshot
+
+
+@pytest.fixture
+def tablas(clientes_pedidos):
+    """Fixture que construye clientes con columnas de cada tipo y pedidos que referencian su código"""
+
+    def build():
+        return clientes_pedidos(
+            clientes_columns=[
+                Column(name="codigo", type="VARCHAR(20)", faker_provider="bothify(text='CL-####')"),
+                Column(name="saldo", type="FLOAT", faker_provider="pyfloat"),
+                Column(name="puntos", type="INT", faker_provider="random_int"),
+                Column(name="alta", type="DATE", faker_provider="date_object"),
+            ],
+            pedidos_columns=[
+                Column(
+                    name="cliente_codigo",
+                    type="VARCHAR(20)",
+                    foreign_key=ForeignKey("cliente_codigo", "clientes", "codigo"),
+                ),
+            ],
+        )
+
+    return build
+
+
+def test_snapshot_roundtrip(tablas, tmp_path):
+    """Test para verificar que se restauran los valores de cada tipo y la marca de agua"""
+    clientes, _ = tablas()
+    list(generate_row_batches_in_order({clientes: 300}, batch_size=100))
+    path = str(tmp_path / "padres.snap")
+    assert save_snapshot(path) == {"clientes": 300}
+
+    kinds = {
+        name: entry["kind"]
+        for name, entry in read_snapshot_header(path)["tables"]["clientes"]["columns"].items()
+    }
+    assert kinds == {
+        "id": "range",
+        "codigo": "str",
+        "nombre": "str",
+        "saldo": "float64",
+        "puntos": "int64",
+        "alta": "pickle",
+    }
+
+    restored, _ = tablas()
+    other = TableRegistry()
+    assert load_snapshot(path, tables=[restored], registry=other) == {"clientes": 300}
+    assert other.get("clientes") is restored
+    # Los valores se restauran en el registro indicado, no en el del contexto activo
+    assert other.row_count(restored) == 300
+    for column in clientes.columns:
+        assert list(other.get_generated_values(restored, column.name)) == list(
+            clientes.get_generated_values(column.name)
+        )
+    assert isinstance(other.get_generated_values(restored, "alta")[0], date)
+    assert (
+        other.get_generated_values(restored, "nombre")[-1]
+        == clientes.get_generated_values("nombre")[-1]
+    )
+    # Los valores mapeados no cuentan en el presupuesto de memoria
+    assert other.get_generated_values(restored, "codigo").memory_bytes == 0
+
+
+def test_generate_children_from_snapshot(tablas, tmp_path):
+    """Test para verificar que las tablas hijas se generan a partir de un snapshot"""
+    clientes, _ = tablas()
+    list(generate_row_batches_in_order({clientes: 50}))
+    codigos = set(clientes.get_generated_values("codigo"))
+    path = str(tmp_path / "padres.snap")
+    save_snapshot(path)
+
+    # Otra generación, con un registro vacío
+    with use_context(GenerationContext(seed=1)):
+        clientes, pedidos = tablas()
+        load_snapshot(path, tables=[clientes])
+
+        rows = [row for _, batch in generate_row_batches_in_order({pedidos: 200}) for row in batch]
+        assert {row[2] for row in rows} <= codigos
+
+        # Continuar los clientes amplía el pool mapeado
+        new = [row for _, batch in generate_row_batches_in_order({clientes: 5}, append=True) for row in batch]
+        assert [row[0] for row in new] == [51, 52, 53, 54, 55]
+        assert len(clientes.get_generated_values("codigo")) == 55
+
+
+def test_load_snapshot_errors(tablas, tmp_path):
+    """Test para verificar los errores de archivos y tablas desconocidas"""
+    clientes, _ = tablas()
+    list(generate_row_batches_in_order({clientes: 5}))
+    path = str(tmp_path / "padres.snap")
+    save_snapshot(path)
+
+    with pytest.raises(ValueError):
+        load_snapshot(path, registry=TableRegistry())
+
+    bad = tmp_path / "otro.snap"
+    bad.write_bytes(b"no es un snapshot")
+    with pytest.raises(ValueError):
+        load_snapshot(str(bad))
@@ -6,10 +6,14 @@ import os
 import tempfile
 import pytest
 from faker import Faker
-from src.schema import Table, Column, ForeignKey, registry
+from src.schema import Table, Column, ForeignKey
 from src.generator import generate_insert_query, generate_insert_queries_in_order
 from src.utils import export_sql_to_file
-from src.test_utils import generate_testing_schemas, generate_custom_testing_sql
+from src.test_utils import (
+    generate_testing_schemas,
+    generate_custom_testing_sql,
+    generate_testing_sql,
+)
 
 faker = Faker()
 
@@ -28,10 +32,8 @@ def simple_table():
 
 
 @pytest.fixture
-def related_tables():
+def related_tables(context):
     """Fixture que proporciona dos tablas relacionadas para testing"""
-    # Asegurarse de limpiar el registro global
-    registry.tables = {}
 
     # Tabla de usuarios
     users_table = Table(
@@ -44,7 +46,7 @@ def related_tables():
     )
 
     # Registrar la tabla de usuarios primero
-    registry.register(users_table)
+    context.registry.register(users_table)
 
     # Tabla de posts que depende de users
     posts_table = Table(
@@ -63,7 +65,7 @@ def related_tables():
         ],
     )
 
-    registry.register(posts_table)
+    context.registry.register(posts_table)
 
     return {users_table: 5, posts_table: 5}
 
@@ -202,6 +204,30 @@ def test_custom_testing_sql():
             assert "VALUES" in content
 
 
+def test_generate_testing_sql():
+    """Test para verificar que el archivo combinado y los archivos por tabla coinciden"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        num_tables, total_rows = generate_testing_sql(temp_dir, prefix="datos")
+
+        assert num_tables == len(generate_testing_schemas())
+        assert total_rows == sum(n for _, n in generate_testing_schemas().values())
+
+        with open(os.path.join(temp_dir, "datos_all.sql")) as f:
+            combined = f.read()
+
+        per_table = ""
+        for table_name in generate_testing_schemas():
+            path = os.path.join(temp_dir, f"datos_{table_name}.sql")
+            assert os.path.exists(path)
+            with open(path) as f:
+                content = f.read()
+            assert content.startswith(f"-- Inserciones para la tabla {table_name}")
+            assert content in combined
+            per_table += content
+
+        assert len(per_table) == len(combined)
+
+
 def test_export_sql_to_file():
     """Test para verificar la exportación de SQL a archivos"""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -264,3 +290,46 @@ def parse_sql_values(values_line):
         result.append(current.strip())
 
     return result
+
+
+def test_get_faker_is_cached():
+    """Test para verificar que Faker se construye una sola vez por locale"""
+    import src.generator as generator
+
+    assert generator.get_faker() is generator.get_faker("es_MX")
+    assert generator.faker is generator.get_faker()
+    assert generator.get_faker("en_US") is not generator.get_faker()
+
+
+def test_column_locale(context):
+    """Test para verificar que cada columna usa el Faker de su locale"""
+    import src.providers as providers
+
+    tabla = Table(
+        name="personas",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("nombre", "VARCHAR(50)", faker_provider="name"),
+            Column("name", "VARCHAR(50)", faker_provider="name", locale="en_US"),
+            Column("telefono", "PHONE", locale="ja_JP"),
+        ],
+    )
+
+    generate_insert_query(tabla, 20)
+
+    assert ("en_US", None) in context._fakers
+    assert ("ja_JP", None) in context._fakers
+    assert providers.get_faker("en_US") is providers.get_faker("en_US")
+    assert len(tabla.get_generated_values("name")) == 20
+
+
+def test_get_faker_seed_streams():
+    """Test para verificar que una semilla propia da un flujo reproducible e independiente"""
+    import src.generator as generator
+
+    seeded = generator.get_faker("en_US", seed=42)
+    assert seeded is not generator.get_faker("en_US")
+    first = [seeded.name() for _ in range(5)]
+
+    seeded.seed_instance(42)
+    assert [seeded.name() for _ in range(5)] == first
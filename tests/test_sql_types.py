@@ -0,0 +1,106 @@
+"""
+Tests para los descriptores de tipos SQL y la generación por tipo
+"""
+
+import random
+from decimal import Decimal
+import pytest
+from src.schema import Table, Column
+from src.generator import _infer_value_from_type, generate_row_batches
+from src.context import GenerationContext
+from src import sql_types
+from src.sql_types import parse_sql_type
+
+
+def test_parse_parameters_and_modifiers():
+    """Test para verificar el análisis de longitud, precisión, escala y modificadores"""
+    varchar = parse_sql_type("varchar(50)")
+    assert (varchar.base, varchar.category, varchar.length) == ("VARCHAR", "text", 50)
+
+    decimal = parse_sql_type("DECIMAL(10, 2) UNSIGNED NOT NULL")
+    assert (decimal.precision, decimal.scale) == (10, 2)
+    assert decimal.unsigned and decimal.base == "DECIMAL"
+
+    assert parse_sql_type("NUMERIC(6)").scale == 0
+    assert parse_sql_type("CHARACTER VARYING(20)").base == "VARCHAR"
+    assert parse_sql_type("double precision").category == "float"
+    assert parse_sql_type("TIMESTAMP WITH TIME ZONE").base == "TIMESTAMP"
+    assert parse_sql_type("VARCHAR(MAX)").length is None
+    assert parse_sql_type("CORREO_EMAIL").category == "faker"
+    assert parse_sql_type("GEOMETRY").category == "unknown"
+    # El análisis se hace una vez por cadena
+    assert parse_sql_type("varchar(50)") is varchar
+
+    with pytest.raises(ValueError):
+        parse_sql_type("DECIMAL(2,4)")
+
+
+def test_values_respect_limits():
+    """Test para verificar que los valores respetan longitud, precisión y rango"""
+    context = GenerationContext(seed=1)
+    faker = context.get_faker()
+    rng = random.Random(1)
+
+    def values(type_string, n=500):
+        return parse_sql_type(type_string).values(n, faker, rng)
+
+    assert all(len(v) <= 50 for v in values("VARCHAR(50)"))
+    assert all(1 <= len(v) <= 3 for v in values("CHAR(3)"))
+    assert all(0 <= v <= 127 for v in values("TINYINT"))
+    assert max(values("TINYINT UNSIGNED", 2000)) > 127
+
+    for value in values("DECIMAL(5,2)"):
+        digits = Decimal(str(value))
+        assert 0 <= digits <= Decimal("999.99") and -digits.as_tuple().exponent <= 2
+    assert all(0 <= v < 1 for v in values("DECIMAL(2,2)"))
+    assert all(isinstance(v, int) and v <= 99 for v in values("NUMERIC(2)"))
+
+    assert all(len(v) == 16 for v in values("BINARY(16)"))
+    assert all(len(v) == 4 for v in values("VARBINARY(4)"))
+    assert values("GEOMETRY", 2) == ["Tipo desconocido:GEOMETRY"] * 2
+
+
+def test_infer_value_from_parameterized_types():
+    """Test para verificar que los tipos con parámetros ya no caen en el tipo desconocido"""
+    faker = GenerationContext(seed=2).get_faker()
+    assert len(_infer_value_from_type("VARCHAR(20)", faker)) <= 20
+    assert isinstance(_infer_value_from_type("DECIMAL(10,2)", faker), float)
+    assert isinstance(_infer_value_from_type("INT UNSIGNED", faker), int)
+    assert "@" in _infer_value_from_type("EMAIL", faker)
+
+
+def test_columns_use_type_descriptor():
+    """Test para verificar la generación de columnas y el recorte de los textos de Faker"""
+    table = Table(
+        name="productos",
+        columns=[
+            Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+            Column(name="codigo", type="CHAR(8)", faker_provider="sentence"),
+            Column(name="precio", type="DECIMAL(6,2)"),
+            Column(name="existencias", type="SMALLINT UNSIGNED", constraints=["NOT NULL"]),
+        ],
+    )
+    assert table.columns[2].sql_type is parse_sql_type("DECIMAL(6,2)")
+    assert table.columns[3].sql_type.unsigned
+
+    rows = [row for batch in generate_row_batches(table, 200, context=GenerationContext(seed=3)) for row in batch]
+    assert all(len(row[1]) <= 8 for row in rows)
+    assert all(0 <= row[2] <= 1000 and row[2] == round(row[2], 2) for row in rows)
+    assert all(isinstance(row[3], int) for row in rows)
+
+
+def test_temporal_provider_created_once(monkeypatch):
+    """Test para verificar que el proveedor de un tipo temporal se crea una vez y no por lote"""
+    calls = []
+    original = sql_types.provider_for_type
+    monkeypatch.setattr(
+        sql_types, "provider_for_type", lambda base: calls.append(base) or original(base)
+    )
+    sql_types._temporal_provider.cache_clear()
+
+    faker = GenerationContext(seed=4).get_faker()
+    rng = random.Random(4)
+    for _ in range(3):
+        assert len(parse_sql_type("DATETIME").values(10, faker, rng)) == 10
+    assert calls == ["DATETIME"]
+
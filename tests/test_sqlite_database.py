@@ -0,0 +1,164 @@
+"""
+Tests para el gestor de base de datos SQLite
+"""
+
+import os
+import tempfile
+import pytest
+from src.schema import Table, Column, ForeignKey
+from src.generator import (
+    generate_insert_query,
+    generate_row_batches,
+    generate_row_batches_in_order,
+)
+from src.dialects import SQLiteDialect
+from src.sqlite_database import SQLiteManager, create_table_ddl
+from src.writers import DatabaseWriter
+
+
+@pytest.fixture
+def autoincrement_tables():
+    """Fixture con dos tablas relacionadas que usan llaves autoincrementales"""
+    clientes = Table(
+        name="clientes",
+        columns=[
+            Column(
+                "id",
+                "INTEGER",
+                is_primary_key=True,
+                primary_key_autoincrement=True,
+            ),
+            Column("nombre", "VARCHAR(50)", faker_provider="name"),
+            Column("activo", "BOOLEAN"),
+        ],
+    )
+    pedidos = Table(
+        name="pedidos",
+        columns=[
+            Column(
+                "id",
+                "INTEGER",
+                is_primary_key=True,
+                primary_key_autoincrement=True,
+            ),
+            Column(
+                "cliente_id",
+                "INTEGER",
+                foreign_key=ForeignKey("cliente_id", "clientes", "id"),
+            ),
+            Column("total", "DECIMAL"),
+        ],
+    )
+    return {clientes: 20, pedidos: 50}
+
+
+def test_generate_row_batches_sizes(autoincrement_tables):
+    """Test para verificar que los lotes respetan el tamaño indicado"""
+    clientes = list(autoincrement_tables.keys())[0]
+
+    batches = list(generate_row_batches(clientes, 25, batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    ids = [row[0] for batch in batches for row in batch]
+    assert ids == list(range(1, 26))
+    assert all(isinstance(row[2], bool) for batch in batches for row in batch)
+
+
+def test_create_table_ddl(autoincrement_tables):
+    """Test para verificar la sentencia CREATE TABLE generada"""
+    pedidos = list(autoincrement_tables.keys())[1]
+
+    ddl = create_table_ddl(pedidos)
+    assert ddl.startswith("CREATE TABLE IF NOT EXISTS pedidos")
+    assert "id INTEGER PRIMARY KEY" in ddl
+    assert "FOREIGN KEY (cliente_id) REFERENCES clientes(id)" in ddl
+
+    ddl = create_table_ddl(pedidos, with_constraints=False)
+    assert "PRIMARY KEY" not in ddl
+    assert "FOREIGN KEY" not in ddl
+
+
+def test_insert_rows_in_memory(autoincrement_tables):
+    """Test para verificar la carga por lotes en una base de datos en memoria"""
+    with SQLiteManager(batch_size=7, foreign_keys=True) as db:
+        db.create_tables(list(autoincrement_tables.keys()))
+
+        for table, batch in generate_row_batches_in_order(
+            autoincrement_tables, batch_size=16
+        ):
+            db.insert_rows(table, batch)
+
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0] == 20
+            assert conn.execute("SELECT COUNT(*) FROM pedidos").fetchone()[0] == 50
+            huerfanos = conn.execute(
+                "SELECT COUNT(*) FROM pedidos p "
+                "LEFT JOIN clientes c ON p.cliente_id = c.id WHERE c.id IS NULL"
+            ).fetchone()[0]
+            assert huerfanos == 0
+
+
+def test_execute_queries_in_file(autoincrement_tables):
+    """Test para verificar la ejecución de sentencias INSERT en un archivo SQLite"""
+    clientes = list(autoincrement_tables.keys())[0]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = os.path.join(temp_dir, "datos.db")
+        db = SQLiteManager(database)
+        db.create_tables([clientes])
+        db.execute_queries({"clientes": generate_insert_query(clientes, 5)})
+
+        with db.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            count = conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0]
+
+        assert mode == "wal"
+        assert count == 5
+
+
+def test_execute_queries_split_statements():
+    """Test para verificar la carga de una tabla dividida en varias sentencias INSERT"""
+    notas = Table(
+        name="notas",
+        columns=[
+            Column("id", "INTEGER", is_primary_key=True, primary_key_autoincrement=True),
+            Column("texto", "TEXT", custom_provider=lambda: "'a;\nINSERT INTO notas (id) VALUES (0);'"),
+        ],
+    )
+    dialect = SQLiteDialect()
+    dialect.max_statement_bytes = 200
+    query = generate_insert_query(notas, 20, dialect=dialect)
+    assert query.count("INSERT INTO notas (id, texto)") > 1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = SQLiteManager(os.path.join(temp_dir, "datos.db"))
+        db.create_tables([notas])
+        db.execute_queries({"notas": query})
+
+        with db.get_connection() as conn:
+            rows = conn.execute("SELECT DISTINCT texto FROM notas").fetchall()
+            count = conn.execute("SELECT COUNT(*) FROM notas").fetchone()[0]
+
+    assert count == 20
+    assert rows == [("a;\nINSERT INTO notas (id) VALUES (0);",)]
+
+
+def test_database_writer_reuses_connection(autoincrement_tables, monkeypatch):
+    """Test para verificar que el escritor usa una sola conexión para todos los lotes"""
+    clientes = list(autoincrement_tables.keys())[0]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = SQLiteManager(os.path.join(temp_dir, "datos.db"))
+        db.create_tables([clientes])
+        connect = db._connect
+        calls = []
+        monkeypatch.setattr(db, "_connect", lambda: calls.append(1) or connect())
+
+        with DatabaseWriter(db) as writer:
+            for batch in generate_row_batches(clientes, 50, batch_size=10):
+                writer.write_batch(clientes, batch)
+
+        assert len(calls) == 1
+        assert db.connection is None
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0] == 50
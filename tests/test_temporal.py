@@ -0,0 +1,113 @@
+"""
+Tests para el motor de fechas y horas sobre enteros
+"""
+
+import random
+from datetime import date, datetime, time
+import pytest
+from src.schema import Table, Column
+from src.generator import generate_row_batches
+from src.context import GenerationContext
+from src.temporal import (
+    FakerTemporalProvider,
+    dates,
+    datetimes,
+    format_datetime,
+    format_time,
+    times,
+    to_epoch,
+)
+
+
+def test_formatting_matches_strftime():
+    """Test para verificar que el formateo rápido coincide con strftime"""
+    rng = random.Random(1)
+    for _ in range(500):
+        value = datetime.fromordinal(rng.randint(700_000, 750_000)).replace(
+            hour=rng.randrange(24), minute=rng.randrange(60), second=rng.randrange(60)
+        )
+        assert format_datetime(value) == value.strftime("%Y-%m-%d %H:%M:%S")
+        assert format_time(value.time()) == value.strftime("%H:%M:%S")
+
+
+def test_values_stay_in_range():
+    """Test para verificar los rangos y el formato de fechas, fechas con hora y horas"""
+    rng = random.Random(2)
+    values = datetimes("2024-02-28 23:00:00", "2024-03-01 01:00:00")(1000, rng)
+    parsed = [datetime.fromisoformat(v) for v in values]
+    assert min(parsed) >= datetime(2024, 2, 28, 23) and max(parsed) <= datetime(2024, 3, 1, 1)
+    assert any(p.day == 29 for p in parsed)
+
+    days = dates("2024-01-01", "2024-01-03", as_objects=True)(300, rng)
+    assert set(days) == {date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)}
+
+    hours = times("09:00", "17:30:00", as_objects=True)(300, rng)
+    assert all(time(9) <= h <= time(17, 30) for h in hours)
+
+    with pytest.raises(ValueError):
+        datetimes("2024-01-02", "2024-01-01")
+
+
+def test_monotonic_across_batches():
+    """Test para verificar que el modo monotonic crece de lote en lote y cubre el rango"""
+    provider = datetimes("2024-01-01", "2024-12-31", monotonic=True, rows=10_000)
+    rng = random.Random(3)
+    values = []
+    for _ in range(10):
+        values.extend(provider.sample(1000, rng))
+
+    assert values == sorted(values)
+    assert values[0] == to_epoch("2024-01-01")
+    assert to_epoch("2024-11-01") < values[-1] <= to_epoch("2024-12-31")
+
+    provider.reset()
+    assert provider.sample(1, rng) == [to_epoch("2024-01-01")]
+
+    with pytest.raises(ValueError):
+        datetimes(monotonic=True)
+
+
+def test_faker_expressions_keep_types():
+    """Test para verificar que los providers temporales de Faker conservan sus tipos"""
+    context = GenerationContext(seed=4)
+    today = date.today()
+
+    fecha = context.compile_provider("date")
+    assert isinstance(fecha, FakerTemporalProvider)
+    assert date.fromisoformat(fecha()) <= today
+    assert isinstance(context.compile_provider("date_time")(), datetime)
+    assert len(context.compile_provider("time")()) == 8
+
+    this_year = context.compile_provider("date_this_year").batch(200)
+    assert all(date(today.year, 1, 1) <= d <= today for d in this_year)
+    this_month = context.compile_provider("date_time_this_month").batch(200)
+    assert all(d.year == today.year and d.month == today.month for d in this_month)
+
+    # Con argumentos se usa Faker tal cual
+    assert not isinstance(
+        context.compile_provider("date_between(start_date='-1y')"), FakerTemporalProvider
+    )
+
+
+def test_temporal_columns_are_reproducible():
+    """Test para verificar las columnas sin provider y la reproducibilidad con semilla"""
+
+    def generate(seed):
+        table = Table(
+            name="eventos",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(name="fecha", type="DATE"),
+                Column(name="creado", type="DATETIME"),
+                Column(name="hora", type="TIME"),
+                Column(name="registrado", type="DATE", faker_provider="date_this_decade"),
+            ],
+        )
+        return [row for batch in generate_row_batches(table, 50, context=GenerationContext(seed=seed)) for row in batch]
+
+    rows = generate(5)
+    assert rows == generate(5)
+    assert rows != generate(6)
+    _, fecha, creado, hora, registrado = rows[0]
+    assert isinstance(fecha, str) and isinstance(creado, datetime)
+    assert isinstance(hora, str) and isinstance(registrado, date)
@@ -0,0 +1,74 @@
+"""
+Tests para el motor de texto a partir de un corpus precalculado
+"""
+
+import random
+import pytest
+from src.schema import Table, Column
+from src.generator import generate_row_batches
+from src.context import GenerationContext
+from src.dialects import get_dialect
+from src.text_corpus import CorpusProvider, TextCorpus, get_corpus
+
+
+def test_text_respects_length_limits():
+    """Test para verificar que text nunca supera max_nb_chars y respeta min_nb_chars"""
+    corpus = get_corpus(GenerationContext(seed=1).get_faker())
+    rng = random.Random(1)
+    for max_chars in (5, 12, 24, 25, 60, 99, 100, 150, 400, 2000):
+        for _ in range(50):
+            text = corpus.text(rng, max_nb_chars=max_chars)
+            assert 0 < len(text) <= max_chars
+            assert text[0].isupper()
+
+    texts = corpus.texts(200, rng, min_nb_chars=150, max_nb_chars=200)
+    assert all(150 <= len(text) <= 200 for text in texts)
+
+    with pytest.raises(ValueError):
+        corpus.text(rng, max_nb_chars=4)
+
+
+def test_corpus_keeps_words_that_need_escaping():
+    """Test para verificar que el corpus conserva las palabras con comillas y el dialecto las escapa"""
+    corpus = TextCorpus(["hola", "d'alba", "a\\b", "mundo", ""], pool_size=50)
+    assert corpus.words == ["hola", "d'alba", "a\\b", "mundo"]
+
+    rng = random.Random(2)
+    text = next(t for t in corpus.texts(200, rng, max_nb_chars=60) if "'" in t)
+    assert get_dialect("postgresql").encode_value(text) == "'" + text.replace("'", "''") + "'"
+
+    with pytest.raises(ValueError):
+        TextCorpus(["", ""])
+
+
+def test_text_providers_use_corpus():
+    """Test para verificar que text, sentence y paragraph se sirven desde el corpus"""
+    context = GenerationContext(seed=4)
+    for expression in ("text", "sentence(nb_words=4)", "paragraph(2)", "text(max_nb_chars=40)"):
+        assert isinstance(context.compile_provider(expression), CorpusProvider)
+
+    # Con ext_word_list se usa Faker tal cual
+    provider = context.compile_provider("sentence(ext_word_list=['abc', 'def'])")
+    assert not isinstance(provider, CorpusProvider)
+    assert set(provider()[:-1].lower().split()) <= {"abc", "def"}
+
+
+def test_text_columns_are_reproducible():
+    """Test para verificar que la misma semilla produce los mismos textos"""
+
+    def generate(seed):
+        table = Table(
+            name="notas",
+            columns=[
+                Column(name="id", type="INT", is_primary_key=True, primary_key_autoincrement=True),
+                Column(name="titulo", type="VARCHAR(100)", faker_provider="sentence"),
+                Column(name="contenido", type="TEXT", faker_provider="text(max_nb_chars=80)"),
+                Column(name="nota", type="TEXT"),
+            ],
+        )
+        return [row for batch in generate_row_batches(table, 50, context=GenerationContext(seed=seed)) for row in batch]
+
+    rows = generate(9)
+    assert rows == generate(9)
+    assert rows != generate(10)
+    assert all(len(row[2]) <= 80 and len(row[3]) <= 100 for row in rows)
@@ -0,0 +1,287 @@
+"""
+Tests para los escritores de salida por lotes
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+from src.schema import Table, Column, ForeignKey
+from src.generator import generate_row_batches_in_order
+from src.dialects import MariaDBDialect
+from src.sqlite_database import SQLiteManager
+from src.writers import (
+    ByteBuffer,
+    CopyWriter,
+    CSVWriter,
+    TSVWriter,
+    JSONLinesWriter,
+    SQLInsertWriter,
+    SQLFilesWriter,
+    DatabaseWriter,
+    FanOutWriter,
+    format_copy_value,
+)
+
+
+def _tabla(nombre="datos"):
+    return Table(
+        name=nombre,
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("texto", "TEXT"),
+        ],
+    )
+
+
+def test_format_copy_value_escaping():
+    """Test para verificar el escape del formato texto de COPY"""
+    assert format_copy_value(None) == "\\N"
+    assert format_copy_value(True) == "t"
+    assert format_copy_value(False) == "f"
+    assert format_copy_value(42) == "42"
+    assert format_copy_value("a\tb\nc\\d\re") == "a\\tb\\nc\\\\d\\re"
+    assert format_copy_value(b"\x0a\xff") == "\\\\x0aff"
+    assert format_copy_value(datetime(2024, 1, 2, 3, 4, 5)) == "2024-01-02 03:04:05"
+
+
+def test_copy_writer_blocks():
+    """Test para verificar que cada tabla produce un único bloque COPY"""
+    tabla = _tabla()
+    output = io.StringIO()
+
+    writer = CopyWriter(output)
+    writer.write_batch(tabla, [(1, "uno"), (2, None)])
+    writer.write_batch(tabla, [(3, "tab\taqui")])
+    writer.close()
+
+    assert output.getvalue() == (
+        "-- Datos para la tabla datos\n"
+        "COPY datos (id, texto) FROM stdin;\n"
+        "1\tuno\n"
+        "2\t\\N\n"
+        "3\ttab\\taqui\n"
+        "\\.\n\n"
+    )
+    assert writer.rows_written == 3
+
+
+def test_copy_writer_generated_tables():
+    """Test para verificar la exportación COPY de tablas relacionadas"""
+    padres = _tabla("padres")
+    hijos = Table(
+        name="hijos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("padre_id", "INTEGER", foreign_key=ForeignKey("padre_id", "padres", "id")),
+        ],
+    )
+    output = io.StringIO()
+
+    with CopyWriter(output) as writer:
+        for table, batch in generate_row_batches_in_order(
+            {hijos: 12, padres: 5}, batch_size=4
+        ):
+            writer.write_batch(table, batch)
+
+    content = output.getvalue()
+    assert content.count("COPY ") == 2
+    assert content.index("COPY padres") < content.index("COPY hijos")
+    assert content.count("\\.\n") == 2
+
+    hijos_block = content.split("COPY hijos (id, padre_id) FROM stdin;\n")[1]
+    rows = hijos_block.split("\\.\n")[0].splitlines()
+    assert len(rows) == 12
+    assert all(1 <= int(row.split("\t")[1]) <= 5 for row in rows)
+
+
+def test_csv_writer_one_file_per_table():
+    """Test para verificar que se crea un CSV por tabla con encabezado"""
+    padres = _tabla("padres")
+    hijos = Table(
+        name="hijos",
+        columns=[
+            Column("id", "INTEGER", primary_key_autoincrement=True),
+            Column("padre_id", "INTEGER", foreign_key=ForeignKey("padre_id", "padres", "id")),
+            Column("activo", "BOOLEAN"),
+        ],
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with CSVWriter(temp_dir, prefix="t_") as writer:
+            for table, batch in generate_row_batches_in_order(
+                {padres: 5, hijos: 9}, batch_size=4
+            ):
+                writer.write_batch(table, batch)
+
+        assert set(writer.files) == {"padres", "hijos"}
+        assert writer.files["hijos"] == os.path.join(temp_dir, "t_hijos.csv")
+
+        with open(writer.files["hijos"], newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+
+    assert rows[0] == ["id", "padre_id", "activo"]
+    assert len(rows) == 10
+    assert {row[2] for row in rows[1:]} <= {"true", "false"}
+
+
+def test_tsv_writer_quotes_special_values():
+    """Test para verificar que los tabuladores dentro de un valor no rompen el TSV"""
+    tabla = _tabla()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with TSVWriter(temp_dir) as writer:
+            writer.write_batch(tabla, [(1, "a\tb"), (2, None)])
+
+        with open(writer.files["datos"], newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f, delimiter="\t"))
+
+    assert rows == [["id", "texto"], ["1", "a\tb"], ["2", ""]]
+
+
+def test_jsonl_writer_types():
+    """Test para verificar los tipos escritos en JSON Lines"""
+    tabla = Table(
+        name="eventos",
+        columns=[
+            Column("id", "INTEGER"),
+            Column("activo", "BOOLEAN"),
+            Column("fecha", "DATETIME"),
+            Column("dato", "BLOB"),
+        ],
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with JSONLinesWriter(temp_dir) as writer:
+            writer.write_batch(
+                tabla, [(1, True, datetime(2024, 1, 2, 3, 4, 5), b"\x01"), (2, None, None, None)]
+            )
+
+        with open(writer.files["eventos"], encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+
+    assert lines == [
+        {"id": 1, "activo": True, "fecha": "2024-01-02 03:04:05", "dato": "01"},
+        {"id": 2, "activo": None, "fecha": None, "dato": None},
+    ]
+
+
+def test_sql_insert_writer_single_statement_per_table():
+    """Test para verificar que los lotes de una tabla forman una única sentencia INSERT"""
+    tabla = _tabla()
+    output = io.StringIO()
+
+    with SQLInsertWriter(output) as writer:
+        writer.write_batch(tabla, [(1, "uno")])
+        writer.write_batch(tabla, [(2, "d'os")])
+
+    assert output.getvalue() == (
+        "-- Inserciones para la tabla datos\n"
+        "INSERT INTO datos (id, texto) VALUES \n"
+        "(1, 'uno'),\n"
+        "(2, 'd''os');\n\n"
+    )
+
+
+def test_sql_insert_writer_splits_large_statements():
+    """Test para verificar la división de sentencias al superar el tamaño máximo"""
+    tabla = _tabla()
+    dialect = MariaDBDialect()
+    dialect.max_statement_bytes = 200
+    output = io.StringIO()
+
+    with SQLInsertWriter(output, dialect) as writer:
+        for i in range(0, 20, 5):
+            writer.write_batch(tabla, [(j, "x" * 20) for j in range(i, i + 5)])
+
+    statements = output.getvalue().split(";\n")
+    assert len(statements) > 2
+    assert output.getvalue().count("(") - output.getvalue().count("INSERT") == 20
+
+
+def test_sql_insert_writer_binary_outputs():
+    """Test para verificar que la salida en bytes es la misma en archivos binarios, de texto y rutas"""
+    tabla = _tabla()
+    dialect = MariaDBDialect()
+    dialect.max_statement_bytes = 120
+    batches = [[(j, "año " * (j % 4)) for j in range(i, i + 7)] for i in range(0, 35, 7)]
+
+    def write(output, flush_size=64):
+        with SQLInsertWriter(output, dialect, flush_size=flush_size) as writer:
+            for batch in batches:
+                writer.write_batch(tabla, batch)
+        return writer
+
+    text = io.StringIO()
+    expected_bytes = write(text).bytes_written
+    expected = text.getvalue()
+    assert "año" in expected and expected.count("INSERT") > 3
+
+    binary = io.BytesIO()
+    assert write(binary).bytes_written == expected_bytes
+    assert binary.getvalue().decode("utf-8") == expected
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "datos.sql")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("-- inicio\n")
+            write(f)
+            f.write("-- fin\n")
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == "-- inicio\n" + expected + "-- fin\n"
+
+        write(path, flush_size=1 << 20)
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == expected
+
+
+def test_byte_buffer_reuses_memory():
+    """Test para verificar que el ByteBuffer conserva su memoria entre vaciados"""
+    buffer = ByteBuffer(8)
+    output = io.BytesIO()
+    buffer.write(b"hola ")
+    buffer.write("añadido".encode("utf-8"))
+    assert len(buffer) == 13
+    buffer.flush_to(output)
+    data = buffer._data
+    buffer.write(b"!")
+    buffer.flush_to(output)
+
+    assert output.getvalue() == "hola añadido!".encode("utf-8")
+    assert buffer._data is data and len(data) >= 13 and len(buffer) == 0
+
+
+def test_fan_out_writer_encodes_once():
+    """Test para verificar que el FanOutWriter codifica cada lote una sola vez"""
+
+    class CountingDialect(MariaDBDialect):
+        calls = 0
+
+        def encode_rows(self, rows):
+            CountingDialect.calls += 1
+            return super().encode_rows(rows)
+
+    tabla = _tabla()
+    dialect = CountingDialect()
+    combined = io.StringIO()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        per_table = SQLFilesWriter(temp_dir, prefix="p_", dialect=dialect)
+        with SQLiteManager() as db:
+            db.create_tables([tabla])
+            with FanOutWriter(
+                [SQLInsertWriter(combined, dialect), per_table, DatabaseWriter(db)]
+            ) as writer:
+                writer.write_batch(tabla, [(1, "uno"), (2, "dos")])
+                writer.write_batch(tabla, [(3, "tres")])
+
+            with db.get_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM datos").fetchone()[0] == 3
+
+        with open(per_table.files["datos"], encoding="utf-8") as f:
+            assert f.read() == combined.getvalue()
+
+    assert CountingDialect.calls == 2
+    assert writer.rows_written == 3